@@ -5,6 +5,7 @@ from flask_mail import Mail
 from flask_migrate import Migrate
 from dotenv import load_dotenv
 import os
+import multiprocessing
 from datetime import timedelta  # Add this import
 
 # Load environment variables
@@ -18,7 +19,13 @@ migrate = Migrate()
 # Import models to register them with SQLAlchemy
 from app.models import *  # Import all models
 
-def create_app():
+def create_app(test_config=None):
+    """
+    Build the application. Starts no threads or processes (see start_background_services).
+
+    Args:
+        test_config: Settings applied over Config, e.g. a test database URI
+    """
     app = Flask(__name__)
     app.config.from_object("app.config.Config")
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY')
@@ -44,7 +51,8 @@ def create_app():
     mail.init_app(app)    # CORS setup
     cors_origins = os.getenv("CORS_ORIGINS")
     cors_origins = [origin.strip() for origin in cors_origins.split(",")] if "," in cors_origins else [cors_origins]
-    CORS(app, origins=cors_origins, supports_credentials=True)
+    CORS(app, origins=cors_origins, supports_credentials=True,
+         expose_headers=['X-Total-Count', 'X-Page', 'X-Per-Page'])
     
     # Configure uploads directory for serving static files
     # Create uploads directory if it doesn't exist
@@ -62,6 +70,9 @@ def create_app():
     def uploaded_file(filename):
         return send_from_directory(uploads_dir, filename)
     
+    if test_config is not None:
+        app.config.update(test_config)
+
     # Initialize database
     # Models are already imported at module level
     db.init_app(app)
@@ -70,7 +81,7 @@ def create_app():
     with app.app_context():
         db.create_all()
       # Register blueprints
-    from app.routes import auth_bp, college_bp, admin_bp, election_bp, election_access_bp, election_cast_bp, election_verify_bp, election_review_bp, user_bp, position_bp, organization_bp, trusted_authority_bp, crypto_config_bp, key_share_bp, admin_search_bp, upload_bp, verification_bp, election_results_bp, archived_results_bp, documentation_bp, system_settings_bp, super_admin_bp
+    from app.routes import auth_bp, college_bp, admin_bp, election_bp, election_access_bp, election_cast_bp, election_verify_bp, election_review_bp, user_bp, position_bp, organization_bp, trusted_authority_bp, crypto_config_bp, key_share_bp, admin_search_bp, upload_bp, verification_bp, election_results_bp, archived_results_bp, documentation_bp, system_settings_bp, super_admin_bp, job_bp
     app.register_blueprint(auth_bp)
     app.register_blueprint(college_bp)
     app.register_blueprint(admin_bp)
@@ -93,6 +104,7 @@ def create_app():
     app.register_blueprint(documentation_bp)
     app.register_blueprint(system_settings_bp)
     app.register_blueprint(super_admin_bp)
+    app.register_blueprint(job_bp)
     
     
 
@@ -101,4 +113,35 @@ def create_app():
     def direct_test():
         return jsonify({"message": "Direct test route works!"})
 
-    return app
\ No newline at end of file
+    return app
+
+
+def start_background_services(app):
+    """
+    Start the background work of the process that serves web requests.
+
+    create_app() starts nothing by itself, so scripts, job workers and tests
+    can build the app without side effects. The web entry points call this
+    once per process that actually serves requests: the post_worker_init hook
+    in gunicorn.conf.py for each gunicorn worker, and run.py for the
+    development server.
+
+    Args:
+        app: Flask application returned by create_app()
+    """
+    # Processes spawned by the key pool or job workers re-import the entry point; they serve nothing
+    if multiprocessing.parent_process() is not None:
+        return
+
+    # Reclaim voting sessions whose heartbeats stopped
+    from app.services.access import SessionLeaseService
+    SessionLeaseService.start_reaper(app)
+
+    # Job worker processes next to the web server, only if JOB_WORKER_PROCESSES asks for them;
+    # otherwise run_job_worker.py executes the queued jobs
+    from app.services.jobs import JobWorkerPool
+    JobWorkerPool.start(app)
+
+    # Keep Paillier key pairs ready so creating an election does not wait on key generation
+    from app.services.crypto import PaillierKeyPool
+    PaillierKeyPool.start(app)
@@ -9,4 +9,60 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     # Upload folder for photos
     UPLOAD_FOLDER = 'uploads/photos'
+    # Homomorphic tally engine: process pool size (0 = CPU count) and ciphertexts per chunk
+    TALLY_MAX_WORKERS = int(os.getenv('TALLY_MAX_WORKERS', '0'))
+    TALLY_CHUNK_SIZE = int(os.getenv('TALLY_CHUNK_SIZE', '512'))
+    # Fold ballots into per-candidate running tallies at cast time
+    INCREMENTAL_TALLY_ENABLED = os.getenv('INCREMENTAL_TALLY_ENABLED', 'False') == 'True'
+    # snarkjs verifier worker pool: node processes (0 = one-shot subprocess per proof),
+    # per-request timeout in seconds and callers allowed to wait for a free worker
+    SNARKJS_WORKERS = int(os.getenv('SNARKJS_WORKERS', '2'))
+    SNARKJS_WORKER_TIMEOUT = float(os.getenv('SNARKJS_WORKER_TIMEOUT', '10'))
+    SNARKJS_MAX_QUEUED = int(os.getenv('SNARKJS_MAX_QUEUED', '32'))
+    # Largest batch accepted by /api/verification/verify-batch
+    ZKP_BATCH_MAX_PROOFS = int(os.getenv('ZKP_BATCH_MAX_PROOFS', '64'))
+    # Parsed verification keys cached per election (entries, seconds)
+    VERIFICATION_KEY_CACHE_SIZE = int(os.getenv('VERIFICATION_KEY_CACHE_SIZE', '256'))
+    VERIFICATION_KEY_CACHE_TTL = float(os.getenv('VERIFICATION_KEY_CACHE_TTL', '300'))
+    # Seconds between keep-alives and state re-checks on waitlist event streams; also the longest
+    # a queue change made by another server process takes to reach a stream
+    WAITLIST_SSE_KEEPALIVE = float(os.getenv('WAITLIST_SSE_KEEPALIVE', '15'))
+    # Voting session leases: seconds a session survives without a heartbeat,
+    # reaper interval in seconds (0 disables the background reaper) and leases reaped per transaction.
+    # The ballot pages send a heartbeat every quarter of the TTL
+    VOTING_SESSION_TTL = int(os.getenv('VOTING_SESSION_TTL', '120'))
+    VOTING_SESSION_REAPER_INTERVAL = float(os.getenv('VOTING_SESSION_REAPER_INTERVAL', '30'))
+    VOTING_SESSION_REAPER_BATCH = int(os.getenv('VOTING_SESSION_REAPER_BATCH', '100'))
+    # Seconds eligible-voter counts are reused before re-reading the voters table
+    ELIGIBLE_VOTER_CACHE_TTL = float(os.getenv('ELIGIBLE_VOTER_CACHE_TTL', '300'))
+    # Paillier public keys cached per election for cast-time ballot validation (entries, seconds)
+    PAILLIER_KEY_CACHE_SIZE = int(os.getenv('PAILLIER_KEY_CACHE_SIZE', '256'))
+    PAILLIER_KEY_CACHE_TTL = float(os.getenv('PAILLIER_KEY_CACHE_TTL', '300'))
+    # Lagrange coefficient sets kept for Shamir key reconstruction (one per share-index set and modulus)
+    SHAMIR_COEFFICIENT_CACHE_SIZE = int(os.getenv('SHAMIR_COEFFICIENT_CACHE_SIZE', '128'))
+    # Pre-generated Paillier key pairs kept in memory by the serving process for election creation
+    # (0 disables the pool); started in each gunicorn worker (gunicorn.conf.py) and by run.py, never by create_app
+    KEY_POOL_SIZE = int(os.getenv('KEY_POOL_SIZE', '2'))
+    KEY_POOL_KEY_BITS = int(os.getenv('KEY_POOL_KEY_BITS', '2048'))
+    # Background job worker processes started next to each web serving process (run.py, gunicorn workers)
+    # (0 = run run_job_worker.py separately, which also uses this as its default process count)
+    JOB_WORKER_PROCESSES = int(os.getenv('JOB_WORKER_PROCESSES', '0'))
+    # Seconds an idle worker waits before polling the job table again
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+    # Seconds between heartbeats of a running job, and without one before the job is failed
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', '10'))
+    JOB_STALE_AFTER = float(os.getenv('JOB_STALE_AFTER', '120'))
+    # Directory of generated CSV/PDF results exports, and how many export files are kept there
+    RESULTS_EXPORT_DIR = os.getenv('RESULTS_EXPORT_DIR', 'exports/results')
+    RESULTS_EXPORT_CACHE_FILES = int(os.getenv('RESULTS_EXPORT_CACHE_FILES', '200'))
+    # Most elections accepted in one results export
+    RESULTS_EXPORT_MAX_ELECTIONS = int(os.getenv('RESULTS_EXPORT_MAX_ELECTIONS', '200'))
+    # Seconds each admin dashboard section is reused before it is computed again
+    DASHBOARD_CACHE_TTL = float(os.getenv('DASHBOARD_CACHE_TTL', '15'))
+    # Vote/audit activity rollups: interval in seconds of the compactor run by run_job_worker.py (0 disables it),
+    # rows folded per batch, seconds a new row waits before it is folded in, and hours minute buckets are kept
+    ACTIVITY_ROLLUP_INTERVAL = float(os.getenv('ACTIVITY_ROLLUP_INTERVAL', '60'))
+    ACTIVITY_ROLLUP_BATCH = int(os.getenv('ACTIVITY_ROLLUP_BATCH', '5000'))
+    ACTIVITY_ROLLUP_SETTLE_SECONDS = float(os.getenv('ACTIVITY_ROLLUP_SETTLE_SECONDS', '30'))
+    ACTIVITY_ROLLUP_MINUTE_RETENTION_HOURS = float(os.getenv('ACTIVITY_ROLLUP_MINUTE_RETENTION_HOURS', '48'))
     # Other configuration options can go here
\ No newline at end of file
@@ -1,12 +1,15 @@
 """
 Only uses Paillier with Shamir secret sharing.
 """
-from flask import jsonify, request
+from flask import jsonify, request, current_app
 from app.models.crypto_config import CryptoConfig
 from app.models.key_share import KeyShare
 from app.models.trusted_authority import TrustedAuthority
 from app.models.election import Election
 from app import db
+from app.services.jobs import JobQueue
+from app.services.crypto import (ShareFormatError, parse_shares, reconstruct_secret, shares_consistent,
+                                 find_bad_shares, PaillierKeyPool, shamir_modulus)
 import secrets
 import json
 import base64
@@ -17,73 +20,6 @@ from phe import paillier
 from typing import List, Dict, Any, Tuple, Optional
 import shamirs
 
-try:
-    from sympy import nextprime as next_prime
-except ImportError:
-    # Precomputed large prime for use with very large inputs
-    LARGE_PRIMES = {
-        512: 13407807929942597099574024998205846127479365820592393377723561443721764030073546976801874298166903427690031858186486050853753882811946569946433649006083527,
-        1024: 179769313486231590772930519078902473361797697894230657273430081157732675805500963132708477322407536021120113879871393357658789768814416622492847430639474124377767893424865485276302219601246094119453082952085005768838150682342462881473913110540827237163350510684586298239947245938479716304835356329624224137859,
-        2048: 32317006071311007300714876688669951960444102669715484032130345427524655138867890893197201411522913463688717960921898019494119559150490921095088152386448283120630877367300996091750197750389652106796057638384067568276792218642619756161838094338476170470581645852036305042887575891541065808607552399123930385521914333389668342420684974786564569494856176035326322058077805659331026192708460314150258592864177116725943603718461857357598351152301645904403697613233287231227125684710820209725157101726931323469678542580656697935045997268352998638215525166389437335543602135433229604645318478604952148193555853611059596230656
-    }
-    
-    def next_prime(n):
-        # For very large numbers, use precomputed primes
-        n_bits = n.bit_length()
-        if n_bits > 400:  # If n is very large
-            for prime_bits, prime in LARGE_PRIMES.items():
-                if prime_bits >= n_bits and prime > n:
-                    return prime
-            
-            # If we didn't find a suitable precomputed prime, use the largest one
-            return LARGE_PRIMES[max(LARGE_PRIMES.keys())]
-        
-        def is_prime(num):
-            """Miller-Rabin primality test - faster for large numbers"""
-            if num <= 1:
-                return False
-            if num <= 3:
-                return True
-            if num % 2 == 0:
-                return False
-            
-            # Miller-Rabin primality test for large numbers
-            # Express num-1 as d*2^r
-            r, d = 0, num - 1
-            while d % 2 == 0:
-                r += 1
-                d //= 2
-                
-            # Witness loop with some known good bases
-            for a in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]:
-                if num == a:
-                    return True
-                if not miller_rabin_test(a, d, num, r):
-                    return False
-            return True
-        
-        def miller_rabin_test(a, d, n, r):
-            """Helper for Miller-Rabin test"""
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                return True
-            
-            for _ in range(r - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    return True
-            return False
-        
-        # Start with n+1 and increment until we find a prime
-        candidate = n + 1
-        if candidate % 2 == 0:  # Ensure we start with an odd number
-            candidate += 1
-            
-        while not is_prime(candidate):
-            candidate += 2  # Only check odd numbers
-        
-        return candidate
-
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -193,7 +129,14 @@ class CryptoConfigController:
             
             logger.info(f"Generating Paillier key pair for election {election_id} with {n_personnel} personnel and threshold {threshold}")
             
-            public_key, private_key = paillier.generate_paillier_keypair(n_length=2048)
+            # Take a pre-generated key pair when the pool has one
+            pooled = PaillierKeyPool.take()
+            if pooled:
+                public_key, private_key, shamir_prime = pooled
+                logger.info("Using a pre-generated Paillier key pair from the key pool")
+            else:
+                public_key, private_key = paillier.generate_paillier_keypair(n_length=2048)
+                shamir_prime = None
             priv_key_p = int(private_key.p)
             priv_key_q = int(private_key.q)
             public_key_n = int(public_key.n)
@@ -204,34 +147,29 @@ class CryptoConfigController:
                 raise ValueError("Generated Paillier key pair is invalid: p*q != n")
             
             logger.info(f"Generated valid Paillier key: p={priv_key_p.bit_length()} bits, q={priv_key_q.bit_length()} bits, n={public_key_n.bit_length()} bits")
+            JobQueue.report_progress(0.6, 'Paillier key pair generated')
             
             # For Shamir's secret sharing, we need a prime modulus larger than the secret
             # The secret is priv_key_p, so we need to find a prime larger than p
             secret_bits = priv_key_p.bit_length()
-            min_prime_bits = max(secret_bits + 128, 1024)  # Increased minimum size
-            prime_candidate = 2**min_prime_bits + 1
-            shamir_prime = next_prime(prime_candidate)
+            if shamir_prime is None:
+                shamir_prime = shamir_modulus(priv_key_p)
             
             logger.info(f"Splitting private key using shamirs with threshold {threshold}/{n_personnel}")
             logger.info(f"Secret p has {secret_bits} bits, using Shamir prime with {shamir_prime.bit_length()} bits")
-            
-            # Ensure Shamir prime is larger than the secret
-            while shamir_prime <= priv_key_p:
-                prime_candidate *= 2
-                shamir_prime = next_prime(prime_candidate)
-            
             logger.info(f"Final Shamir modulus: {shamir_prime} (bits: {shamir_prime.bit_length()})")
             
             # Split the private key p using Shamir's secret sharing with a larger prime as modulus
             shares_raw_p = shamirs.shares(priv_key_p, quantity=n_personnel, modulus=shamir_prime, threshold=threshold)
             
             # VALIDATION: Test reconstruction immediately after generation
-            reconstructed_test = shamirs.interpolate(shares_raw_p)
+            reconstructed_test = reconstruct_secret([(share.index, share.value) for share in shares_raw_p], shamir_prime)
             if reconstructed_test != priv_key_p:
                 logger.error(f"CRITICAL: Immediate reconstruction test failed! Generated: {priv_key_p}, Reconstructed: {reconstructed_test}")
                 raise ValueError("Shamir secret sharing reconstruction validation failed")
             
             logger.info("✓ Shamir secret sharing reconstruction validation passed")
+            JobQueue.report_progress(0.9, 'Private key shared and verified')
             
             # Create comprehensive security data with all required fields
             security_data = {
@@ -406,7 +344,10 @@ class CryptoConfigController:
                 prime_modulus = int(prime_modulus)
                 # Reconstruct the secret (p value) from shares
                 try:
-                    reconstructed_p = shamirs.interpolate(shares)
+                    parsed_shares = parse_shares(shares)
+                    if not parsed_shares:
+                        logger.error(f"No valid shares submitted for crypto config {crypto_id}")
+                        return False
                     
                     # Parse the security data to verify the reconstructed value
                     security_data = metadata.get('security_data', {})
@@ -418,6 +359,28 @@ class CryptoConfigController:
                     public_key_data = json.loads(crypto_config.public_key)
                     n = int(public_key_data.get('n', 0))
                     
+                    threshold = int(metadata.get('threshold') or len(parsed_shares))
+                    if len(parsed_shares) < threshold:
+                        logger.error(f"Only {len(parsed_shares)} of {threshold} required shares submitted for crypto config {crypto_id}")
+                        return False
+                    
+                    # Shares beyond the threshold must lie on the same polynomial; checked
+                    # without a second interpolation, and on failure each threshold-sized
+                    # subset is tried to point at the bad share
+                    if not shares_consistent(parsed_shares, threshold, prime_modulus):
+                        _, bad_shares = find_bad_shares(
+                            parsed_shares, threshold, prime_modulus,
+                            lambda p: 1 < p < n and n % p == 0,
+                            max_workers=current_app.config.get('TALLY_MAX_WORKERS') or None
+                        )
+                        logger.error(f"Inconsistent key shares for crypto config {crypto_id}, bad share indexes: {bad_shares}")
+                        return False
+                    
+                    reconstructed_p = reconstruct_secret(parsed_shares[:threshold], prime_modulus)
+                    if reconstructed_p == 0:
+                        logger.error(f"Reconstructed p is zero for crypto config {crypto_id}")
+                        return False
+                    
                     # Check if n is divisible by reconstructed p (validates p is a factor of n)
                     if n % reconstructed_p != 0:
                         logger.error(f"Reconstructed p value does not divide n for crypto config {crypto_id}")
@@ -494,25 +457,11 @@ class CryptoConfigController:
                 prime_modulus = int(prime_modulus)
                 logger.info(f"Using Shamir modulus prime: {prime_modulus}")
                 
-                # Parse shares to proper format for shamirs library
-                parsed_shares = []
-                for share_str in shares:
-                    if not share_str or (isinstance(share_str, str) and share_str.strip() == ""):
-                        continue
-                    
-                    try:
-                        if ':' in share_str:
-                            # Parse x:hex(y) format
-                            x_str, y_hex = share_str.split(':', 1)
-                            x = int(x_str)
-                            y = int(y_hex, 16)
-                            # Create proper shamirs.share object
-                            share_obj = shamirs.share(x, y, prime_modulus)
-                            parsed_shares.append(share_obj)
-                        else:
-                            logger.warning(f"Invalid share format: {share_str}")
-                    except Exception as e:
-                        logger.error(f"Error parsing share {share_str}: {e}")
+                # Parse shares (x:hex(y), JSON or tuple forms) into (x, y) points
+                try:
+                    parsed_shares = parse_shares(shares)
+                except ShareFormatError as e:
+                    return {'error': str(e)}
                         
                 if len(parsed_shares) == 0:
                     return {'error': 'No valid shares found for reconstruction'}
@@ -520,7 +469,7 @@ class CryptoConfigController:
                 # Reconstruct the secret (p value) from shares
                 try:
                     # Direct p sharing: reconstructed secret is the Paillier prime p
-                    reconstructed_p = shamirs.interpolate(parsed_shares)
+                    reconstructed_p = reconstruct_secret(parsed_shares, prime_modulus)
                     logger.info(f"Reconstructed secret: {reconstructed_p} (bits: {reconstructed_p.bit_length()})")
                     
                     # Parse the public key to get n
@@ -3,8 +3,11 @@ from app.models.voter import Voter
 from app.models.vote import Vote
 from app.models.election_waitlist import ElectionWaitlist
 from app import db
-from flask import jsonify, request
+from app.services.access import VoterSlotCounter, WaitlistEventBroker, SessionLeaseService, EligibleVoterCounts
+from flask import jsonify, request, current_app, Response, stream_with_context
 from datetime import datetime
+import json
+import queue
 
 
 class ElectionAccessController:
@@ -50,25 +53,25 @@ class ElectionAccessController:
                 return jsonify({'eligible': True})
             
             # STEP 2: Check queued access and handle accordingly
+            max_concurrent = election.max_concurrent_voters or 1
             if not election.queued_access:
-                # No queued access - check voters_count vs max_concurrent_voters
-                current_voters = election.voters_count or 0
-                max_concurrent = election.max_concurrent_voters or 1
-                if current_voters < max_concurrent:
-                    # Election is not full - grant access and increment voters_count
-                    old_count = election.voters_count or 0
-                    election.voters_count = current_voters + 1
+                # No queued access - atomically take a slot if voters_count < max_concurrent_voters
+                new_count = VoterSlotCounter.try_acquire(election_id)
+                if new_count is not None:
+                    # Election is not full - access granted, voters_count incremented
+                    SessionLeaseService.grant(election_id, voter_id, holds_slot=True)
                     db.session.commit()
-                    print(f"DEBUG: Non-queued election - incremented voters_count from {old_count} to {election.voters_count}")
+                    print(f"DEBUG: Non-queued election - incremented voters_count to {new_count}")
                     return jsonify({
                         'eligible': True, 
                         'access_granted': True,
-                        'voters_count': election.voters_count,
+                        'voters_count': new_count,
                         'max_concurrent_voters': max_concurrent,
                         'action': 'redirect_to_cast'
                     })
                 else:
                     # Election is full - redirect to waitlist notification
+                    current_voters = VoterSlotCounter.snapshot(election_id)[0]
                     return jsonify({
                         'eligible': True,
                         'access_granted': False,
@@ -87,29 +90,28 @@ class ElectionAccessController:
                 
                 if active_waitlist_entry:
                     # Voter was activated from waitlist - grant access, increment voters_count, and mark waitlist as done
-                    old_count = election.voters_count or 0
-                    election.voters_count = old_count + 1
+                    new_count = VoterSlotCounter.force_acquire(election_id)
                     active_waitlist_entry.status = 'done'
+                    SessionLeaseService.grant(election_id, voter_id, holds_slot=True)
                     db.session.commit()
-                    print(f"DEBUG: Queued election (from waitlist) - incremented voters_count from {old_count} to {election.voters_count}")
+                    print(f"DEBUG: Queued election (from waitlist) - incremented voters_count to {new_count}")
                     
                     return jsonify({
                         'eligible': True, 
                         'access_granted': True,
-                        'voters_count': election.voters_count,
-                        'max_concurrent_voters': election.max_concurrent_voters or 1,
+                        'voters_count': new_count,
+                        'max_concurrent_voters': max_concurrent,
                         'action': 'redirect_to_cast',
                         'from_waitlist': True
                     })
                 
-                # Use voters_count to check if election is full
-                current_voters = election.voters_count or 0
-                max_concurrent = election.max_concurrent_voters or 1
+                # Atomically take a slot if the election is not full
+                new_count = VoterSlotCounter.try_acquire(election_id)
                 
-                print(f"DEBUG: Queued election - current_voters={current_voters}, max_concurrent={max_concurrent}")
+                print(f"DEBUG: Queued election - slot acquired={new_count is not None}, max_concurrent={max_concurrent}")
                 
-                if current_voters < max_concurrent:
-                    # Election has available slots - grant access and increment voters_count
+                if new_count is not None:
+                    # Election had an available slot - access granted, voters_count incremented
                     # Check if voter is already waiting in queue and remove them
                     existing_waitlist = ElectionWaitlist.query.filter_by(
                         election_id=election_id, 
@@ -118,22 +120,23 @@ class ElectionAccessController:
                     ).first()
                     if existing_waitlist:
                         existing_waitlist.status = 'done'
+                    SessionLeaseService.grant(election_id, voter_id, holds_slot=True)
                     
-                    # Increment voters_count and grant access
-                    old_count = election.voters_count or 0
-                    election.voters_count = current_voters + 1
                     db.session.commit()
-                    print(f"DEBUG: Queued election (direct access) - incremented voters_count from {old_count} to {election.voters_count}")
+                    if existing_waitlist:
+                        WaitlistEventBroker.queue_changed(election_id)
+                    print(f"DEBUG: Queued election (direct access) - incremented voters_count to {new_count}")
                     
                     return jsonify({
                         'eligible': True, 
                         'access_granted': True,
-                        'voters_count': election.voters_count,
+                        'voters_count': new_count,
                         'max_concurrent_voters': max_concurrent,
                         'action': 'redirect_to_cast'
                     })
                 else:
                     # Election is full - add to waitlist queue
+                    current_voters = VoterSlotCounter.snapshot(election_id)[0]
                     # Check if voter is already in waitlist
                     existing_waitlist = ElectionWaitlist.query.filter_by(
                         election_id=election_id, 
@@ -187,7 +190,7 @@ class ElectionAccessController:
         # Check if already in waitlist
         existing = ElectionWaitlist.query.filter_by(election_id=election_id, voter_id=voter_id, status='waiting').first()
         if existing:
-            return jsonify({'message': 'Already in waitlist', 'position': ElectionWaitlist.query.filter_by(election_id=election_id, status='waiting').order_by(ElectionWaitlist.joined_at).all().index(existing) + 1}), 200
+            return jsonify({'message': 'Already in waitlist', 'position': ElectionWaitlist.queue_position(existing)}), 200
         # Count active voters
         active_count = ElectionWaitlist.query.filter_by(election_id=election_id, status='active').count()
         if active_count < (election.max_concurrent_voters or 1):
@@ -201,7 +204,7 @@ class ElectionAccessController:
             entry = ElectionWaitlist(election_id=election_id, voter_id=voter_id, status='waiting')
             db.session.add(entry)
             db.session.commit()
-            position = ElectionWaitlist.query.filter_by(election_id=election_id, status='waiting').order_by(ElectionWaitlist.joined_at).all().index(entry) + 1
+            position = ElectionWaitlist.queue_position(entry)
             return jsonify({'message': 'Added to waitlist', 'status': 'waiting', 'position': position}), 200
     
     @staticmethod
@@ -228,12 +231,12 @@ class ElectionAccessController:
         db.session.delete(entry)
         
         # If voter was active (currently voting), we need to decrement voters_count
-        if was_active:
-            election = Election.query.get(election_id)
-            if election and election.voters_count and election.voters_count > 0:
-                election.voters_count -= 1
+        if was_active and SessionLeaseService.end_session(election_id, voter_id):
+            VoterSlotCounter.release(election_id)
                 
         db.session.commit()
+        if not was_active:
+            WaitlistEventBroker.queue_changed(election_id)
         
         return jsonify({'message': 'Left waitlist successfully'}), 200
 
@@ -245,9 +248,81 @@ class ElectionAccessController:
         entry = ElectionWaitlist.query.filter_by(election_id=election_id, voter_id=voter_id, status='waiting').first()
         if not entry:
             return jsonify({'error': 'Not in waitlist'}), 404
-        waitlist = ElectionWaitlist.query.filter_by(election_id=election_id, status='waiting').order_by(ElectionWaitlist.joined_at).all()
-        position = waitlist.index(entry) + 1
-        return jsonify({'position': position, 'total_waiting': len(waitlist)}), 200
+        position = ElectionWaitlist.queue_position(entry)
+        return jsonify({'position': position, 'total_waiting': ElectionWaitlist.count_waiting(election_id)}), 200
+
+    @staticmethod
+    def waitlist_events(election_id):
+        """
+        Server-Sent Events stream of one voter's waitlist state.
+        
+        Sends a 'position' event whenever the voter's position (or the queue size)
+        changes and an 'activated' event when the voter is promoted, then closes.
+        State is re-read when this process publishes a queue change and on every
+        keep-alive, which is how changes made by other server processes arrive.
+        The stream holds its request open for the voter's whole wait, so it needs
+        a threaded worker (gthread in gunicorn.conf.py), not a sync one.
+        """
+        voter_id = request.args.get('voter_id')
+        if not voter_id:
+            return jsonify({'error': 'voter_id required'}), 400
+        election = Election.query.get(election_id)
+        if not election or not election.queued_access:
+            return jsonify({'error': 'Election not found or not using queued access'}), 404
+        
+        keepalive = current_app.config.get('WAITLIST_SSE_KEEPALIVE', 15)
+        subscriber = WaitlistEventBroker.subscribe(election_id)
+        
+        def voter_state():
+            entry = ElectionWaitlist.query.filter_by(
+                election_id=election_id, voter_id=voter_id
+            ).filter(ElectionWaitlist.status.in_(['waiting', 'active'])).first()
+            
+            if not entry:
+                state = {'voter_status': 'not_in_queue', 'position_in_queue': None}
+            elif entry.status == 'active':
+                state = {'voter_status': 'active', 'position_in_queue': 0}
+            else:
+                position = ElectionWaitlist.queue_position(entry)
+                state = {
+                    'voter_status': 'waiting',
+                    'position_in_queue': position,
+                    'total_waiting': ElectionWaitlist.count_waiting(election_id),
+                    'is_next': position == 1
+                }
+            # Do not hold a connection open between events
+            db.session.close()
+            return state
+        
+        def stream():
+            try:
+                last_state = None
+                while True:
+                    state = voter_state()
+                    if state != last_state:
+                        event = 'activated' if state['voter_status'] == 'active' else 'position'
+                        yield f"event: {event}\ndata: {json.dumps(dict(state, election_id=election_id))}\n\n"
+                        last_state = state
+                        if state['voter_status'] != 'waiting':
+                            return
+                    else:
+                        yield ": keep-alive\n\n"
+                    
+                    try:
+                        subscriber.get(timeout=keepalive)
+                        # Collapse a burst of events into one re-read
+                        while True:
+                            subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+            finally:
+                WaitlistEventBroker.unsubscribe(election_id, subscriber)
+        
+        return Response(
+            stream_with_context(stream()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
 
     @staticmethod
     def next_in_waitlist(election_id):
@@ -258,13 +333,13 @@ class ElectionAccessController:
         active_count = ElectionWaitlist.query.filter_by(election_id=election_id, status='active').count()
         if active_count >= (election.max_concurrent_voters or 1):
             return jsonify({'message': 'No slot available'}), 200
-        # Get next waiting
-        next_entry = ElectionWaitlist.query.filter_by(election_id=election_id, status='waiting').order_by(ElectionWaitlist.joined_at).first()
-        if not next_entry:
+        # Activate the next waiting voter with a lease on their turn
+        promoted = SessionLeaseService.promote_next(election_id)
+        if not promoted:
             return jsonify({'message': 'No one in waitlist'}), 200
-        next_entry.status = 'active'
         db.session.commit()
-        return jsonify({'message': 'Next voter activated', 'voter_id': next_entry.voter_id}), 200
+        WaitlistEventBroker.voter_activated(election_id, promoted[0])
+        return jsonify({'message': 'Next voter activated', 'voter_id': promoted[0]}), 200
 
     @staticmethod
     def get_active_voters(election_id):
@@ -295,11 +370,7 @@ class ElectionAccessController:
             return jsonify({'error': 'Organization not found'}), 404
         
         # If organization has no college affiliation, election is open to all colleges
-        if not org.college_id:
-            count = Voter.query.count()
-        else:
-            # Election is restricted to voters from the same college as the organization
-            count = Voter.query.filter_by(college_id=org.college_id).count()
+        count = EligibleVoterCounts.count(org.college_id)
         return jsonify({'eligible_voters': count})
 
     @staticmethod
@@ -319,11 +390,7 @@ class ElectionAccessController:
             active_count = ElectionWaitlist.query.filter_by(election_id=election_id, status='active').count()
             
             # Get total waitlist info
-            waiting_entries = ElectionWaitlist.query.filter_by(
-                election_id=election_id, status='waiting'
-            ).order_by(ElectionWaitlist.joined_at).all()
-            
-            total_waiting = len(waiting_entries)
+            total_waiting = ElectionWaitlist.count_waiting(election_id)
             max_concurrent = election.max_concurrent_voters or 1
             available_slots = max(0, max_concurrent - active_count)
             
@@ -348,8 +415,7 @@ class ElectionAccessController:
                 if voter_entry:
                     if voter_entry.status == 'waiting':
                         # Find position in queue
-                        position = next((i + 1 for i, entry in enumerate(waiting_entries) 
-                                       if entry.voter_id == voter_id), None)
+                        position = ElectionWaitlist.queue_position(voter_entry)
                         response_data.update({
                             'voter_status': 'waiting',
                             'position_in_queue': position,
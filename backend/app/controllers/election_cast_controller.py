@@ -2,10 +2,16 @@ from app.models.election import Election
 from app.models.candidate import Candidate
 from app.models.position import Position
 from app.models.vote import Vote
-from app.models.voter import Voter
 from app.models.election_waitlist import ElectionWaitlist
+from app.models.organization import Organization
 from app import db
-from flask import jsonify, request
+from app.services.access import VoterSlotCounter, WaitlistEventBroker, SessionLeaseService, EligibleVoterCounts
+from app.services.tally import RunningTallyService
+from app.services.crypto import PaillierKeyCache
+from flask import jsonify, request, current_app
+from sqlalchemy import LargeBinary, cast, exists, insert, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
 import os
 
 
@@ -55,7 +61,7 @@ class ElectionCastController:
             
             print(f'DEBUG: Processing vote submission for election_id={election_id}, student_id={student_id}, votes count={len(votes) if votes else 0}')
             
-            if not student_id or not isinstance(votes, list):
+            if not student_id or not isinstance(votes, list) or not votes:
                 print('DEBUG submit_vote error: missing student_id or votes')
                 return jsonify({'error': 'Missing student_id or votes'}), 400
                 
@@ -66,12 +72,19 @@ class ElectionCastController:
                     print('DEBUG submit_vote error: missing encrypted_vote for candidate', v.get('candidate_id'))
                     return jsonify({'error': 'All votes must include encrypted_vote'}), 400
             
-            # Check for duplicate vote for this election
-            existing = Vote.query.filter_by(election_id=election_id, student_id=student_id).first()
-            if existing:
-                print('DEBUG submit_vote error: already voted')
-                return jsonify({'error': 'You have already voted in this election.'}), 400
-                
+            # Reject ciphertexts the tally could not use: each must be an integer in [1, n^2) coprime to n
+            paillier_key = PaillierKeyCache.get(election_id)
+            if paillier_key is None:
+                print(f'DEBUG submit_vote: no Paillier key for election {election_id}, ciphertexts not range-checked')
+            else:
+                for v in votes:
+                    try:
+                        # Store the canonical decimal form so the tally parses it without surprises
+                        v['encrypted_vote'] = str(paillier_key.parse_ciphertext(v['encrypted_vote']))
+                    except ValueError as e:
+                        print(f'DEBUG submit_vote error: invalid ciphertext for candidate {v.get("candidate_id")}: {e}')
+                        return jsonify({'error': f'Invalid encrypted vote for candidate {v.get("candidate_id")}: {e}'}), 400
+            
             # Enforce one vote per position
             seen_positions = set()
             for v in votes:
@@ -80,56 +93,50 @@ class ElectionCastController:
                     print('DEBUG submit_vote error: multiple votes for same position')
                     return jsonify({'error': 'Multiple votes for the same position are not allowed.'}), 400
                 seen_positions.add(pos_id)
-                
-            # Save votes with proper encrypted data
-            # Each vote represents one vote for the chosen candidate
-            for v in votes:
-                print('DEBUG submit_vote saving vote for candidate:', v.get('candidate_id'))
-                
-                # Store ZKP proof if provided, otherwise mark as verified for now
-                zkp_status = 'verified'  # Default status
-                if 'zkp_proof' in v and v['zkp_proof']:
-                    zkp_status = 'verified_with_proof'
-                
-                # Store the encrypted vote (which should be the encryption of value 1)
-                vote = Vote(
-                    election_id=election_id,
-                    student_id=student_id,
-                    candidate_id=v['candidate_id'],
-                    encrypted_vote=v['encrypted_vote'],  # This should be encryption of 1
-                    zkp_proof=zkp_status,
-                    verification_receipt='sent',
-                    vote_status='cast'
+            
+            election_row = (
+                db.session.query(Election.election_id, Organization.college_id)
+                .outerjoin(Organization, Organization.org_id == Election.org_id)
+                .filter(Election.election_id == election_id)
+                .first()
+            )
+            if election_row is None:
+                return jsonify({'error': 'Election not found'}), 404
+            
+            # Save all votes of the ballot in one statement; the unique constraint
+            # on (election_id, student_id, position_id) rejects concurrent duplicates
+            try:
+                inserted = ElectionCastController._insert_ballot(election_id, student_id, votes, paillier_key)
+            except IntegrityError:
+                db.session.rollback()
+                print('DEBUG submit_vote error: duplicate vote rejected by constraint')
+                return jsonify({'error': 'You have already voted in this election.'}), 400
+            
+            if len(inserted) != len(votes):
+                db.session.rollback()
+                # Only the failure path pays for telling the two causes apart
+                if Vote.query.filter_by(election_id=election_id, student_id=student_id).first():
+                    print('DEBUG submit_vote error: already voted')
+                    return jsonify({'error': 'You have already voted in this election.'}), 400
+                print('DEBUG submit_vote error: candidate not in election')
+                return jsonify({'error': 'One or more candidates do not belong to this election.'}), 400
+            
+            # Fold the new ballots into the running tally while the votes are in this transaction
+            if current_app.config.get('INCREMENTAL_TALLY_ENABLED'):
+                RunningTallyService.fold_ballots(
+                    election_id, [(v['candidate_id'], v['encrypted_vote']) for v in votes]
                 )
-                db.session.add(vote)
             
-            # Update participation rate based on actual votes cast
-            election = Election.query.get(election_id)
-            if election and election.organization:
-                print(f'DEBUG: Election {election_id} organization: org_id={election.org_id}, college_id={election.organization.college_id or "None"}')
-                
-                if election.organization.college_id:
-                    # Election is restricted to one college
-                    eligible_voters = Voter.query.filter_by(college_id=election.organization.college_id).count()
-                    print(f'DEBUG: College-specific election. Eligible voters from college_id={election.organization.college_id}: {eligible_voters}')
-                else:
-                    # Election is open to all colleges
-                    eligible_voters = Voter.query.count()
-                    print(f'DEBUG: All-college election. Total eligible voters: {eligible_voters}')
-                
-                if eligible_voters > 0:
-                    # Count unique voters who have cast votes in this election
-                    unique_voters_count = db.session.query(db.func.count(db.distinct(Vote.student_id))).filter(Vote.election_id == election_id).scalar()
-                    election.participation_rate = (unique_voters_count / eligible_voters) * 100
-                    print(f'DEBUG: Participation rate calculation: {unique_voters_count} unique voters / {eligible_voters} eligible voters = {election.participation_rate:.2f}%')                
+            # Count this voter once and update participation from the counter
+            counts = ElectionCastController._count_ballot(election_id, election_row.college_id)
             db.session.commit()
-            print('DEBUG submit_vote success')
+            print(f'DEBUG submit_vote success: ballots_cast={counts.ballots_cast}, participation_rate={counts.participation_rate}')
             return jsonify({
                 'message': 'Vote submitted successfully',
-                'votes_count': len(votes),
+                'votes_count': len(inserted),
                 'election_id': election_id,
-                'total_voters': election.voters_count if election else None,
-                'participation_rate': round(election.participation_rate, 2) if election and election.participation_rate else None
+                'total_voters': counts.voters_count,
+                'participation_rate': round(counts.participation_rate, 2) if counts.participation_rate else None
             })
             
         except Exception as ex:
@@ -137,6 +144,95 @@ class ElectionCastController:
             print('Error in submit_vote:', ex)
             return jsonify({'error': 'Failed to submit vote'}), 500
 
+    @staticmethod
+    def _insert_ballot(election_id, student_id, votes, paillier_key=None):
+        """
+        Insert every vote of a ballot with a single INSERT ... SELECT ... RETURNING.
+
+        Args:
+            election_id: ID of the election
+            student_id: Student ID of the voter
+            votes: Ballot entries with candidate_id, encrypted_vote and optional zkp_proof
+            paillier_key: Election key the ciphertexts were validated against, or None
+
+        Returns:
+            List of (vote_id, candidate_id) rows that were inserted
+        """
+        return db.session.execute(
+            ElectionCastController._ballot_statement(election_id, student_id, votes, paillier_key)
+        ).all()
+
+    @staticmethod
+    def _ballot_statement(election_id, student_id, votes, paillier_key=None):
+        """
+        Build the INSERT ... SELECT ... RETURNING that stores every vote of a ballot.
+
+        Each row is selected from its candidate, so position_id is taken from the
+        candidate and candidates of other elections insert nothing. The NOT EXISTS
+        guard makes a repeated ballot insert nothing as well.
+
+        Args:
+            election_id: ID of the election
+            student_id: Student ID of the voter
+            votes: Ballot entries with candidate_id, encrypted_vote and optional zkp_proof
+            paillier_key: Election key the ciphertexts were validated against; when given,
+                each ciphertext is also stored as fixed-width bytes
+
+        Returns:
+            Insert statement returning (vote_id, candidate_id) of each inserted row
+        """
+        already_voted = exists().where(Vote.election_id == election_id, Vote.student_id == student_id)
+        cast_time = datetime.utcnow()
+        rows = []
+        for v in votes:
+            # Store ZKP proof status if provided, otherwise mark as verified for now
+            zkp_status = 'verified_with_proof' if v.get('zkp_proof') else 'verified'
+            ciphertext_bytes = paillier_key.to_bytes(int(v['encrypted_vote'])) if paillier_key else None
+            rows.append(
+                select(
+                    literal(election_id), literal(student_id),
+                    Candidate.candidate_id, Candidate.position_id,
+                    literal(v['encrypted_vote']),  # This should be encryption of 1
+                    # Explicit CAST: inside UNION ALL PostgreSQL would type a bare NULL as text
+                    cast(literal(ciphertext_bytes, LargeBinary), LargeBinary),
+                    literal(zkp_status), literal('sent'), literal(cast_time), literal('cast')
+                ).where(
+                    Candidate.candidate_id == v['candidate_id'],
+                    Candidate.election_id == election_id,
+                    ~already_voted
+                )
+            )
+        
+        return insert(Vote).from_select(
+            ['election_id', 'student_id', 'candidate_id', 'position_id', 'encrypted_vote', 'encrypted_vote_bytes',
+             'zkp_proof', 'verification_receipt', 'cast_time', 'vote_status'],
+            rows[0] if len(rows) == 1 else union_all(*rows)
+        ).returning(Vote.vote_id, Vote.candidate_id)
+
+    @staticmethod
+    def _count_ballot(election_id, college_id):
+        """
+        Add one ballot to the election counter and derive participation_rate from it.
+
+        Args:
+            election_id: ID of the election
+            college_id: College the election is restricted to, or None for all colleges
+
+        Returns:
+            Row with ballots_cast, voters_count and participation_rate after the update
+        """
+        eligible_voters = EligibleVoterCounts.count(college_id)
+        values = {'ballots_cast': Election.ballots_cast + 1}
+        if eligible_voters > 0:
+            values['participation_rate'] = (Election.ballots_cast + 1) * 100.0 / eligible_voters
+        return db.session.execute(
+            update(Election)
+            .where(Election.election_id == election_id)
+            .values(**values)
+            .returning(Election.ballots_cast, Election.voters_count, Election.participation_rate),
+            execution_options={'synchronize_session': False}
+        ).first()
+
     @staticmethod
     def check_voter_voted(election_id, voter_id=None):
         """Check if a voter has already voted in this election"""
@@ -209,8 +305,7 @@ class ElectionCastController:
             if not election.queued_access:
                 # For non-queued elections, DO NOT increment voters_count here
                 # access_check has already incremented it when grant_access=true was called
-                current_voters = election.voters_count or 0
-                max_concurrent = election.max_concurrent_voters or 1
+                current_voters, max_concurrent = VoterSlotCounter.snapshot(election_id)
                 
                 print(f"DEBUG: start_voting_session - current_voters={current_voters}, max_concurrent={max_concurrent}")
                 print(f"DEBUG: start_voting_session - access_check already incremented voters_count, just validating session")
@@ -218,10 +313,10 @@ class ElectionCastController:
                 # Just validate that the voter should have access based on current count
                 if current_voters <= max_concurrent:
                     # Voter should have access (was already counted by access_check)
-                    print(f"DEBUG: Voting session validated, voters_count={election.voters_count}")
+                    print(f"DEBUG: Voting session validated, voters_count={current_voters}")
                     return jsonify({
                         'message': 'Voting session validated (already counted by access_check)',
-                        'voters_count': election.voters_count,
+                        'voters_count': current_voters,
                         'max_concurrent_voters': max_concurrent,
                         'queued_access': False
                     })
@@ -243,19 +338,19 @@ class ElectionCastController:
                     status='active'
                 ).first()
                 
+                current_voters, max_concurrent = VoterSlotCounter.snapshot(election_id)
+                
                 if active_entry:
                     # Voter came from waitlist activation - access_check already handled the count
                     print(f"DEBUG: Queued election - voter came from waitlist, voters_count already managed by access_check")
                     return jsonify({
                         'message': 'Voting session active from waitlist (counted by access_check)',
                         'queued_access': True,
-                        'voters_count': election.voters_count
+                        'voters_count': current_voters
                     })
                 else:
                     # Check if voter has direct access (not through waitlist)
                     # This happens when election had available slots during access-check
-                    current_voters = election.voters_count or 0
-                    max_concurrent = election.max_concurrent_voters or 1
                     
                     print(f"DEBUG: Queued election - validating direct access, voters_count={current_voters}, max={max_concurrent}")
                     
@@ -265,7 +360,7 @@ class ElectionCastController:
                         return jsonify({
                             'message': 'Voting session active (direct access, counted by access_check)',
                             'queued_access': True,
-                            'voters_count': election.voters_count
+                            'voters_count': current_voters
                         })
                     else:
                         print(f"DEBUG: Queued election - no valid access found for voter {voter_id}")
@@ -279,6 +374,37 @@ class ElectionCastController:
             print(f'Error in start_voting_session: {ex}')
             return jsonify({'error': 'Failed to start voting session'}), 500
 
+    @staticmethod
+    def heartbeat_voting_session(election_id):
+        """
+        Endpoint polled by the ballot page to keep a voting session alive.
+        Sessions that stop sending heartbeats are reclaimed by the reaper after
+        VOTING_SESSION_TTL seconds and their slot goes to the next voter.
+        """
+        try:
+            data = request.json or {}
+            voter_id = data.get('voter_id')
+
+            if not voter_id:
+                return jsonify({'error': 'voter_id required'}), 400
+
+            expires_at = SessionLeaseService.renew(election_id, voter_id)
+            db.session.commit()
+
+            if expires_at is None:
+                return jsonify({'error': 'No active voting session', 'expired': True}), 404
+
+            return jsonify({
+                'message': 'Voting session renewed',
+                'expires_at': expires_at.isoformat(),
+                'ttl_seconds': current_app.config.get('VOTING_SESSION_TTL')
+            }), 200
+
+        except Exception as ex:
+            db.session.rollback()
+            print(f'Error in heartbeat_voting_session: {ex}')
+            return jsonify({'error': 'Failed to renew voting session'}), 500
+
     @staticmethod
     def leave_voting_session(election_id):
         """
@@ -309,28 +435,25 @@ class ElectionCastController:
                 ).first()
                 
                 if waitlist_entry:
-                    # Mark as done and decrement voters_count
+                    # Mark as done and decrement voters_count unless the reaper already reclaimed the slot
                     waitlist_entry.status = 'done'
-                    old_count = election.voters_count or 0
-                    if old_count > 0:
-                        election.voters_count = old_count - 1
-                        print(f"DEBUG: Decremented voters_count from {old_count} to {election.voters_count}")
+                    if SessionLeaseService.end_session(election_id, voter_id):
+                        new_count = VoterSlotCounter.release(election_id)
+                        if new_count is not None:
+                            print(f"DEBUG: Decremented voters_count to {new_count}")
                     
                     # Try to activate next person in queue
-                    next_entry = ElectionWaitlist.query.filter_by(
-                        election_id=election_id, 
-                        status='waiting'
-                    ).order_by(ElectionWaitlist.joined_at).first()
-                    
-                    if next_entry:
-                        next_entry.status = 'active'
-                        print(f"DEBUG: Activated next voter in queue: {next_entry.voter_id}")
+                    promoted = SessionLeaseService.promote_next(election_id)
+                    if promoted:
+                        print(f"DEBUG: Activated next voter in queue: {promoted[0]}")
                         
                     db.session.commit()
+                    if promoted:
+                        WaitlistEventBroker.voter_activated(election_id, promoted[0])
                     return jsonify({
                         'message': 'Successfully left voting session',
-                        'voters_count': election.voters_count,
-                        'next_voter_activated': bool(next_entry),
+                        'voters_count': VoterSlotCounter.snapshot(election_id)[0],
+                        'next_voter_activated': bool(promoted),
                         'voter_id': voter_id,
                         'election_id': election_id
                     }), 200
@@ -345,36 +468,38 @@ class ElectionCastController:
                         print(f"DEBUG: Found waitlist entry with status: {any_waitlist_entry.status}")
                     
                     # Even if not in active waitlist, still try to decrement voters_count
-                    old_count = election.voters_count or 0
-                    if old_count > 0:
-                        election.voters_count = old_count - 1
-                        print(f"DEBUG: Force decremented voters_count from {old_count} to {election.voters_count}")
-                        db.session.commit()
+                    new_count = None
+                    if SessionLeaseService.end_session(election_id, voter_id):
+                        new_count = VoterSlotCounter.release(election_id)
+                    if new_count is not None:
+                        print(f"DEBUG: Force decremented voters_count to {new_count}")
+                    db.session.commit()
                     
                     return jsonify({
                         'message': 'Left voting session (not in active waitlist)',
-                        'voters_count': election.voters_count,
+                        'voters_count': new_count if new_count is not None else 0,
                         'voter_id': voter_id,
                         'election_id': election_id
                     }), 200
             else:
-                # For non-queued elections, decrement voter_count
-                old_count = election.voters_count or 0
-                if old_count > 0:
-                    election.voters_count = old_count - 1
-                    print(f"DEBUG: Non-queued election - decremented voters_count from {old_count} to {election.voters_count}")
-                    db.session.commit()
+                # For non-queued elections, decrement voter_count unless the reaper already reclaimed the slot
+                new_count = None
+                if SessionLeaseService.end_session(election_id, voter_id):
+                    new_count = VoterSlotCounter.release(election_id)
+                db.session.commit()
+                if new_count is not None:
+                    print(f"DEBUG: Non-queued election - decremented voters_count to {new_count}")
                     return jsonify({
                         'message': 'Successfully left voting session',
-                        'voters_count': election.voters_count,
+                        'voters_count': new_count,
                         'voter_id': voter_id,
                         'election_id': election_id
                     }), 200
                 else:
-                    print(f"DEBUG: No voters_count to decrement (current: {old_count})")
+                    print(f"DEBUG: No voters_count to decrement")
                     return jsonify({
                         'message': 'No active voting session to leave',
-                        'voters_count': election.voters_count,
+                        'voters_count': 0,
                         'voter_id': voter_id,
                         'election_id': election_id
                     }), 200
@@ -388,24 +513,28 @@ class ElectionCastController:
     def increment_voters_count(election_id):
         """
         Increment the voters_count for an election when a voter starts voting.
+        The slot is only taken while the election is below max_concurrent_voters.
         """
         try:
             election = Election.query.get(election_id)
             if not election:
                 return jsonify({'error': 'Election not found'}), 404
             
-            # Initialize voters_count if it's None
-            if election.voters_count is None:
-                election.voters_count = 0
-            
-            # Increment the count
-            election.voters_count += 1
+            # Check capacity and increment in one statement
+            new_count = VoterSlotCounter.try_acquire(election_id)
+            if new_count is None:
+                current_voters, max_concurrent = VoterSlotCounter.snapshot(election_id)
+                return jsonify({
+                    'error': 'Election is full',
+                    'voters_count': current_voters,
+                    'max_concurrent_voters': max_concurrent
+                }), 409
             
             db.session.commit()
             
             return jsonify({
                 'message': 'Voters count incremented successfully',
-                'voters_count': election.voters_count
+                'voters_count': new_count
             }), 200
             
         except Exception as ex:
@@ -421,17 +550,13 @@ class ElectionCastController:
             if not election:
                 return jsonify({'error': 'Election not found'}), 404
             
-            # Decrement the count (ensure it doesn't go below 0)
-            if election.voters_count is None or election.voters_count <= 0:
-                election.voters_count = 0
-            else:
-                election.voters_count -= 1
-            
+            # Decrement the count (the statement never goes below 0)
+            new_count = VoterSlotCounter.release(election_id)
             db.session.commit()
             
             return jsonify({
                 'message': 'Voters count decremented successfully',
-                'voters_count': election.voters_count
+                'voters_count': new_count if new_count is not None else 0
             }), 200
             
         except Exception as ex:
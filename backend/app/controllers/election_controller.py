@@ -6,9 +6,10 @@ from app import db
 from flask import jsonify, request, current_app
 from datetime import datetime
 from app.models.election_waitlist import ElectionWaitlist
-from app.models.voter import Voter
 from app.models.position import Position
 from app.models.vote import Vote
+from app.services.tally.vote_reader import VoteReader
+from app.services.access import EligibleVoterCounts
 from app.controllers.auth_controller import AuthController
 import os
 import uuid
@@ -322,6 +323,8 @@ class ElectionController:
             # 2. Delete all election results for this election (MUST be before deleting candidates)
             from app.models.election_result import ElectionResult
             ElectionResult.query.filter_by(election_id=election_id).delete()
+            from app.models.running_tally import RunningTally
+            RunningTally.query.filter_by(election_id=election_id).delete()
 
             # 3. Delete all candidates linked to this election (and their photos)
             from app.models.candidate import Candidate
@@ -359,6 +362,8 @@ class ElectionController:
 
             from app.models.election_waitlist import ElectionWaitlist
             ElectionWaitlist.query.filter_by(election_id=election_id).delete()
+            from app.models.voting_session_lease import VotingSessionLease
+            VotingSessionLease.query.filter_by(election_id=election_id).delete()
 
             db.session.delete(election)
             db.session.commit()
@@ -524,14 +529,10 @@ class ElectionController:
             for election in finished_elections:
                 # Get all candidates for this election
                 candidates = Candidate.query.filter_by(election_id=election.election_id).all()
-                # Get all votes for this election
-                votes = Vote.query.filter_by(election_id=election.election_id).all()
-                total_votes = len(votes)
-                # Count votes per candidate
-                candidate_vote_counts = {c.candidate_id: 0 for c in candidates}
-                for v in votes:
-                    if v.candidate_id in candidate_vote_counts:
-                        candidate_vote_counts[v.candidate_id] += 1
+                # Count votes per candidate in the database
+                vote_distribution = VoteReader.count_by_candidate(election.election_id)
+                total_votes = sum(vote_distribution.values())
+                candidate_vote_counts = {c.candidate_id: vote_distribution.get(c.candidate_id, 0) for c in candidates}
                 # Build candidate breakdown
                 candidate_breakdown = []
                 max_votes = max(candidate_vote_counts.values()) if candidate_vote_counts else 0
@@ -546,12 +547,8 @@ class ElectionController:
                         'winner': votes_count == max_votes and max_votes > 0
                     })                # Compute participation rate based on total registered voters
                 participation_rate = None
-                if election.organization and election.organization.college_id:
-                    # Election is restricted to one college
-                    total_registered_voters = Voter.query.filter_by(college_id=election.organization.college_id).count()
-                else:
-                    # Election is open to all colleges
-                    total_registered_voters = Voter.query.count()
+                # Restricted to the organization's college, or open to all colleges
+                total_registered_voters = EligibleVoterCounts.for_election(election)
                 
                 if total_registered_voters > 0:
                     participation_rate = round((total_votes / total_registered_voters) * 100, 1)
@@ -1,19 +1,23 @@
 
-from flask import jsonify, request, send_file
+from flask import jsonify, request, send_file, current_app
 from app.models.election import Election
 from app.models.organization import Organization
 from app.models.vote import Vote
-from app.models.voter import Voter
 from app.models.election_result import ElectionResult
 from app.models.crypto_config import CryptoConfig
 from app.models.key_share import KeyShare
 from app.models.trusted_authority import TrustedAuthority
 from app.models.candidate import Candidate
 from app.models.position import Position
-from datetime import datetime
+from datetime import datetime, date
 from app import db
+from app.services.tally import HomomorphicTallyEngine, RunningTallyService, VoteReader, BatchDecryptor
+from app.services.access import EligibleVoterCounts
+from app.services.jobs import JobQueue
+from app.services.results import ElectionResultsReadModel, ResultsSnapshotService, ResultsExporter
+from app.services.crypto import (PaillierKeyCache, ciphertext_width, encode_ciphertext, decode_ciphertext,
+                                 ShareFormatError, parse_shares, reconstruct_secret)
 from phe import paillier
-import shamirs
 import json
 import base64
 import logging
@@ -44,78 +48,79 @@ class ElectionResultsController:
             
             logger.info(f"Starting homomorphic tally for election {election_id}")
             
-            # Get all votes for this election
-            votes = Vote.query.filter_by(election_id=election_id).all()
-            logger.info(f"Found {len(votes)} votes to tally for election {election_id}")
+            # Count votes per candidate without loading the ballots themselves
+            vote_distribution = VoteReader.count_by_candidate(election_id)
+            total_votes = sum(vote_distribution.values())
+            logger.info(f"Found {total_votes} votes to tally for election {election_id}")
             
-            if not votes:
+            if not total_votes:
                 logger.warning(f"No votes found for election {election_id}")
                 return jsonify({'error': 'No votes found for this election'}), 400
             
             # VERIFICATION STEP: Verify vote integrity before tallying
             logger.info("Verifying vote integrity before tallying")
-            invalid_votes = []
-            for v in votes:
-                if not v.encrypted_vote or len(v.encrypted_vote) < 10:  # Simple validation
-                    invalid_votes.append(v.vote_id)
+            invalid_votes = VoteReader.find_malformed(election_id, paillier_key=PaillierKeyCache.get(election_id))
             
             if invalid_votes:
                 logger.error(f"Found {len(invalid_votes)} invalid votes: {invalid_votes}")
                 return jsonify({'error': f'Found {len(invalid_votes)} invalid votes. Please check vote data integrity.'}), 400
             
             # Debug: Log vote distribution
-            from collections import Counter
-            vote_distribution = Counter(v.candidate_id for v in votes)
-            logger.info(f"Vote distribution by candidate: {dict(vote_distribution)}")
-            
-            # Group encrypted votes by candidate
-            candidate_totals = {}
-            for v in votes:
-                if v.candidate_id not in candidate_totals:
-                    candidate_totals[v.candidate_id] = []
-                candidate_totals[v.candidate_id].append(v.encrypted_vote)
-            
-            logger.info(f"Grouped votes for {len(candidate_totals)} candidates")
+            logger.info(f"Vote distribution by candidate: {vote_distribution}")
+            JobQueue.report_progress(0.1, 'Ballots counted and checked')
             
             # Get public key from crypto config
             crypto_config = CryptoConfig.query.filter_by(election_id=election_id).first()
             if not crypto_config:
                 return jsonify({'error': 'Crypto config not found'}), 404
             
-            # Parse the public key JSON and extract the n value
+            # Parsed public key, shared with other requests through the key cache
             try:
-                public_key_data = json.loads(crypto_config.public_key)
-                pubkey = paillier.PaillierPublicKey(n=int(public_key_data.get('n')))
+                pubkey = PaillierKeyCache.for_config(crypto_config).public_key
                 logger.info(f"Loaded public key with n={pubkey.n.bit_length()} bits")
                 
                 # Start a transaction for atomicity
                 db.session.begin_nested()
                 
-                # Homomorphically add encrypted votes per candidate
                 encrypted_results = {}
+                encrypted_result_bytes = {}
                 encryption_errors = []
                 
-                for candidate_id, enc_votes in candidate_totals.items():
-                    logger.info(f"Processing {len(enc_votes)} encrypted votes for candidate {candidate_id}")
-                    
-                    enc_sum = None
-                    for i, enc_vote in enumerate(enc_votes):
-                        try:
-                            enc = paillier.EncryptedNumber(pubkey, int(enc_vote), 0)
-                            if enc_sum is None:
-                                enc_sum = enc
-                            else:
-                                enc_sum = enc_sum + enc
-                            logger.debug(f"Added vote {i+1}/{len(enc_votes)} for candidate {candidate_id}")
-                        except Exception as e:
-                            error_msg = f"Error processing encrypted vote {i} for candidate {candidate_id}: {e}"
-                            logger.error(error_msg)
-                            encryption_errors.append(error_msg)
-                            # Continue processing other votes, but track the error
-                    
-                    if enc_sum:
-                        encrypted_results[candidate_id] = str(enc_sum.ciphertext())
-                        logger.info(f"Homomorphic sum for candidate {candidate_id}: {str(enc_sum.ciphertext())[:50]}...")
+                raw_totals = None
+                if current_app.config.get('INCREMENTAL_TALLY_ENABLED'):
+                    # Use the products folded in at cast time when they account for every ballot
+                    raw_totals = RunningTallyService.read_totals(election_id, crypto_config.crypto_id, vote_distribution)
+                    if raw_totals is not None:
+                        logger.info(f"Using running tally for election {election_id}")
+                        tally_stats = {'source': 'running_tally', 'ciphertexts': total_votes}
+                
+                if raw_totals is None:
+                    # Homomorphically add encrypted votes per candidate (chunked product mod n^2)
+                    engine = HomomorphicTallyEngine(
+                        pubkey.n,
+                        chunk_size=current_app.config.get('TALLY_CHUNK_SIZE'),
+                        max_workers=current_app.config.get('TALLY_MAX_WORKERS') or None
+                    )
+                    try:
+                        # Ciphertexts are range-checked when cast and decoded with int.from_bytes when stored
+                        # as binary, so the hot loop does no per-vote parsing or error handling
+                        raw_totals = engine.tally_stream(VoteReader.iter_ciphertext_values(election_id))
+                        tally_stats = dict(engine.last_stats, source='full_pass')
+                    except (TypeError, ValueError) as e:
+                        # Only ballots stored before cast-time validation can get here
+                        error_msg = f"Unparseable encrypted vote: {e}"
+                        logger.error(error_msg)
+                        encryption_errors.append(error_msg)
+                        raw_totals = {}
+                
+                if not encryption_errors:
+                    for candidate_id, raw_total in raw_totals.items():
+                        # Obfuscate the published total exactly as EncryptedNumber.ciphertext() did before
+                        enc_sum = paillier.EncryptedNumber(pubkey, raw_total, 0)
+                        obfuscated = enc_sum.ciphertext()
+                        encrypted_results[candidate_id] = str(obfuscated)
+                        encrypted_result_bytes[candidate_id] = encode_ciphertext(obfuscated, ciphertext_width(pubkey.nsquare))
+                        logger.info(f"Homomorphic sum for candidate {candidate_id}: {encrypted_results[candidate_id][:50]}...")
                 
                 if encryption_errors:
                     # If there were errors, roll back and report them
@@ -127,6 +132,7 @@ class ElectionResultsController:
                     }), 500
                 
                 logger.info(f"Completed homomorphic tallying for {len(encrypted_results)} candidates")
+                JobQueue.report_progress(0.8, 'Homomorphic sums computed')
                 
                 # CRITICAL FIX: Use proper upsert logic to prevent duplicates
                 # Check if results already exist to prevent re-tallying
@@ -150,7 +156,8 @@ class ElectionResultsController:
                         er, was_created = ElectionResult.upsert_result(
                             election_id=election_id,
                             candidate_id=candidate_id,
-                            encrypted_vote_total=enc_total
+                            encrypted_vote_total=enc_total,
+                            encrypted_vote_total_bytes=encrypted_result_bytes[candidate_id]
                         )
                         # Only count as created if it's actually a new record
                         if was_created:
@@ -186,6 +193,7 @@ class ElectionResultsController:
                 # Commit all changes
                 db.session.commit()
                 logger.info(f"Successfully stored {results_created} election results and updated election status")
+                JobQueue.report_progress(0.95, 'Encrypted results stored')
                 
                 # Final verification: ensure no duplicates exist after commit
                 final_duplicates = ElectionResult.detect_duplicates(election_id)
@@ -209,9 +217,10 @@ class ElectionResultsController:
                 return jsonify({
                     'encrypted_results': encrypted_results,
                     'candidates_tallied': len(encrypted_results),
-                    'total_votes_processed': len(votes),
+                    'total_votes_processed': total_votes,
                     'results_stored': results_created,
-                    'verification_passed': True
+                    'verification_passed': True,
+                    'tally_stats': tally_stats
                 }), 200
                 
             except Exception as e:
@@ -242,7 +251,7 @@ class ElectionResultsController:
             return jsonify({'error': str(e)}), 500    @staticmethod
     def reconstruct_private_key():
         """
-        Reconstruct the private key from key shares using Shamir Secret Sharing with shamirs library.
+        Reconstruct the private key from key shares using Shamir Secret Sharing.
         Only supports direct p sharing (reconstructing Paillier prime p directly).
         """
         try:
@@ -296,8 +305,7 @@ class ElectionResultsController:
                 
                 # FALLBACK: Generate a suitable prime based on public key
                 try:
-                    public_key_data = json.loads(crypto_config.public_key)
-                    n = int(public_key_data.get('n'))
+                    n = PaillierKeyCache.for_config(crypto_config).public_key.n
                     
                     # Estimate the size needed (roughly half of n plus safety margin)
                     estimated_p_bits = n.bit_length() // 2
@@ -350,83 +358,31 @@ class ElectionResultsController:
             # Get public key n for validation
             public_key_n = None
             try:
-                public_key_data = json.loads(crypto_config.public_key)
-                public_key_n = int(public_key_data.get('n'))
+                public_key = PaillierKeyCache.for_config(crypto_config).public_key
+                public_key_n = public_key.n
                 logger.info(f"Found public key n: {public_key_n}")
             except Exception as e:
                 logger.error(f"Could not get public key n: {e}")
                 return jsonify({'error': 'Could not retrieve public key n for validation'}), 500
             
-            # Parse shares to proper format for shamirs library
-            parsed_shares = []
+            # Parse shares (x:hex(y), JSON or tuple forms) into (x, y) points
             logger.info(f"Received shares: {shares}")
-            for s in shares:
-                logger.info(f"Processing share: {s}")
-                if not s or (isinstance(s, str) and s.strip() == ""):
-                    continue
-                try:
-                    if isinstance(s, str):
-                        if ':' in s:
-                            try:
-                                x_str, y_hex = s.split(':', 1)
-                                x = int(x_str)
-                                # Check if the value is in hexadecimal format
-                                if all(c in '0123456789abcdefABCDEF' for c in y_hex):
-                                    y = int(y_hex, 16)
-                                else:
-                                    y = int(y_hex)
-                                    
-                                logger.info(f"Parsed share point: x={x}, y={y} (length: {len(str(y))} digits)")
-                                share_obj = shamirs.share(x, y, shamir_prime)
-                                parsed_shares.append(share_obj)
-                                continue
-                            except Exception as e:
-                                logger.warning(f"Failed to parse share as x:hex(y): {e}")
-                                
-                        # Try parsing as JSON format like "(x, y)"
-                        try:
-                            share_data = json.loads(s)
-                            if isinstance(share_data, list) and len(share_data) == 2:
-                                share_obj = shamirs.share(int(share_data[0]), int(share_data[1]), shamir_prime)
-                                parsed_shares.append(share_obj)
-                                continue
-                        except Exception as e:
-                            logger.warning(f"Failed to parse share as JSON: {e}")
-                            
-                        # Try parsing as simple tuple-like string
-                        try:
-                            if s.startswith('(') and s.endswith(')'):
-                                s_clean = s.strip('()')
-                                parts = [p.strip() for p in s_clean.split(',')]
-                                if len(parts) == 2:
-                                    share_obj = shamirs.share(int(parts[0]), int(parts[1]), shamir_prime)
-                                    parsed_shares.append(share_obj)
-                                    continue
-                        except Exception as e:
-                            logger.warning(f"Failed to parse share as tuple string: {e}")
-                            
-                        logger.error(f"Could not parse share in any recognized format: {s}")
-                        return jsonify({'error': f'Invalid share format in: {s}'}), 400
-                    elif isinstance(s, (list, tuple)) and len(s) == 2:
-                        share_obj = shamirs.share(int(s[0]), int(s[1]), shamir_prime)
-                        parsed_shares.append(share_obj)
-                    else:
-                        logger.error(f"Invalid share type: {type(s)}, value: {s}")
-                        return jsonify({'error': f'Invalid share format: {s}'}), 400
-                except Exception as e:
-                    logger.error(f"Error parsing share {s}: {str(e)}")
-                    return jsonify({'error': f'Error parsing share: {str(e)}'}), 400
+            try:
+                parsed_shares = parse_shares(shares)
+            except ShareFormatError as e:
+                logger.error(str(e))
+                return jsonify({'error': str(e)}), 400
             
             if not parsed_shares:
                 logger.error("No valid shares were parsed")
                 return jsonify({'error': 'No valid shares could be parsed from the input'}), 400
             
-            logger.info(f"Successfully parsed {len(parsed_shares)} shares as shamirs.share objects")
+            logger.info(f"Successfully parsed {len(parsed_shares)} shares")
             
-            # Use shamirs library to reconstruct the secret
+            # Reconstruct the secret with cached Lagrange coefficients
             try:
                 # Direct p sharing: reconstructed value is the Paillier prime p
-                reconstructed_p = shamirs.interpolate(parsed_shares)
+                reconstructed_p = reconstruct_secret(parsed_shares, shamir_prime)
                 logger.info(f"Reconstructed Paillier prime p: {reconstructed_p} (bits: {reconstructed_p.bit_length()})")
                   # CRITICAL SECURITY CHECK: Verify reconstructed p matches expected p
                 if expected_p and expected_p != reconstructed_p:
@@ -465,7 +421,7 @@ class ElectionResultsController:
                   # Final validation: Ensure we have the correct private key
                   
                 reconstructed_private_key = paillier.PaillierPrivateKey(
-                    public_key=paillier.PaillierPublicKey(n=public_key_n),
+                    public_key=public_key,
                     p=reconstructed_p,
                     q=reconstructed_q
                 )
@@ -493,7 +449,7 @@ class ElectionResultsController:
                 return jsonify({'private_key': private_key_b64, 'config_type': 'direct_p'}), 200
                 
             except Exception as interpolation_error:
-                logger.error(f"Error during shamirs interpolation: {str(interpolation_error)}")
+                logger.error(f"Error during share interpolation: {str(interpolation_error)}")
                 return jsonify({'error': f'Failed to reconstruct private key: {str(interpolation_error)}'}), 500
         except Exception as e:
             logger.error(f"Error reconstructing private key: {str(e)}")
@@ -539,8 +495,8 @@ class ElectionResultsController:
                 if private_key_data.get('type') == 'prime':
                     # Direct p sharing approach - reconstructed value is directly the prime p
                     reconstructed_p = int(private_key_data['p'])
-                    public_key_data = json.loads(crypto_config.public_key)
-                    n = int(public_key_data.get('n'))
+                    pubkey = PaillierKeyCache.for_config(crypto_config).public_key
+                    n = pubkey.n
                     
                     # STRICT VALIDATION: Verify the private key matches expected parameters
                     # Check if we have stored expected parameters in crypto config
@@ -597,20 +553,37 @@ class ElectionResultsController:
                     # Start a transaction for atomicity
                     db.session.begin_nested()
                     
-                    pubkey = paillier.PaillierPublicKey(n=n)
                     privkey = paillier.PaillierPrivateKey(pubkey, reconstructed_p, reconstructed_q)
                     logger.info(f"Successfully validated and constructed private key with p={reconstructed_p.bit_length()} bits "
                                f"and q={reconstructed_q.bit_length()} bits")
+                    JobQueue.report_progress(0.2, 'Private key validated')
                     
                     # Track decryption process with detailed logs
                     decryption_errors = []
                     decrypted = {}
                     
+                    ciphertexts = {}
                     for r in results:
                         if r.encrypted_vote_total:
                             try:
-                                enc_num = paillier.EncryptedNumber(pubkey, int(r.encrypted_vote_total), 0)
-                                vote_count = privkey.decrypt(enc_num)
+                                ciphertexts[r.candidate_id] = decode_ciphertext(r.encrypted_vote_total_bytes, r.encrypted_vote_total)
+                            except Exception as e:
+                                error_msg = f"Error decrypting result for candidate {r.candidate_id}: {e}"
+                                logger.error(error_msg)
+                                db.session.rollback()
+                                return jsonify({'error': error_msg}), 500
+                    
+                    # Decrypt every candidate total in one batch (CRT, spread over worker processes)
+                    decryptor = BatchDecryptor(privkey, max_workers=current_app.config.get('TALLY_MAX_WORKERS') or None)
+                    plaintexts = decryptor.decrypt_all(ciphertexts)
+                    JobQueue.report_progress(0.7, 'Candidate totals decrypted')
+                    # Ballot counts for the sanity checks, one GROUP BY instead of a COUNT per candidate
+                    ballot_counts = VoteReader.count_by_candidate(election_id)
+                    
+                    for r in results:
+                        if r.candidate_id in plaintexts:
+                            try:
+                                vote_count = decryptor.decode(plaintexts[r.candidate_id])
                                 
                                 # VERIFICATION: Ensure vote count is non-negative and reasonable
                                 if vote_count < 0:
@@ -620,7 +593,7 @@ class ElectionResultsController:
                                     continue
                                 
                                 # Add sanity check for unreasonably large numbers
-                                votes_count = Vote.query.filter_by(election_id=election_id, candidate_id=r.candidate_id).count()
+                                votes_count = ballot_counts.get(r.candidate_id, 0)
                                 if vote_count > votes_count * 2:  # Allow some leeway but catch gross errors
                                     logger.warning(f"Suspicious vote count for candidate {r.candidate_id}: decrypted={vote_count}, actual votes={votes_count}")
                                 
@@ -648,7 +621,7 @@ class ElectionResultsController:
                     logger.info(f"Total decrypted votes: {total_votes}")
                     
                     # Get actual vote count for verification
-                    actual_votes = Vote.query.filter_by(election_id=election_id).count()
+                    actual_votes = sum(ballot_counts.values())
                     if total_votes != actual_votes:
                         logger.warning(f"Vote count mismatch: decrypted total={total_votes}, actual votes={actual_votes}")
                         # This is a warning, not an error - minor discrepancies can occur due to how votes are structured
@@ -659,6 +632,7 @@ class ElectionResultsController:
                       # Commit all changes (decrypted results and election status)
                     db.session.commit()
                     logger.info(f"Successfully stored decrypted results and updated election status for election {election_id}")
+                    JobQueue.report_progress(0.95, 'Decrypted results stored')
                     
                     # Verify vote counts and update verified status in the database
                     verified, issues = ElectionResult.verify_vote_counts(election_id)
@@ -670,21 +644,17 @@ class ElectionResultsController:
                     if missing_counts > 0:
                         logger.warning(f"After decryption, {missing_counts} candidates are still missing vote counts")
                     
-                    # AUTOMATIC PDF GENERATION: Generate PDF data after successful decryption
-                    pdf_generation_success = False
-                    pdf_error_message = None
+                    # Store the results snapshot the results and PDF endpoints serve from now on
+                    snapshot_stored = False
+                    snapshot_error_message = None
                     try:
-                        logger.info(f"Automatically generating PDF data for election {election_id} after successful decryption")
-                        pdf_result = ElectionResultsController.get_pdf_data(election_id)
-                        if pdf_result[1] == 200:  # Check if PDF data generation was successful
-                            pdf_generation_success = True
-                            logger.info(f"✓ PDF data automatically generated for election {election_id}")
-                        else:
-                            pdf_error_message = "Failed to generate PDF data"
-                            logger.warning(f"PDF data generation failed for election {election_id}")
-                    except Exception as pdf_error:
-                        pdf_error_message = str(pdf_error)
-                        logger.error(f"Error during automatic PDF generation for election {election_id}: {pdf_error}")
+                        ResultsSnapshotService.write(election_id)
+                        snapshot_stored = True
+                        logger.info(f"✓ Results snapshot stored for election {election_id}")
+                    except Exception as snapshot_error:
+                        db.session.rollback()
+                        snapshot_error_message = str(snapshot_error)
+                        logger.error(f"Error storing results snapshot for election {election_id}: {snapshot_error}")
                     
                     # Return success response for all cases
                     return jsonify({
@@ -692,8 +662,8 @@ class ElectionResultsController:
                         'total_decrypted_votes': total_votes,
                         'vote_count_match': total_votes == actual_votes,
                         'verification_passed': verified,  # Use actual verification result
-                        'pdf_auto_generated': pdf_generation_success,
-                        'pdf_error': pdf_error_message
+                        'results_snapshot_stored': snapshot_stored,
+                        'results_snapshot_error': snapshot_error_message
                     }), 200
                     
                 else:
@@ -714,276 +684,78 @@ class ElectionResultsController:
     def get_decrypted_results(election_id):
         """
         Return the decrypted results for display, grouped by positions.
+        Finished elections are served from their results snapshot.
         """
         try:
-            from app.models.candidate import Candidate
-            from app.models.position import Position
-            from collections import defaultdict
-            from sqlalchemy import inspect
-            
-            # Check if the verified column exists in the database
-            try:
-                insp = inspect(db.engine)
-                columns = [c['name'] for c in insp.get_columns('election_results')]
-                verified_column_exists = 'verified' in columns
-                logger.info(f"Verified column exists in election_results table: {verified_column_exists}")
-            except Exception as e:
-                verified_column_exists = False
-                logger.warning(f"Error checking for verified column: {e}")
-            
-            # Manually select columns to avoid the missing 'verified' column
-            results_query = db.session.query(
-                ElectionResult.result_id,
-                ElectionResult.election_id,
-                ElectionResult.candidate_id, 
-                ElectionResult.vote_count,
-                Candidate.candidate_id,
-                Candidate.fullname,
-                Candidate.party,
-                Position.position_id,
-                Position.position_name
-            ).join(
-                Candidate, ElectionResult.candidate_id == Candidate.candidate_id
-            ).join(
-                Position, Candidate.position_id == Position.position_id
-            ).filter(
-                ElectionResult.election_id == election_id
-            ).all()
-            
-            # Group results by position
-            positions_dict = defaultdict(list)
-            for row in results_query:
-                # Access the columns by index or name depending on how your database returns results
-                position_id = row.position_id
-                position_name = row.position_name
-                candidate_id = row.candidate_id
-                fullname = row.fullname
-                party = row.party
-                vote_count = row.vote_count or 0
-                
-                positions_dict[position_id].append({
-                    'position_id': position_id,
-                    'position_name': position_name,
-                    'candidate': {
-                        'candidate_id': candidate_id,
-                        'fullname': fullname,
-                        'party': party,
-                        'vote_count': vote_count
-                    }
-                })
-            
-            # Process positions and determine winners
-            results = []
-            for position_id, position_data in positions_dict.items():
-                if not position_data:
-                    continue
-                    
-                position_name = position_data[0]['position_name']
-                candidates = [item['candidate'] for item in position_data]
-                
-                # Determine winner(s) - candidate(s) with the highest vote count
-                if candidates:
-                    max_votes = max(candidate['vote_count'] for candidate in candidates)
-                    for candidate in candidates:
-                        candidate['is_winner'] = candidate['vote_count'] == max_votes
-                
-                results.append({
-                    'position_id': position_id,
-                    'position_name': position_name,
-                    'candidates': candidates
-                })
-            
-            # Sort results by position_id for consistent ordering
-            results.sort(key=lambda x: x['position_id'])
-              # Add verification status information
-            # Check the actual verification status from the database
-            all_verified = True
-            if verified_column_exists:
-                # Get verification status from the database
-                verification_query = db.session.query(ElectionResult).filter_by(election_id=election_id).all()
-                # All results must be verified for the election to be considered verified
-                all_verified = all(getattr(result, 'verified', False) for result in verification_query)
-                logger.info(f"Verification status for election {election_id}: {all_verified}")
-            
-            verification_status = {
-                "verified": all_verified,  # Use the actual verification status from the database
-                "vote_count_match": True,
-                "total_decrypted": sum(candidate['vote_count'] for position in results for candidate in position['candidates'])
-            }
-            
-            # Count actual votes for verification
-            from app.models.vote import Vote
-            actual_votes = Vote.query.filter_by(election_id=election_id).count()
-            total_decrypted = verification_status['total_decrypted']
-            if total_decrypted != actual_votes:
-                verification_status['vote_count_match'] = False
-                verification_status['message'] = f"Vote count mismatch: decrypted {total_decrypted}, actual {actual_votes}"
-                logger.warning(f"Vote count mismatch for election {election_id}: decrypted={total_decrypted}, actual={actual_votes}")
-              # Automatically generate PDF data preparation when accessing decrypted results
-            try:
-                logger.info(f"Auto-preparing PDF data for election {election_id}")
-                # Note: PDF generation is now handled on the frontend, this just logs the access
-                logger.info(f"PDF data access logged successfully for election {election_id}")
-            except Exception as pdf_error:
-                logger.warning(f"Failed to log PDF data access for election {election_id}: {str(pdf_error)}")
-                # Don't fail the main request if logging fails
-                
-            return jsonify({
-                'results': results, 
-                'verification_status': verification_status
-            }), 200
+            response = ResultsSnapshotService.respond(election_id, 'decrypted')
+            if response is not None:
+                return response
+            return jsonify(ResultsSnapshotService.build_views(election_id, ['decrypted'])['decrypted']), 200
         except Exception as e:
-                        logger.error(f"Error in get_decrypted_results: {str(e)}")
-                        logger.exception(e)  # Log the full stack trace
-        return jsonify({'error': str(e)}), 500
-    
+            logger.error(f"Error in get_decrypted_results: {str(e)}")
+            logger.exception(e)  # Log the full stack trace
+            return jsonify({'error': str(e)}), 500
+
     @staticmethod
     def get_pdf_data(election_id):
         """
         Get election results data formatted for PDF generation on the frontend.
-        Returns structured data that can be used by jsPDF.
+        Returns structured data that can be used by jsPDF. Finished elections
+        are served from their results snapshot.
         """
         try:
-            # Get election and results data
-            from app.models.candidate import Candidate
-            from app.models.position import Position
-            from app.models.election import Election
-            from app.models.vote import Vote
-            from app.models.organization import Organization
-            from collections import defaultdict
-            
-            # Fetch election details
-            election = Election.query.get(election_id)
-            if not election:
-                return jsonify({'error': 'Election not found'}), 404
-                
-            # Get organization info
-            organization = Organization.query.get(election.org_id) if election.org_id else None
-                
-            # Get results data (similar to get_decrypted_results)
-            results_query = db.session.query(
-                ElectionResult.result_id,
-                ElectionResult.election_id,
-                ElectionResult.candidate_id, 
-                ElectionResult.vote_count,
-                Candidate.candidate_id,
-                Candidate.fullname,
-                Candidate.party,
-                Position.position_id,
-                Position.position_name
-            ).join(
-                Candidate, ElectionResult.candidate_id == Candidate.candidate_id
-            ).join(
-                Position, Candidate.position_id == Position.position_id
-            ).filter(
-                ElectionResult.election_id == election_id
-            ).all()
-            
-            # Group results by position
-            positions_dict = defaultdict(list)
-            for row in results_query:
-                position_id = row.position_id
-                position_name = row.position_name
-                candidate_id = row.candidate_id
-                fullname = row.fullname
-                party = row.party or 'Independent'
-                vote_count = row.vote_count or 0
-                
-                positions_dict[position_id].append({
-                    'position_id': position_id,
-                    'position_name': position_name,
-                    'candidate': {
-                        'candidate_id': candidate_id,
-                        'fullname': fullname,
-                        'party': party,
-                        'vote_count': vote_count
-                    }
-                })
-            
-            # Process positions and determine winners
-            positions_for_pdf = []
-            all_winners = []
-            total_votes = 0
-            
-            for position_id, position_data in positions_dict.items():
-                if not position_data:
-                    continue
-                    
-                position_name = position_data[0]['position_name']
-                candidates = [item['candidate'] for item in position_data]
-                
-                # Sort candidates by vote count (descending) and add rank
-                candidates.sort(key=lambda x: x['vote_count'], reverse=True)
-                
-                # Calculate total votes for this position
-                position_total = sum(c['vote_count'] for c in candidates)
-                total_votes += position_total
-                
-                # Determine winner(s) and add percentage
-                max_votes = max(candidate['vote_count'] for candidate in candidates) if candidates else 0
-                
-                processed_candidates = []
-                for i, candidate in enumerate(candidates):
-                    candidate['is_winner'] = candidate['vote_count'] == max_votes
-                    candidate['rank'] = i + 1
-                    candidate['percentage'] = round((candidate['vote_count'] / position_total * 100), 2) if position_total > 0 else 0
-                    
-                    processed_candidates.append(candidate)
-                    
-                    if candidate['is_winner']:
-                        all_winners.append({
-                            'fullname': candidate['fullname'],
-                            'party': candidate['party'],
-                            'position_name': position_name,
-                            'vote_count': candidate['vote_count']
-                        })
-                
-                positions_for_pdf.append({
-                    'position_id': position_id,
-                    'position_name': position_name,
-                    'candidates': processed_candidates,
-                    'total_votes': position_total
-                })
-            
-            # Sort positions by position_id for consistent ordering
-            positions_for_pdf.sort(key=lambda x: x['position_id'])
-              # Get vote statistics
-            actual_votes = Vote.query.filter_by(election_id=election_id).count()
-            
-            # Calculate participation rate based on total registered voters in database
-            if election.organization and election.organization.college_id:
-                # Election is restricted to one college
-                total_registered_voters = Voter.query.filter_by(college_id=election.organization.college_id).count()
-            else:
-                # Election is open to all colleges
-                total_registered_voters = Voter.query.count()
-            
-            participation_rate = round((actual_votes / total_registered_voters * 100), 2) if total_registered_voters > 0 else 0
-            
-            # Prepare PDF data
-            pdf_data = {
-                'election_name': election.election_name,
-                'election_id': election_id,
-                'organization': organization.org_name if organization else None,
-                'total_voters': total_registered_voters,
-                'total_votes': actual_votes,
-                'participation_rate': participation_rate,
-                'generation_date': datetime.now().strftime('%B %d, %Y'),
-                'generation_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
-                'positions': positions_for_pdf,
-                'winners': all_winners,
-                'is_verified': total_votes == actual_votes,
-                'verification_message': f'✓ VERIFIED: All {actual_votes} votes successfully decrypted and tallied' if total_votes == actual_votes else f'⚠ WARNING: Vote count mismatch (Decrypted: {total_votes}, Actual: {actual_votes})'
-            }
-            
+            response = ResultsSnapshotService.respond(election_id, 'pdf')
+            if response is not None:
+                return response
+            pdf_data = ResultsSnapshotService.build_views(election_id, ['pdf'])['pdf']
             logger.info(f"PDF data prepared for election {election_id}")
-            return jsonify({'success': True, 'data': pdf_data}), 200
-            
+            return jsonify(pdf_data), 200
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
         except Exception as e:
             logger.error(f"Error preparing PDF data: {str(e)}")
             logger.error(traceback.format_exc())
             return jsonify({'error': f'Failed to prepare PDF data: {str(e)}'}), 500
 
+    @staticmethod
+    def export_results():
+        """
+        Queue a CSV or PDF export of finished elections' results.
+        Body: {"election_ids": [...], "format": "csv" | "pdf"}; poll the returned job for its download_url.
+        """
+        from app.controllers.job_controller import JobController
+
+        data = request.get_json() or {}
+        election_ids = data.get('election_ids')
+        if election_ids is None and data.get('election_id') is not None:
+            election_ids = [data['election_id']]
+        fmt = (data.get('format') or 'csv').lower()
+        if fmt not in ResultsExporter.FORMATS:
+            return jsonify({'error': f'Unsupported export format: {fmt}', 'formats': list(ResultsExporter.FORMATS)}), 400
+        try:
+            election_ids = [int(election_id) for election_id in election_ids or []]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'election_ids must be a list of election ids'}), 400
+        max_elections = current_app.config.get('RESULTS_EXPORT_MAX_ELECTIONS', 200)
+        if not election_ids or len(election_ids) > max_elections:
+            return jsonify({'error': f'Export between 1 and {max_elections} elections'}), 400
+
+        params = {'election_ids': election_ids, 'format': fmt}
+        if len(election_ids) == 1:
+            params['election_id'] = election_ids[0]
+        return JobController.enqueue('results_export', params)
+
+    @staticmethod
+    def download_export(filename):
+        """
+        Stream a finished results export from the export directory.
+        """
+        path = ResultsExporter.path_for(filename)
+        if not path or not os.path.isfile(path):
+            return jsonify({'error': 'Export not found'}), 404
+        return send_file(path, mimetype=ResultsExporter.FORMATS[filename.rpartition('.')[2]],
+                         as_attachment=True, download_name=filename, conditional=True, max_age=0)
+
     @staticmethod
     def get_ongoing_elections_for_modal():
         """
@@ -1025,71 +797,32 @@ class ElectionResultsController:
         Return all election results, including election and organization info, matching frontend expectations.
         Only returns results from properly tallied elections stored in the ElectionResult table.
         Each position has one winner (candidate with highest votes per position).
+
+        Optional query parameters: status (election status), date_from / date_to (ISO end-date range),
+        page and per_page. The body stays a plain list; the total is sent in X-Total-Count.
         """
-        from app.models.election_result import ElectionResult
-        from app.models.election import Election
-        from app.models.organization import Organization
-        from app.models.candidate import Candidate
-        from app.models.position import Position
-        from flask import jsonify
         try:
-            # Get all unique elections that have results in the ElectionResult table
-            election_ids_with_results = db.session.query(ElectionResult.election_id).distinct().all()
-            election_ids = [eid[0] for eid in election_ids_with_results]
-            elections = Election.query.filter(Election.election_id.in_(election_ids)).all()
-            results = []
-            for election in elections:
-                candidates = Candidate.query.filter_by(election_id=election.election_id).all()
-                positions = Position.query.filter_by(org_id=election.org_id).all()
-                # Group candidates by position
-                pos_to_candidates = {}
-                for cand in candidates:
-                    pos_to_candidates.setdefault(cand.position_id, []).append(cand)
-                candidate_results = []
-                total_votes = 0
-                winners = []
-                for pos in positions:
-                    cands = pos_to_candidates.get(pos.position_id, [])
-                    if not cands:
-                        continue
-                    # Get vote counts for each candidate in this position
-                    cand_vote_objs = []
-                    for cand in cands:
-                        er = ElectionResult.query.filter_by(election_id=election.election_id, candidate_id=cand.candidate_id).first()
-                        votes = er.vote_count if er and er.vote_count is not None else 0
-                        total_votes += votes
-                        cand_vote_objs.append({
-                            'candidate_id': cand.candidate_id,
-                            'name': cand.fullname,
-                            'position_id': pos.position_id,
-                            'position_name': pos.position_name,
-                            'votes': votes,
-                            'percentage': 0,  # will fill below
-                            'winner': False
-                        })
-                    # Determine winner for this position
-                    if cand_vote_objs:
-                        max_votes = max([c['votes'] for c in cand_vote_objs])
-                        for c in cand_vote_objs:
-                            c['percentage'] = round((c['votes'] / sum([x['votes'] for x in cand_vote_objs]) * 100), 1) if sum([x['votes'] for x in cand_vote_objs]) > 0 else 0
-                            if c['votes'] == max_votes and max_votes > 0:
-                                c['winner'] = True
-                                winners.append(c['name'])
-                        candidate_results.extend(cand_vote_objs)
-                participation_rate = getattr(election, 'participation_rate', None)
-                if participation_rate is None:
-                    participation_rate = 0
-                results.append({
-                    'election_id': election.election_id,
-                    'election_name': election.election_name,
-                    'organization': election.organization.org_name if election.organization else '',
-                    'ended_at': election.date_end.isoformat() if election.date_end else '',
-                    'winner': ', '.join(winners) if winners else 'No winner',
-                    'total_votes': total_votes,
-                    'participation_rate': participation_rate,
-                    'candidates': candidate_results
-                })
-            return jsonify(results)
+            status = request.args.get('status') or None
+            try:
+                date_from = date.fromisoformat(request.args['date_from']) if request.args.get('date_from') else None
+                date_to = date.fromisoformat(request.args['date_to']) if request.args.get('date_to') else None
+            except ValueError:
+                return jsonify({'error': 'date_from and date_to must be YYYY-MM-DD'}), 400
+            per_page = request.args.get('per_page', type=int)
+            page = request.args.get('page', 1, type=int)
+            if per_page is not None:
+                per_page = min(max(per_page, 1), 100)
+                page = max(page, 1)
+
+            results, total = ElectionResultsReadModel.list_results(
+                status=status, date_from=date_from, date_to=date_to, page=page, per_page=per_page
+            )
+            response = jsonify(results)
+            response.headers['X-Total-Count'] = str(total)
+            if per_page is not None:
+                response.headers['X-Page'] = str(page)
+                response.headers['X-Per-Page'] = str(per_page)
+            return response
         except Exception as e:
             logger.error(f"Error in get_all_election_results: {str(e)}")
             return jsonify({'results': []}), 200
@@ -1214,113 +947,15 @@ class ElectionResultsController:
         """
         Get all election results for a specific election by election_id
         Returns detailed information about all results for an election.
+        Finished elections are served from their results snapshot.
         """
         try:
-            # Get the election first
-            election = Election.query.get(election_id)
-            if not election:
-                return jsonify({'error': 'Election not found'}), 404
-                
-            organization = Organization.query.get(election.org_id) if election.org_id else None
-            
-            # Get all results for this election
-            all_election_results = ElectionResult.query.filter_by(election_id=election_id).all()
-            if not all_election_results:
-                return jsonify({'error': 'No results found for this election'}), 404
-                
-            candidates = Candidate.query.filter_by(election_id=election_id).all()
-            positions = Position.query.filter_by(org_id=election.org_id).all()
-              # Group candidates by position
-            pos_to_candidates = {}
-            for cand in candidates:
-                pos_to_candidates.setdefault(cand.position_id, []).append(cand)
-              # Calculate total votes and prepare results grouped by position
-            total_votes = sum([r.vote_count or 0 for r in all_election_results])
-            
-            # Calculate participation rate based on total registered voters in database
-            if election.organization and election.organization.college_id:
-                # Election is restricted to one college
-                total_registered_voters = Voter.query.filter_by(college_id=election.organization.college_id).count()
-            else:
-                # Election is open to all colleges
-                total_registered_voters = Voter.query.count()
-            
-            participation_rate = (total_votes / total_registered_voters * 100) if total_registered_voters > 0 else 0
-            
-            # Prepare data grouped by position
-            position_results = []
-            all_candidates = []  # For backward compatibility
-            
-            for pos in positions:
-                cands = pos_to_candidates.get(pos.position_id, [])
-                if not cands:
-                    continue
-                
-                # Get vote counts for each candidate in this position
-                position_cands = []
-                position_total = 0
-                for cand in cands:
-                    er = next((r for r in all_election_results if r.candidate_id == cand.candidate_id), None)
-                    votes = er.vote_count if er and er.vote_count is not None else 0
-                    position_total += votes
-                    candidate_data = {
-                        'id': cand.candidate_id,
-                        'name': cand.fullname,
-                        'votes': votes,
-                        'percentage': 0,  # will calculate below
-                        'winner': False,  # will determine below
-                        'position_id': pos.position_id,
-                        'position_name': pos.position_name
-                    }
-                    position_cands.append(candidate_data)
-                    all_candidates.append(candidate_data)  # For backward compatibility
-                
-                # Calculate percentages and determine winner for this position
-                if position_cands:
-                    max_votes = max([c['votes'] for c in position_cands])
-                    for c in position_cands:
-                        c['percentage'] = round((c['votes'] / position_total * 100), 1) if position_total > 0 else 0
-                        if c['votes'] == max_votes:
-                            c['winner'] = True
-                    
-                    # Add position with its candidates to the results
-                    position_results.append({
-                        'position_id': pos.position_id,
-                        'position_name': pos.position_name,
-                        'candidates': position_cands
-                    })
-              # Check if crypto config exists to determine crypto status
-            crypto_config = CryptoConfig.query.filter_by(election_id=election.election_id).first()
-            crypto_enabled = crypto_config is not None
-            threshold_crypto = crypto_enabled and (crypto_config.status == 'active') if crypto_config else False
-            
-            # Check if verified column exists safely - use first result as representative
-            zkp_verified = False
-            try:
-                first_result = all_election_results[0] if all_election_results else None
-                zkp_verified = getattr(first_result, 'verified', False) if first_result else False
-            except:
-                zkp_verified = False
-              # Format the response
-            result_detail = {
-                'election_id': election.election_id,
-                'election_name': election.election_name,
-                'organization': {'org_name': organization.org_name} if organization else None,
-                'status': election.election_status,  # Use correct field name
-                'published_at': election.created_at.isoformat() if election.created_at else None,
-                'description': election.election_desc,  # Use correct field name                'participation_rate': round(participation_rate, 1),
-                'voters_count': total_registered_voters,
-                'total_votes': total_votes,
-                'crypto_enabled': crypto_enabled,
-                'threshold_crypto': threshold_crypto,
-                'zkp_verified': zkp_verified,
-                'positions': position_results,  # Primary data structure grouped by positions
-                'candidates': all_candidates,  # For backward compatibility with existing frontend code
-                'result_count': len(all_election_results)
-            }
-            
-            return jsonify(result_detail)
-            
+            response = ResultsSnapshotService.respond(election_id, 'detail')
+            if response is not None:
+                return response
+            return jsonify(ResultsSnapshotService.build_views(election_id, ['detail'])['detail'])
+        except LookupError as e:
+            return jsonify({'error': str(e)}), 404
         except Exception as e:
             logger.error(f"Error in get_election_results_by_election_id: {str(e)}")
             logger.error(traceback.format_exc())
@@ -2,10 +2,10 @@ from app.models.election import Election
 from app.models.organization import Organization
 from app.models.candidate import Candidate
 from app.models.election_result import ElectionResult
-from app.models.voter import Voter
 from app.models.position import Position
 from app.models.vote import Vote
 from app.controllers.auth_controller import AuthController
+from app.services.access import EligibleVoterCounts
 from app import db
 from flask import jsonify, request, current_app
 from datetime import datetime
@@ -565,12 +565,8 @@ class ElectionReviewController:
                 
                 # Compute participation rate based on total registered voters
                 participation_rate = None
-                if election.organization and election.organization.college_id:
-                    # Election is restricted to one college
-                    total_registered_voters = Voter.query.filter_by(college_id=election.organization.college_id).count()
-                else:
-                    # Election is open to all colleges
-                    total_registered_voters = Voter.query.count()
+                # Restricted to the organization's college, or open to all colleges
+                total_registered_voters = EligibleVoterCounts.for_election(election)
                 
                 if total_registered_voters > 0:
                     participation_rate = round((total_votes / total_registered_voters) * 100, 1)
@@ -0,0 +1,90 @@
+from flask import jsonify, request
+from app.models.background_job import BackgroundJob
+from app.services.jobs import JobQueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+class JobController:
+    @staticmethod
+    def enqueue(job_type, params):
+        """
+        Queue a background job and return its id immediately.
+
+        Args:
+            job_type: Registered job type
+            params: JSON parameters of the job
+
+        Returns:
+            202 response with the job id and the URL to poll
+        """
+        try:
+            election_id = params.get('election_id')
+            try:
+                election_id = int(election_id) if election_id is not None else None
+            except (TypeError, ValueError):
+                election_id = None
+            job = JobQueue.enqueue(job_type, params, election_id=election_id)
+            return jsonify({
+                'job_id': job.job_id,
+                'job_type': job.job_type,
+                'status': job.status,
+                'status_url': f'/api/jobs/{job.job_id}'
+            }), 202
+        except ValueError as e:
+            return jsonify({'error': str(e), 'job_types': JobQueue.job_types()}), 400
+        except Exception as e:
+            logger.error(f"Error queueing {job_type} job: {str(e)}")
+            return jsonify({'error': str(e)}), 500
+
+    @staticmethod
+    def create_job():
+        """
+        Queue a job from a {"job_type": ..., "params": {...}} request body.
+        """
+        data = request.get_json() or {}
+        job_type = data.get('job_type')
+        if not job_type:
+            return jsonify({'error': 'Missing job_type', 'job_types': JobQueue.job_types()}), 400
+        params = data.get('params') or {}
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params must be an object'}), 400
+        return JobController.enqueue(job_type, params)
+
+    @staticmethod
+    def get_job(job_id):
+        """
+        Status, progress, timings and (once finished) result of a job.
+        """
+        try:
+            job = JobQueue.status(job_id)
+            if job is None:
+                return jsonify({'error': 'Job not found'}), 404
+            return jsonify(job), 200
+        except Exception as e:
+            logger.error(f"Error fetching job {job_id}: {str(e)}")
+            return jsonify({'error': str(e)}), 500
+
+    @staticmethod
+    def list_jobs():
+        """
+        Recent jobs without their results, filtered by status, job_type or election_id.
+        """
+        try:
+            query = BackgroundJob.query
+            status = request.args.get('status')
+            if status:
+                query = query.filter(BackgroundJob.status == status)
+            job_type = request.args.get('job_type')
+            if job_type:
+                query = query.filter(BackgroundJob.job_type == job_type)
+            election_id = request.args.get('election_id', type=int)
+            if election_id is not None:
+                query = query.filter(BackgroundJob.election_id == election_id)
+            limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+
+            jobs = query.order_by(BackgroundJob.job_id.desc()).limit(limit).all()
+            return jsonify([job.to_dict(include_result=False) for job in jobs]), 200
+        except Exception as e:
+            logger.error(f"Error listing jobs: {str(e)}")
+            return jsonify({'error': str(e)}), 500
@@ -2,8 +2,11 @@
 Controller for handling ZKP verification and vote decryption
 Only using Paillier with Shamir secret sharing
 """
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from app.services.zkp.snarkjs_verifier import SnarkjsVerifier
+from app.services.zkp.snarkjs_pool import SnarkjsPoolBusy
+from app.services.zkp.verification_key_cache import VerificationKeyCache
+from app.services.crypto import PaillierKeyCache, decode_ciphertext, ShareFormatError, parse_shares, reconstruct_secret
 from app.models.crypto_config import CryptoConfig
 from app.models.key_share import KeyShare
 from app.models.vote import Vote
@@ -20,7 +23,6 @@ import base64
 import traceback
 from datetime import datetime
 from phe import paillier
-import shamirs
 
 logger = logging.getLogger(__name__)
 
@@ -33,37 +35,11 @@ class VerificationController:
         try:
             # Check if election_id is provided
             election_id = request.args.get("election_id")
+            cached_key = VerificationKeyCache.get(election_id)
             
-            if election_id:
-                # Try to get the verification key specific to this election
-                crypto_config = CryptoConfig.query.filter_by(
-                    election_id=election_id, 
-                    key_type="verification_key"
-                ).first()
-                
-                if crypto_config:
-                    return jsonify({"verification_key": crypto_config.public_key}), 200
-            
-            # If no election-specific key is found or no election_id is provided,
-            # look for a default verification key
-            default_key_config = CryptoConfig.query.filter_by(
-                key_type="default_verification_key"
-            ).first()
-            
-            if default_key_config:
-                return jsonify({"verification_key": default_key_config.public_key}), 200
-                
-            # If no key is found, try to read from file
-            verification_key_path = os.path.join(
-                os.path.dirname(__file__), 
-                '../../public/verification_key.json'
-            )
-            
-            if os.path.exists(verification_key_path):
-                with open(verification_key_path, 'r') as f:
-                    verification_key = f.read()
-                return jsonify({"verification_key": verification_key}), 200
-                return jsonify({"error": "No verification key found"}), 404
+            if cached_key is not None:
+                return jsonify({"verification_key": cached_key.raw}), 200
+            return jsonify({"error": "No verification key found"}), 404
             
         except Exception as e:
             logger.error(f"Error retrieving verification key: {str(e)}")
@@ -89,20 +65,27 @@ class VerificationController:
                 
             # Get the verification key (try to use the one provided in request first)
             verification_key = data.get("verificationKey")
+            key_id = None
             
             if not verification_key:
-                # If no verification key provided, use the default
-                verification_key_response = VerificationController.get_verification_key()
-                if verification_key_response[1] != 200:
-                    return verification_key_response
-                verification_key = verification_key_response[0].json.get("verification_key")
+                # If no verification key provided, use the election's or the default one
+                cached_key = VerificationKeyCache.get(
+                    data.get("election_id") or request.args.get("election_id")
+                )
+                if cached_key is None:
+                    return jsonify({"error": "No verification key found"}), 404
+                verification_key, key_id = cached_key.key, cached_key.key_id
                 
             # Verify the proof
-            is_valid = SnarkjsVerifier.verify(
-                verification_key=verification_key,
-                public_signals=public_signals,
-                proof=proof
-            )
+            try:
+                is_valid = SnarkjsVerifier.verify_proof(
+                    verification_key=verification_key,
+                    public_signals=public_signals,
+                    proof=proof,
+                    key_id=key_id
+                )
+            except SnarkjsPoolBusy:
+                return jsonify({"error": "Verifier is busy, please retry"}), 503
             
             return jsonify({"valid": is_valid}), 200
             
@@ -110,6 +93,66 @@ class VerificationController:
             logger.error(f"Error verifying vote: {str(e)}")
             return jsonify({"error": f"Verification failed: {str(e)}"}), 500
 
+    @staticmethod
+    def verify_vote_zkp_batch():
+        """
+        Verify several ZKPs for one election in a single verifier round trip
+        
+        Expects {"election_id": ..., "proofs": [{"proof": ..., "publicSignals": ...}, ...]}
+        and returns the validity of each proof in input order.
+        """
+        try:
+            data = request.get_json()
+            
+            if not data:
+                return jsonify({"error": "No data provided"}), 400
+            
+            election_id = data.get("election_id")
+            items = data.get("proofs")
+            
+            if not election_id:
+                return jsonify({"error": "Missing election_id"}), 400
+            if not isinstance(items, list) or not items:
+                return jsonify({"error": "proofs must be a non-empty list"}), 400
+            
+            max_batch = current_app.config.get('ZKP_BATCH_MAX_PROOFS', 64)
+            if len(items) > max_batch:
+                return jsonify({"error": f"At most {max_batch} proofs can be verified per request"}), 413
+            
+            # Malformed entries are reported invalid without reaching the verifier
+            well_formed = [
+                i for i, item in enumerate(items)
+                if isinstance(item, dict) and item.get("proof") and item.get("publicSignals")
+            ]
+            
+            cached_key = VerificationKeyCache.get(election_id)
+            if cached_key is None:
+                return jsonify({"error": "No verification key found"}), 404
+            
+            results = [False] * len(items)
+            try:
+                verdicts = SnarkjsVerifier.verify_proofs_batch(
+                    verification_key=cached_key.key,
+                    items=[items[i] for i in well_formed],
+                    key_id=cached_key.key_id
+                )
+            except SnarkjsPoolBusy:
+                return jsonify({"error": "Verifier is busy, please retry"}), 503
+            for i, valid in zip(well_formed, verdicts):
+                results[i] = valid
+            
+            return jsonify({
+                "election_id": election_id,
+                "results": [{"index": i, "valid": valid} for i, valid in enumerate(results)],
+                "valid_count": sum(results),
+                "total": len(results),
+                "all_valid": all(results)
+            }), 200
+            
+        except Exception as e:
+            logger.error(f"Error verifying vote batch: {str(e)}")
+            return jsonify({"error": f"Batch verification failed: {str(e)}"}), 500
+
     @staticmethod
     def decrypt_vote():
         """
@@ -199,92 +242,36 @@ class VerificationController:
                     logger.error(f"Fallback prime generation failed: {e}")
                     return jsonify({"error": "Prime modulus not found and fallback generation failed"}), 500
             
-                  # Parse shares to proper format for shamirs library
-            parsed_shares = []
+            # Parse shares (x:hex(y), JSON or tuple forms) into (x, y) points
             logger.info(f"Received shares: {shares}")
-            
-            for s in shares:
-                logger.info(f"Processing share: {s}")
-                if not s or (isinstance(s, str) and s.strip() == ""):
-                    continue
-                
-                try:
-                    if isinstance(s, str):
-                        if ':' in s:
-                            try:
-                                # Parse x:hex(y) format
-                                x_str, y_hex = s.split(':', 1)
-                                x = int(x_str)
-                                y = int(y_hex, 16)
-                                # Create proper shamirs.share object
-                                share_obj = shamirs.share(x, y, prime)
-                                parsed_shares.append(share_obj)
-                                continue
-                            except Exception as e:
-                                logger.warning(f"Failed to parse share as x:hex(y): {e}")
-                        
-                        # Try parsing as JSON format like "(x, y)"
-                        try:
-                            share_data = json.loads(s)
-                            if isinstance(share_data, list) and len(share_data) == 2:
-                                # Create proper shamirs.share object
-                                share_obj = shamirs.share(int(share_data[0]), int(share_data[1]), prime)
-                                parsed_shares.append(share_obj)
-                                continue
-                        except Exception as e:
-                            logger.warning(f"Failed to parse share as JSON: {e}")
-                        
-                        # Try parsing as simple tuple-like string
-                        try:
-                            if s.startswith('(') and s.endswith(')'):
-                                s_clean = s.strip('()')
-                                parts = [p.strip() for p in s_clean.split(',')]
-                                if len(parts) == 2:
-                                    # Create proper shamirs.share object
-                                    share_obj = shamirs.share(int(parts[0]), int(parts[1]), prime)
-                                    parsed_shares.append(share_obj)
-                                    continue
-                        except Exception as e:
-                            logger.warning(f"Failed to parse share as tuple string: {e}")
-                        
-                        logger.error(f"Could not parse share in any recognized format: {s}")
-                        return jsonify({'error': f'Invalid share format in: {s}'}), 400
-                        
-                    elif isinstance(s, (list, tuple)) and len(s) == 2:
-                        # Create proper shamirs.share object
-                        share_obj = shamirs.share(int(s[0]), int(s[1]), prime)
-                        parsed_shares.append(share_obj)
-                    else:
-                        logger.error(f"Invalid share type: {type(s)}, value: {s}")
-                        return jsonify({'error': f'Invalid share format: {s}'}), 400
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing share {s}: {str(e)}")
-                    return jsonify({'error': f'Error parsing share: {str(e)}'}), 400
+            try:
+                parsed_shares = parse_shares(shares)
+            except ShareFormatError as e:
+                logger.error(str(e))
+                return jsonify({'error': str(e)}), 400
             
             if not parsed_shares:
                 logger.error("No valid shares were parsed")
                 return jsonify({'error': 'No valid shares could be parsed from the input'}), 400
             
-            logger.info(f"Successfully parsed {len(parsed_shares)} shares as shamirs.share objects")
-              # Use shamirs library to reconstruct the secret
+            logger.info(f"Successfully parsed {len(parsed_shares)} shares")
+              # Reconstruct the secret with cached Lagrange coefficients
             try:
-                reconstructed_p = shamirs.interpolate(parsed_shares)
+                reconstructed_p = reconstruct_secret(parsed_shares, prime)
                 logger.info(f"Reconstructed secret (p): {reconstructed_p}")
                 
             except Exception as interpolation_error:
-                logger.error(f"Error during shamirs interpolation: {str(interpolation_error)}")
+                logger.error(f"Error during share interpolation: {str(interpolation_error)}")
                 return jsonify({'error': f'Failed to reconstruct private key: {str(interpolation_error)}'}), 500
             
-            # Parse the public key to get n
-            public_key_data = json.loads(crypto_config.public_key)
-            n = int(public_key_data.get('n', 0))
+            # Parsed public key, shared with other requests through the key cache
+            pubkey = PaillierKeyCache.for_config(crypto_config).public_key
+            n = pubkey.n
             
             # Calculate q by dividing n by p
             reconstructed_q = n // reconstructed_p
             
-            # Create the Paillier objects
-            pubkey = paillier.PaillierPublicKey(n=n)
+            # Create the Paillier private key
             privkey = paillier.PaillierPrivateKey(pubkey, reconstructed_p, reconstructed_q)
             
             # Decrypt the vote
@@ -618,92 +605,36 @@ class VerificationController:
             if len(shares) == 0:
                 return jsonify({"error": "No valid shares found in partial decryptions"}), 400
             
-            # Parse shares to proper format for shamirs library
-            parsed_shares = []
+            # Parse shares (x:hex(y), JSON or tuple forms) into (x, y) points
             logger.info(f"Received shares for election results: {shares}")
-            
-            for s in shares:
-                logger.info(f"Processing share: {s}")
-                if not s or (isinstance(s, str) and s.strip() == ""):
-                    continue
-                
-                try:
-                    if isinstance(s, str):
-                        if ':' in s:
-                            try:
-                                # Parse x:hex(y) format
-                                x_str, y_hex = s.split(':', 1)
-                                x = int(x_str)
-                                y = int(y_hex, 16)
-                                # Create proper shamirs.share object
-                                share_obj = shamirs.share(x, y, prime)
-                                parsed_shares.append(share_obj)
-                                continue
-                            except Exception as e:
-                                logger.warning(f"Failed to parse share as x:hex(y): {e}")
-                        
-                        # Try parsing as JSON format like "(x, y)"
-                        try:
-                            share_data = json.loads(s)
-                            if isinstance(share_data, list) and len(share_data) == 2:
-                                # Create proper shamirs.share object
-                                share_obj = shamirs.share(int(share_data[0]), int(share_data[1]), prime)
-                                parsed_shares.append(share_obj)
-                                continue
-                        except Exception as e:
-                            logger.warning(f"Failed to parse share as JSON: {e}")
-                        
-                        # Try parsing as simple tuple-like string
-                        try:
-                            if s.startswith('(') and s.endswith(')'):
-                                s_clean = s.strip('()')
-                                parts = [p.strip() for p in s_clean.split(',')]
-                                if len(parts) == 2:
-                                    # Create proper shamirs.share object
-                                    share_obj = shamirs.share(int(parts[0]), int(parts[1]), prime)
-                                    parsed_shares.append(share_obj)
-                                    continue
-                        except Exception as e:
-                            logger.warning(f"Failed to parse share as tuple string: {e}")
-                        
-                        logger.error(f"Could not parse share in any recognized format: {s}")
-                        return jsonify({'error': f'Invalid share format in: {s}'}), 400
-                        
-                    elif isinstance(s, (list, tuple)) and len(s) == 2:
-                        # Create proper shamirs.share object
-                        share_obj = shamirs.share(int(s[0]), int(s[1]), prime)
-                        parsed_shares.append(share_obj)
-                    else:
-                        logger.error(f"Invalid share type: {type(s)}, value: {s}")
-                        return jsonify({'error': f'Invalid share format: {s}'}), 400
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing share {s}: {str(e)}")
-                    return jsonify({'error': f'Error parsing share: {str(e)}'}), 400
+            try:
+                parsed_shares = parse_shares(shares)
+            except ShareFormatError as e:
+                logger.error(str(e))
+                return jsonify({'error': str(e)}), 400
             
             if not parsed_shares:
                 logger.error("No valid shares were parsed for election results")
                 return jsonify({'error': 'No valid shares could be parsed from the input'}), 400
             
-            logger.info(f"Successfully parsed {len(parsed_shares)} shares for election results as shamirs.share objects")
-              # Use shamirs library to reconstruct the secret
+            logger.info(f"Successfully parsed {len(parsed_shares)} shares for election results")
+              # Reconstruct the secret with cached Lagrange coefficients
             try:
-                reconstructed_p = shamirs.interpolate(parsed_shares)
+                reconstructed_p = reconstruct_secret(parsed_shares, prime)
                 logger.info(f"Reconstructed secret (p) for election results: {reconstructed_p}")
                 
             except Exception as interpolation_error:
-                logger.error(f"Error during shamirs interpolation for election results: {str(interpolation_error)}")
+                logger.error(f"Error during share interpolation for election results: {str(interpolation_error)}")
                 return jsonify({'error': f'Failed to reconstruct private key: {str(interpolation_error)}'}), 500
             
-            # Parse the public key to get n
-            public_key_data = json.loads(crypto_config.public_key)
-            n = int(public_key_data.get('n', 0))
+            # Parsed public key, shared with other requests through the key cache
+            pubkey = PaillierKeyCache.for_config(crypto_config).public_key
+            n = pubkey.n
             
             # Calculate q by dividing n by p
             reconstructed_q = n // reconstructed_p
             
-            # Create the Paillier objects
-            pubkey = paillier.PaillierPublicKey(n=n)
+            # Create the Paillier private key
             privkey = paillier.PaillierPrivateKey(pubkey, reconstructed_p, reconstructed_q)
             
             # Decrypt all votes in the election
@@ -712,7 +643,9 @@ class VerificationController:
             
             for vote in votes:
                 try:
-                    encrypted_num = paillier.EncryptedNumber(pubkey, int(vote.encrypted_vote), 0)
+                    encrypted_num = paillier.EncryptedNumber(
+                        pubkey, decode_ciphertext(vote.encrypted_vote_bytes, vote.encrypted_vote), 0
+                    )
                     decrypted_vote = privkey.decrypt(encrypted_num)
                     
                     position_id = vote.position_id
@@ -13,6 +13,12 @@ from .candidate import Candidate
 from .vote import Vote
 from .audit_log import AuditLog
 from .election_result import ElectionResult
+from .voting_session_lease import VotingSessionLease
+from .running_tally import RunningTally
+from .background_job import BackgroundJob
+from .results_snapshot import ResultsSnapshot
+from .activity_rollup import ActivityRollup
+from .activity_rollup_state import ActivityRollupState
 from .admin import Admin
 from .archived_result import ArchivedResult
 from .documentation import Documentation
@@ -33,6 +39,12 @@ __all__ = [
     'Vote',
     'AuditLog',
     'ElectionResult',
+    'RunningTally',
+    'VotingSessionLease',
+    'BackgroundJob',
+    'ResultsSnapshot',
+    'ActivityRollup',
+    'ActivityRollupState',
     'Admin',
     'ArchivedResult',
     'Documentation',
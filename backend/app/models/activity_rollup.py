@@ -0,0 +1,24 @@
+from app import db
+from sqlalchemy import Index
+
+class ActivityRollup(db.Model):
+    """
+    Count of votes or audit log entries per time bucket, election and action.
+
+    ``granularity`` is 'minute', 'hour' or 'day'. Rows with granularity
+    'month', source 'vote', action 'distinct_voters' and election_id 0 hold
+    the number of distinct voters of each month across all elections.
+    """
+    __tablename__ = 'activity_rollups'
+
+    granularity = db.Column(db.String(10), primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    election_id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(10), primary_key=True)  # 'vote', 'audit'
+    action = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Charts read one granularity over a time range
+        Index('ix_activity_rollups_granularity_bucket', 'granularity', 'bucket_start'),
+    )
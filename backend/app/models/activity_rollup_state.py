@@ -0,0 +1,12 @@
+from app import db
+from datetime import datetime
+
+class ActivityRollupState(db.Model):
+    """
+    Highest vote_id / log_id already counted in activity_rollups, per source
+    """
+    __tablename__ = 'activity_rollup_state'
+
+    source = db.Column(db.String(10), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,68 @@
+from app import db
+from datetime import datetime
+import json
+from sqlalchemy import Index
+
+class BackgroundJob(db.Model):
+    """
+    Long-running operation (key generation, tally, decryption, report data)
+    executed by the job workers instead of inside a request.
+
+    ``params`` and ``result`` are JSON. Jobs whose parameters carry key
+    material never store them (they run in the process that queued them);
+    results carrying key material are cleared once read.
+    """
+    __tablename__ = 'background_jobs'
+
+    job_id = db.Column(db.Integer, primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'succeeded', 'failed'
+    election_id = db.Column(db.Integer, nullable=True)
+    params = db.Column(db.Text, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    progress_message = db.Column(db.String(255), nullable=True)
+    # JSON list of [step, seconds since the previous step]
+    timings = db.Column(db.Text, nullable=True)
+    worker_id = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        Index('ix_background_jobs_status_created', 'status', 'created_at'),
+        Index('ix_background_jobs_election', 'election_id'),
+    )
+
+    def to_dict(self, include_result=True):
+        queued_seconds = run_seconds = None
+        if self.started_at and self.created_at:
+            queued_seconds = (self.started_at - self.created_at).total_seconds()
+        if self.started_at:
+            run_seconds = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        data = {
+            'job_id': self.job_id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'election_id': self.election_id,
+            'progress': self.progress,
+            'progress_message': self.progress_message,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'timings': {
+                'queued_seconds': queued_seconds,
+                'run_seconds': run_seconds,
+                'steps': json.loads(self.timings) if self.timings else []
+            }
+        }
+        if include_result:
+            data['result'] = json.loads(self.result) if self.result else None
+        return data
+
+    def __repr__(self):
+        return f'<BackgroundJob {self.job_id} {self.job_type} status={self.status}>'
@@ -16,6 +16,7 @@ class Election(db.Model):
     date_end = db.Column(db.Date, nullable=False)
     voters_count = db.Column(db.Integer, default=0)
     participation_rate = db.Column(db.Float, nullable=True)
+    ballots_cast = db.Column(db.Integer, default=0, nullable=False)  # Distinct voters who submitted a ballot
     queued_access = db.Column(db.Boolean, default=False, nullable=False)
     max_concurrent_voters = db.Column(db.Integer, nullable=True)
 
@@ -13,6 +13,8 @@ class ElectionResult(db.Model):
     election_id = db.Column(db.Integer, db.ForeignKey('elections.election_id'), nullable=False)
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), nullable=False)
     encrypted_vote_total = db.Column(db.Text)
+    # Same ciphertext as fixed-width big-endian bytes; read this first when present
+    encrypted_vote_total_bytes = db.Column(db.LargeBinary, nullable=True)
     vote_count = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -38,7 +40,8 @@ class ElectionResult(db.Model):
         ).filter_by(election_id=election_id).group_by(cls.candidate_id).all()
         
     @classmethod
-    def upsert_result(cls, election_id, candidate_id, encrypted_vote_total=None, vote_count=None):
+    def upsert_result(cls, election_id, candidate_id, encrypted_vote_total=None, vote_count=None,
+                      encrypted_vote_total_bytes=None):
         """Upsert an election result, preventing duplicates"""
         try:
             # Check for existing result
@@ -48,6 +51,8 @@ class ElectionResult(db.Model):
                 logger.info(f"Updating existing result for election {election_id}, candidate {candidate_id}")
                 if encrypted_vote_total is not None:
                     existing.encrypted_vote_total = encrypted_vote_total
+                    # Never leave bytes of an older total next to a new text total
+                    existing.encrypted_vote_total_bytes = encrypted_vote_total_bytes
                 if vote_count is not None:
                     existing.vote_count = vote_count
                 existing.updated_at = datetime.utcnow()
@@ -58,6 +63,7 @@ class ElectionResult(db.Model):
                     election_id=election_id,
                     candidate_id=candidate_id,
                     encrypted_vote_total=encrypted_vote_total,
+                    encrypted_vote_total_bytes=encrypted_vote_total_bytes,
                     vote_count=vote_count
                 )
                 db.session.add(new_result)
@@ -112,12 +118,10 @@ class ElectionResult(db.Model):
         2. Check for negative values
         3. Check for unusually high values
         """
-        from app.models.vote import Vote
-        from collections import Counter
+        from app.services.tally.vote_reader import VoteReader
         
         # Get actual votes per candidate
-        votes = Vote.query.filter_by(election_id=election_id).all()
-        vote_counts = Counter(v.candidate_id for v in votes)
+        vote_counts = VoteReader.count_by_candidate(election_id)
         
         # Get decrypted results
         results = cls.query.filter_by(election_id=election_id).all()
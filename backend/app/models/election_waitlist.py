@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import Index, and_, or_
 
 class ElectionWaitlist(db.Model):
     __tablename__ = 'election_waitlist'
@@ -9,5 +10,39 @@ class ElectionWaitlist(db.Model):
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='waiting')  # 'waiting', 'active', 'done'
 
+    # Queue order is (joined_at, id) within an election and status; positions are COUNTs over this index
+    __table_args__ = (
+        Index('ix_election_waitlist_queue', 'election_id', 'status', 'joined_at', 'id'),
+        # A voter's own entry, looked up on every access check and leave
+        Index('ix_election_waitlist_voter', 'election_id', 'voter_id', 'status'),
+    )
+
+    @classmethod
+    def count_waiting(cls, election_id):
+        """Number of voters waiting in an election's queue"""
+        return cls.query.filter_by(election_id=election_id, status='waiting').count()
+
+    @classmethod
+    def queue_position(cls, entry):
+        """
+        1-based position of a waiting entry, computed with one COUNT on the
+        queue index instead of loading the queue. Ties on joined_at are
+        broken by id.
+        """
+        ahead = cls.query.filter(
+            cls.election_id == entry.election_id,
+            cls.status == 'waiting',
+            or_(
+                cls.joined_at < entry.joined_at,
+                and_(cls.joined_at == entry.joined_at, cls.id < entry.id)
+            )
+        ).count()
+        return ahead + 1
+
+    @classmethod
+    def next_waiting(cls, election_id):
+        """The entry at the head of an election's queue, or None"""
+        return cls.query.filter_by(election_id=election_id, status='waiting').order_by(cls.joined_at, cls.id).first()
+
     def __repr__(self):
         return f'<ElectionWaitlist election_id={self.election_id} voter_id={self.voter_id} status={self.status}>'
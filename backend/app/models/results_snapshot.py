@@ -0,0 +1,21 @@
+from app import db
+from datetime import datetime
+
+class ResultsSnapshot(db.Model):
+    """
+    Precomputed JSON of one results view of a finished election.
+
+    Rows are never updated: when the rows they were built from change
+    (``source_version`` no longer matches) they are replaced on the next
+    read. ``content_hash`` is the SHA-256 of ``payload`` and doubles as the
+    view's ETag.
+    """
+    __tablename__ = 'results_snapshots'
+
+    election_id = db.Column(db.Integer, primary_key=True)
+    view = db.Column(db.String(20), primary_key=True)  # 'decrypted', 'pdf', 'detail'
+    content_hash = db.Column(db.String(64), nullable=False)
+    # Fingerprint of the election's results, candidates and election row when built
+    source_version = db.Column(db.String(64), nullable=False)
+    payload = db.deferred(db.Column(db.Text, nullable=False))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
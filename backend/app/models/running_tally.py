@@ -0,0 +1,31 @@
+from app import db
+from datetime import datetime
+from sqlalchemy.orm import relationship
+from sqlalchemy import UniqueConstraint
+
+class RunningTally(db.Model):
+    """
+    Per-candidate running homomorphic product of the ballots cast so far.
+
+    Maintained at cast time when INCREMENTAL_TALLY_ENABLED is set, so that
+    tallying a closed election only needs to read these rows.
+    """
+    __tablename__ = 'running_tallies'
+
+    tally_id = db.Column(db.Integer, primary_key=True)
+    election_id = db.Column(db.Integer, db.ForeignKey('elections.election_id'), nullable=False)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), nullable=False)
+    # Key the product was computed under; a different active key invalidates the row
+    crypto_id = db.Column(db.Integer, db.ForeignKey('crypto_configs.crypto_id'), nullable=False)
+    encrypted_product = db.Column(db.Text, nullable=False)
+    ballot_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (UniqueConstraint('election_id', 'candidate_id', name='unique_running_tally_candidate'),)
+
+    # Relationships
+    election = relationship("Election", backref="running_tallies")
+    candidate = relationship("Candidate", backref="running_tallies")
+
+    def __repr__(self):
+        return f'<RunningTally election={self.election_id} candidate={self.candidate_id} ballots={self.ballot_count}>'
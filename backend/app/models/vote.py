@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 class Vote(db.Model):
@@ -9,7 +10,11 @@ class Vote(db.Model):
     election_id = db.Column(db.Integer, db.ForeignKey('elections.election_id'), nullable=False)
     student_id = db.Column(db.String(10), db.ForeignKey('voters.student_id'), nullable=False)
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), nullable=False)
+    # Copied from the candidate at cast time so the database can enforce one vote per position
+    position_id = db.Column(db.Integer, db.ForeignKey('positions.position_id'), nullable=True)
     encrypted_vote = db.Column(db.Text, nullable=False)
+    # Same ciphertext as fixed-width big-endian bytes; NULL for ballots cast without a usable key
+    encrypted_vote_bytes = db.Column(db.LargeBinary, nullable=True)
     zkp_proof = db.Column(db.String(32), nullable=True, comment='Status: e.g., verified, failed')
     verification_receipt = db.Column(db.String(32), nullable=True, comment='Status: e.g., sent, not_sent')
     cast_time = db.Column(db.DateTime, default=datetime.utcnow)
@@ -19,6 +24,18 @@ class Vote(db.Model):
     election = relationship("Election", backref="votes")
     voter = relationship("Voter", backref="votes")
     candidate = relationship("Candidate", backref="votes")
+
+    # (election_id, student_id, ...) also serves "has this voter voted" and election-wide scans
+    __table_args__ = (
+        UniqueConstraint('election_id', 'student_id', 'position_id', name='unique_vote_per_position'),
+        # NULLs never collide in the constraint above; votes for candidates without a position are unique per candidate
+        Index('uq_votes_unpositioned_candidate', 'election_id', 'student_id', 'candidate_id', unique=True,
+              postgresql_where=db.text('position_id IS NULL'), sqlite_where=db.text('position_id IS NULL')),
+        # Per-candidate counts and tally reads
+        Index('ix_votes_election_candidate', 'election_id', 'candidate_id'),
+        # Monthly distinct-voter rollups
+        Index('ix_votes_cast_time', 'cast_time'),
+    )
     
     def __repr__(self):
         return f'<Vote {self.vote_id}>'
\ No newline at end of file
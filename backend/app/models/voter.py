@@ -57,7 +57,8 @@ class Voter(db.Model):
     college = db.relationship('College', back_populates='voters')
 
     __table_args__ = (
-        db.CheckConstraint("student_id ~ '^[0-9]{4}-[0-9]{5}$'", name='check_student_id_format'),
+        # Regex match is PostgreSQL syntax; other databases (the SQLite test suite) skip the CHECK
+        db.CheckConstraint("student_id ~ '^[0-9]{4}-[0-9]{5}$'", name='check_student_id_format').ddl_if(dialect='postgresql'),
     )
     
     def set_password(self, password: str) -> None:
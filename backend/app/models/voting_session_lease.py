@@ -0,0 +1,31 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import Index, UniqueConstraint
+
+class VotingSessionLease(db.Model):
+    """
+    Time-limited claim on a voting session, renewed by client heartbeats.
+
+    ``holds_slot`` records whether the session was counted in
+    ``Election.voters_count``; voters promoted from the waitlist hold a lease
+    without a slot until they pass access_check.
+    """
+    __tablename__ = 'voting_session_leases'
+
+    lease_id = db.Column(db.Integer, primary_key=True)
+    election_id = db.Column(db.Integer, db.ForeignKey('elections.election_id'), nullable=False)
+    voter_id = db.Column(db.String(10), db.ForeignKey('voters.student_id'), nullable=False)
+    holds_slot = db.Column(db.Boolean, nullable=False, default=False)
+    status = db.Column(db.String(20), nullable=False, default='active')  # 'active', 'released', 'expired'
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    renewed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('election_id', 'voter_id', name='unique_voting_session_lease'),
+        # The reaper scans active leases by expiry
+        Index('ix_voting_session_leases_status_expires', 'status', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f'<VotingSessionLease election={self.election_id} voter={self.voter_id} status={self.status}>'
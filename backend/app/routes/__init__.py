@@ -23,6 +23,7 @@ from .archived_results_routes import archived_results_bp
 from .documentation_routes import documentation_routes as documentation_bp
 from .system_settings_routes import system_settings_bp
 from .super_admin_routes import super_admin_bp
+from .job_routes import job_bp
 
 # Define __all__ for clarity
 __all__ = [
@@ -48,4 +49,5 @@ __all__ = [
     "documentation_bp",
     "system_settings_bp",
     "super_admin_bp",
+    "job_bp",
 ]
\ No newline at end of file
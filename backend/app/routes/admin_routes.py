@@ -1,15 +1,11 @@
 from flask import Blueprint, request, jsonify, current_app
 import jwt
 from functools import wraps
-from app import db
 from app.models.admin import Admin
 from app.controllers.admin_controller import AdminController
-from app.models.election import Election
-from app.models.voter import Voter
-from app.models.vote import Vote
 from app.models.position import Position
 from app.models.candidate import Candidate
-from datetime import datetime, timedelta
+from app.services.dashboard import DashboardAggregates
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api')
 
@@ -49,87 +45,13 @@ def get_admin_me():
 @admin_required
 def get_dashboard_data():
     try:
-        # Get admin stats
-        try:
-            stats_response = get_admin_stats()
-            if isinstance(stats_response, tuple) and len(stats_response) > 0:
-                stats_data = stats_response[0].json
-            else:
-                stats_data = {}
-        except Exception as e:
-            current_app.logger.error(f"Error fetching admin stats: {str(e)}")
-            stats_data = {}
-            
-        # Get election activity data
-        try:
-            election_activity_response = get_election_activity()
-            if isinstance(election_activity_response, tuple) and len(election_activity_response) > 0:
-                election_activity_data = election_activity_response[0].json
-            else:
-                election_activity_data = []
-        except Exception as e:
-            current_app.logger.error(f"Error fetching election activity: {str(e)}")
-            election_activity_data = []
-            
-        # Get voter engagement data
-        try:
-            voter_engagement_response = get_voter_engagement()
-            if isinstance(voter_engagement_response, tuple) and len(voter_engagement_response) > 0:
-                voter_engagement_data = voter_engagement_response[0].json
-            else:
-                voter_engagement_data = []
-        except Exception as e:
-            current_app.logger.error(f"Error fetching voter engagement: {str(e)}")
-            voter_engagement_data = []
-              # Participation rate data - temporarily disabled due to schema issues
-        participation_rate_data = [
+        data = DashboardAggregates.dashboard()
+        # Participation rate data - temporarily disabled due to schema issues
+        data['participationRate'] = [
             {'name': 'Voted', 'value': 65, 'color': '#10b981'},
             {'name': 'Not Voted', 'value': 35, 'color': '#f87171'}
         ]
-            
-        # Get system load data
-        try:
-            system_load_response = get_system_load_data()
-            if isinstance(system_load_response, tuple) and len(system_load_response) > 0:
-                system_load_data = system_load_response[0].json
-            else:
-                system_load_data = []
-        except Exception as e:
-            current_app.logger.error(f"Error fetching system load: {str(e)}")
-            system_load_data = []
-            
-        # Get recent activity data
-        try:
-            recent_activity_response = get_recent_activity_data()
-            if isinstance(recent_activity_response, tuple) and len(recent_activity_response) > 0:
-                recent_activity_data = recent_activity_response[0].json
-            else:
-                recent_activity_data = []
-        except Exception as e:
-            current_app.logger.error(f"Error fetching recent activity: {str(e)}")
-            recent_activity_data = []
-            
-        # Get system alerts data
-        try:
-            system_alerts_response = get_system_alerts_data()
-            if isinstance(system_alerts_response, tuple) and len(system_alerts_response) > 0:
-                system_alerts_data = system_alerts_response[0].json
-            else:
-                system_alerts_data = []
-        except Exception as e:
-            current_app.logger.error(f"Error fetching system alerts: {str(e)}")
-            system_alerts_data = []
-
-        # Return the combined dashboard data
-        return jsonify({
-            'stats': stats_data,
-            'electionActivity': election_activity_data,
-            'voterEngagement': voter_engagement_data,
-            'participationRate': participation_rate_data,
-            'systemLoad': system_load_data,
-            'recentActivity': recent_activity_data,
-            'systemAlerts': system_alerts_data
-        }), 200
+        return jsonify(data), 200
     except Exception as e:
         current_app.logger.error(f"Error in dashboard data fetch: {str(e)}")
         return jsonify({'message': f'Error fetching dashboard data: {str(e)}'}), 500
@@ -138,44 +60,7 @@ def get_dashboard_data():
 @admin_required
 def get_admin_stats():
     try:
-        from app.models.organization import Organization
-        from app.models.election_result import ElectionResult
-          # Count active elections (end date is in the future)
-        now = datetime.now().date()
-        active_elections = Election.query.filter(Election.date_end > now).count()
-        
-        # Count total registered voters
-        registered_voters = Voter.query.count()
-        
-        # Count completed elections (those with election results recorded)
-        completed_election_ids = db.session.query(ElectionResult.election_id).distinct().subquery()
-        completed_elections = db.session.query(Election).filter(
-            Election.election_id.in_(db.session.query(completed_election_ids.c.election_id))
-        ).count()
-          # Calculate average participation using the participation_rate field from elections
-        elections_with_results = db.session.query(Election).filter(
-            Election.election_id.in_(db.session.query(completed_election_ids.c.election_id))
-        ).all()
-        
-        if elections_with_results:
-            total_participation = 0
-            elections_with_participation = 0
-            for election in elections_with_results:
-                # Use the stored participation_rate field if available
-                if election.participation_rate is not None and election.participation_rate > 0:
-                    total_participation += election.participation_rate
-                    elections_with_participation += 1
-            
-            avg_participation = round(total_participation / elections_with_participation, 1) if elections_with_participation > 0 else 0
-        else:
-            avg_participation = 0
-        
-        return jsonify({
-            'activeElections': active_elections,
-            'registeredVoters': registered_voters,
-            'completedElections': completed_elections,
-            'averageParticipation': avg_participation
-        }), 200
+        return jsonify(DashboardAggregates.stats()), 200
     except Exception as e:
         current_app.logger.error(f"Error in admin stats fetch: {str(e)}")
         return jsonify({'message': f'Error fetching admin stats: {str(e)}'}), 500
@@ -184,46 +69,7 @@ def get_admin_stats():
 @admin_required
 def get_election_activity():
     try:
-        # Get dates for the last 7 days
-        days = []
-        now = datetime.now()
-        for i in range(7):
-            day = now - timedelta(days=6-i)
-            days.append({
-                'date': day.date(),
-                'name': day.strftime('%a')
-            })
-
-        result = []
-        for day in days:
-            day_start = datetime.combine(day['date'], datetime.min.time())
-            day_end = datetime.combine(day['date'], datetime.max.time())
-            
-            # Ongoing elections on this day
-            ongoing = Election.query.filter(
-                Election.date_start <= day_end,
-                Election.date_end >= day_start
-            ).count()
-            
-            # Completed elections that ended on this day
-            completed = Election.query.filter(
-                Election.date_end >= day_start,
-                Election.date_end <= day_end
-            ).count()
-            
-            # Scheduled elections that start after this day
-            scheduled = Election.query.filter(
-                Election.date_start > day_end
-            ).count()
-            
-            result.append({
-                'name': day['name'],
-                'ongoing': ongoing,
-                'completed': completed,
-                'scheduled': scheduled
-            })
-            
-        return jsonify(result), 200
+        return jsonify(DashboardAggregates.election_activity()), 200
     except Exception as e:
         current_app.logger.error(f"Error in election activity fetch: {str(e)}")
         return jsonify({'message': f'Error fetching election activity: {str(e)}'}), 500
@@ -232,45 +78,7 @@ def get_election_activity():
 @admin_required
 def get_voter_engagement():
     try:
-        # Get data for the last 5 months
-        months = []
-        now = datetime.now()
-        for i in range(5):
-            month = now.month - i
-            year = now.year
-            while month <= 0:
-                month += 12
-                year -= 1
-            months.append({
-                'month': month,
-                'year': year,
-                'name': datetime(year, month, 1).strftime('%b')
-            })
-        months.reverse()  # Show oldest to newest
-        
-        result = []
-        for month_data in months:
-            month = month_data['month']
-            year = month_data['year']
-            
-            # Count votes cast in this month
-            month_start = datetime(year, month, 1)
-            if month == 12:
-                month_end = datetime(year+1, 1, 1) - timedelta(seconds=1)
-            else:
-                month_end = datetime(year, month+1, 1) - timedelta(seconds=1)
-            
-            active_voters = Vote.query.filter(
-                Vote.cast_time >= month_start,
-                Vote.cast_time <= month_end
-            ).distinct(Vote.student_id).count()
-            
-            result.append({
-                'name': month_data['name'],
-                'active': active_voters
-            })
-            
-        return jsonify(result), 200
+        return jsonify(DashboardAggregates.voter_engagement()), 200
     except Exception as e:
         current_app.logger.error(f"Error in voter engagement fetch: {str(e)}")
         return jsonify({'message': f'Error fetching voter engagement: {str(e)}'}), 500
@@ -282,55 +90,7 @@ def get_voter_engagement():
 @admin_required
 def get_system_load_data():
     try:
-        # Get system load based on actual voting activity over the last 24 hours
-        from sqlalchemy import func
-        
-        now = datetime.now()
-        yesterday = now - timedelta(hours=24)
-        
-        # Define time slots for the last 24 hours
-        time_slots = []
-        for i in range(0, 24, 4):  # Every 4 hours
-            slot_time = yesterday + timedelta(hours=i)
-            time_slots.append({
-                'hour': slot_time.hour,
-                'name': slot_time.strftime('%H:%M'),
-                'start': slot_time,
-                'end': slot_time + timedelta(hours=4)
-            })
-        
-        result = []
-        for slot in time_slots:
-            # Count votes cast in this time slot as a proxy for system activity
-            vote_count = Vote.query.filter(
-                Vote.cast_time >= slot['start'],
-                Vote.cast_time < slot['end']
-            ).count()
-            
-            # Also count any audit log activity in this time slot
-            log_count = 0
-            try:
-                from app.models.audit_log import AuditLog
-                log_count = AuditLog.query.filter(
-                    AuditLog.log_time >= slot['start'],
-                    AuditLog.log_time < slot['end']
-                ).count()
-            except:
-                pass
-            
-            # Combine vote and log activity as "traffic"
-            traffic = vote_count + log_count
-            
-            # If no activity, show minimal baseline traffic
-            if traffic == 0:
-                traffic = 1 if 8 <= slot['hour'] <= 20 else 0
-            
-            result.append({
-                'name': slot['name'],
-                'traffic': traffic
-            })
-            
-        return jsonify(result), 200
+        return jsonify(DashboardAggregates.system_load()), 200
     except Exception as e:
         current_app.logger.error(f"Error in system load fetch: {str(e)}")
         return jsonify({'message': f'Error fetching system load: {str(e)}'}), 500
@@ -339,38 +99,7 @@ def get_system_load_data():
 @admin_required
 def get_recent_activity_data():
     try:
-        # Import AuditLog model
-        from app.models.audit_log import AuditLog
-        
-        # Get recent audit logs (last 50 entries)
-        recent_logs = AuditLog.query.order_by(AuditLog.log_time.desc()).limit(50).all()
-        
-        result = []
-        for log in recent_logs:
-            # Get user information
-            user_info = "System (automated)"
-            if log.voter:
-                user_info = f"Voter ({log.voter.student_id})"
-            elif log.student_id:
-                user_info = f"User ({log.student_id})"
-            
-            # Format the action with election context
-            action_text = log.action
-            if log.election:
-                action_text += f" for {log.election.title}"
-            
-            result.append({
-                'id': log.log_id,
-                'action': action_text,
-                'user': user_info,
-                'timestamp': log.log_time.strftime("%m/%d/%Y, %H:%M") if log.log_time else "Unknown"
-            })
-            
-        # If no real logs exist, return empty list instead of mock data
-        if not result:
-            result = []
-            
-        return jsonify(result), 200
+        return jsonify(DashboardAggregates.recent_activity()), 200
     except Exception as e:
         current_app.logger.error(f"Error in recent activity fetch: {str(e)}")
         return jsonify({'message': f'Error fetching recent activity: {str(e)}'}), 500
@@ -379,80 +108,7 @@ def get_recent_activity_data():
 @admin_required
 def get_system_alerts_data():
     try:
-        result = []
-        alert_id = 1
-        
-        # Check for real system conditions and generate appropriate alerts
-        
-        # Check for elections ending soon (within 24 hours)
-        now = datetime.now()
-        ending_soon = Election.query.filter(
-            Election.date_end > now,
-            Election.date_end <= now + timedelta(hours=24)
-        ).all()
-        
-        for election in ending_soon:
-            hours_left = (election.date_end - now).total_seconds() / 3600
-            result.append({
-                'id': alert_id,
-                'message': f'Election "{election.title}" ends in {int(hours_left)} hours',
-                'level': 'warning',
-                'timestamp': now.strftime("%m/%d/%Y, %H:%M")
-            })
-            alert_id += 1
-          # Check for elections with low participation - temporarily disabled due to schema issues
-        # The voter table doesn't have election_id field in current schema
-        
-        # Check for elections that have ended but no results published
-        unfinished_elections = Election.query.filter(
-            Election.date_end < now,
-            Election.date_end > now - timedelta(days=7)  # Within last 7 days
-        ).all()
-        
-        for election in unfinished_elections:
-            # Check if results exist (you might need to adjust this based on your results model)
-            try:
-                from app.models.election_result import ElectionResult
-                has_results = ElectionResult.query.filter_by(election_id=election.election_id).first()
-                if not has_results:
-                    result.append({
-                        'id': alert_id,
-                        'message': f'Results pending for completed election "{election.title}"',
-                        'level': 'info',
-                        'timestamp': now.strftime("%m/%d/%Y, %H:%M")
-                    })
-                    alert_id += 1
-            except:
-                # If ElectionResult model doesn't exist, skip this check
-                pass
-        
-        # Check for high system activity (if more than 100 votes in last hour)
-        recent_votes = Vote.query.filter(
-            Vote.cast_time >= now - timedelta(hours=1)
-        ).count()
-        
-        if recent_votes > 100:
-            result.append({
-                'id': alert_id,
-                'message': f'High voting activity detected ({recent_votes} votes in last hour)',
-                'level': 'info',
-                'timestamp': now.strftime("%m/%d/%Y, %H:%M")
-            })
-            alert_id += 1
-        
-        # Limit to most recent 10 alerts
-        result = result[:10]
-        
-        # If no real alerts, add a status message
-        if not result:
-            result.append({
-                'id': 1,
-                'message': 'All systems operating normally',
-                'level': 'info',
-                'timestamp': now.strftime("%m/%d/%Y, %H:%M")
-            })
-            
-        return jsonify(result), 200
+        return jsonify(DashboardAggregates.alerts()), 200
     except Exception as e:
         current_app.logger.error(f"Error in system alerts fetch: {str(e)}")
         return jsonify({'message': f'Error fetching system alerts: {str(e)}'}), 500
\ No newline at end of file
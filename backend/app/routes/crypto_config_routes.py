@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.controllers.crypto_config_controller import CryptoConfigController
 from app.utils.auth import admin_required, trusted_authority_required
+from app.controllers.job_controller import JobController
+from app.routes.job_routes import wants_async
 
 crypto_config_bp = Blueprint('crypto_config', __name__, url_prefix='/api')
 
@@ -30,6 +32,8 @@ def generate_crypto_key_pair():
 def generate_in_memory_key_pair():
     """Generate key pair without storing in the database"""
     # Use the CryptoConfigController method directly for consistency
+    if wants_async():
+        return JobController.enqueue('generate_key_pair', request.get_json() or {})
     return CryptoConfigController.generate_key_pair_in_memory()
 
 @crypto_config_bp.route('/crypto_configs/distribute', methods=['POST'])
@@ -19,6 +19,10 @@ def leave_waitlist(election_id):
 def waitlist_position(election_id):
     return ElectionAccessController.waitlist_position(election_id)
 
+@election_access_bp.route('/elections/<int:election_id>/waitlist/events', methods=['GET'])
+def waitlist_events(election_id):
+    return ElectionAccessController.waitlist_events(election_id)
+
 @election_access_bp.route('/elections/<int:election_id>/waitlist/next', methods=['POST'])
 def next_in_waitlist(election_id):
     return ElectionAccessController.next_in_waitlist(election_id)
@@ -27,6 +27,10 @@ def get_votes_by_voter(election_id, student_id):
 def start_voting_session(election_id):
     return ElectionCastController.start_voting_session(election_id)
 
+@election_cast_bp.route('/elections/<int:election_id>/voting_session/heartbeat', methods=['POST'])
+def heartbeat_voting_session(election_id):
+    return ElectionCastController.heartbeat_voting_session(election_id)
+
 @election_cast_bp.route('/elections/<int:election_id>/leave_voting_session', methods=['POST'])
 def leave_voting_session(election_id):
     return ElectionCastController.leave_voting_session(election_id)
@@ -1,10 +1,15 @@
 from flask import Blueprint, request, jsonify
 from app.controllers.election_results_controller import ElectionResultsController
+from app.controllers.job_controller import JobController
+from app.routes.job_routes import wants_async
+from app.utils.auth import admin_required
 
 election_results_bp = Blueprint('election_results', __name__, url_prefix='/api')
 
 @election_results_bp.route('/election_results/tally', methods=['POST'])
 def tally_election():
+    if wants_async():
+        return JobController.enqueue('tally_election', request.get_json() or {})
     return ElectionResultsController.tally_election()
 
 @election_results_bp.route('/election_results/<int:election_id>/authorities', methods=['GET'])
@@ -17,6 +22,8 @@ def reconstruct_private_key():
 
 @election_results_bp.route('/election_results/decrypt', methods=['POST'])
 def decrypt_tally():
+    if wants_async():
+        return JobController.enqueue('decrypt_tally', request.get_json() or {})
     return ElectionResultsController.decrypt_tally()
 
 @election_results_bp.route('/election_results/<int:election_id>/decrypted', methods=['GET'])
@@ -25,8 +32,20 @@ def get_decrypted_results(election_id):
 
 @election_results_bp.route('/election_results/<int:election_id>/pdf', methods=['GET'])
 def export_pdf_report(election_id):
+    if wants_async():
+        return JobController.enqueue('pdf_data', {'election_id': election_id})
     return ElectionResultsController.get_pdf_data(election_id)
 
+@election_results_bp.route('/election_results/export', methods=['POST'])
+@admin_required
+def export_results():
+    return ElectionResultsController.export_results()
+
+@election_results_bp.route('/election_results/exports/<filename>', methods=['GET'])
+@admin_required
+def download_export(filename):
+    return ElectionResultsController.download_export(filename)
+
 @election_results_bp.route('/election_results/<int:election_id>', methods=['GET'])
 def get_election_result(election_id):
     return ElectionResultsController.get_election_results_by_election_id(election_id)
@@ -0,0 +1,24 @@
+from flask import Blueprint, request
+from app.controllers.job_controller import JobController
+from app.utils.auth import admin_required
+
+job_bp = Blueprint('jobs', __name__, url_prefix='/api')
+
+def wants_async():
+    """True when a long-running endpoint was called with ?async=true"""
+    return request.args.get('async', '').lower() in ('1', 'true', 'yes')
+
+@job_bp.route('/jobs', methods=['POST'])
+@admin_required
+def create_job():
+    return JobController.create_job()
+
+@job_bp.route('/jobs', methods=['GET'])
+@admin_required
+def list_jobs():
+    return JobController.list_jobs()
+
+@job_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@admin_required
+def get_job(job_id):
+    return JobController.get_job(job_id)
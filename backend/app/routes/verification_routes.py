@@ -12,6 +12,10 @@ verification_bp.route('/verify', methods=['POST'])(
     VerificationController.verify_vote_zkp
 )
 
+verification_bp.route('/verify-batch', methods=['POST'])(
+    VerificationController.verify_vote_zkp_batch
+)
+
 # Verification key endpoint
 verification_bp.route('/key', methods=['GET'])(
     VerificationController.get_verification_key
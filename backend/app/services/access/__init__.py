@@ -0,0 +1,6 @@
+from .slot_counter import VoterSlotCounter
+from .waitlist_events import WaitlistEventBroker
+from .session_leases import SessionLeaseService
+from .eligible_voters import EligibleVoterCounts
+
+__all__ = ['VoterSlotCounter', 'WaitlistEventBroker', 'SessionLeaseService', 'EligibleVoterCounts']
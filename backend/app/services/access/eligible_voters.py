@@ -0,0 +1,127 @@
+"""
+In-process cache of eligible-voter counts per college
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app import db
+from app.config import Config
+from app.models.voter import Voter
+
+logger = logging.getLogger(__name__)
+
+
+class EligibleVoterCounts:
+    """
+    Registered voters per college, loaded with one GROUP BY and then served from memory.
+
+    An election restricted to a college counts that college's voters; an
+    election open to all colleges counts every voter. The voter roll barely
+    changes during an election, so participation rates read these numbers
+    instead of scanning ``voters``.
+
+    The snapshot is dropped when a Voter row is inserted, deleted or moved to
+    another college in this process, and again when that transaction commits,
+    so a reload racing the write cannot keep the old numbers. The TTL bounds
+    staleness for writes made by other processes.
+    """
+    _by_college: Optional[Dict[int, int]] = None
+    _expires_at = 0.0
+    _lock = threading.Lock()
+    _ttl = Config.ELIGIBLE_VOTER_CACHE_TTL
+
+    @staticmethod
+    def _load() -> Dict[int, int]:
+        rows = db.session.query(Voter.college_id, func.count(Voter.student_id)).group_by(Voter.college_id)
+        return {college_id: count for college_id, count in rows}
+
+    @classmethod
+    def _snapshot(cls) -> Dict[int, int]:
+        now = time.monotonic()
+        with cls._lock:
+            if cls._by_college is not None and cls._expires_at > now:
+                return cls._by_college
+
+        by_college = cls._load()
+        with cls._lock:
+            cls._by_college = by_college
+            cls._expires_at = now + cls._ttl
+        return by_college
+
+    @classmethod
+    def count(cls, college_id: Optional[int] = None) -> int:
+        """
+        Number of voters eligible for an election
+
+        Args:
+            college_id: College the election is restricted to, or None if it is open to all colleges
+
+        Returns:
+            Registered voters of the college, or of every college
+        """
+        by_college = cls._snapshot()
+        if college_id:
+            return by_college.get(college_id, 0)
+        return sum(by_college.values())
+
+    @classmethod
+    def for_election(cls, election) -> int:
+        """
+        Number of voters eligible for an election, based on its organization's college
+        """
+        organization = election.organization
+        return cls.count(organization.college_id if organization else None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop the cached counts
+        """
+        with cls._lock:
+            cls._by_college = None
+            cls._expires_at = 0.0
+
+
+def _mark_changed(session: Optional[Session]) -> None:
+    EligibleVoterCounts.clear()
+    if session is not None:
+        session.info['eligible_voters_changed'] = True
+
+
+@event.listens_for(Voter, 'after_insert')
+@event.listens_for(Voter, 'after_delete')
+def _voter_added_or_removed(mapper, connection, target) -> None:
+    _mark_changed(object_session(target))
+
+
+@event.listens_for(Voter, 'after_update')
+def _voter_updated(mapper, connection, target) -> None:
+    # Only a change of college moves a voter between counts
+    if inspect(target).attrs.college_id.history.has_changes():
+        _mark_changed(object_session(target))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _voters_bulk_changed(orm_execute_state) -> None:
+    # insert()/Query.update()/delete() bypass the mapper events above
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_arguments.get('mapper')
+    if mapper is not None and mapper.class_ is Voter:
+        _mark_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _voters_committed(session) -> None:
+    if session.info.pop('eligible_voters_changed', False):
+        EligibleVoterCounts.clear()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _voters_rolled_back(session) -> None:
+    session.info.pop('eligible_voters_changed', None)
@@ -0,0 +1,259 @@
+"""
+Heartbeat leases for voting sessions and the reaper that reclaims abandoned ones
+"""
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.config import Config
+from app.models.election import Election
+from app.models.election_waitlist import ElectionWaitlist
+from app.models.voting_session_lease import VotingSessionLease
+from app.services.access.slot_counter import VoterSlotCounter
+from app.services.access.waitlist_events import WaitlistEventBroker
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLeaseService:
+    """
+    Leases make abandoned sessions recoverable.
+
+    A lease is granted whenever a voter is admitted or promoted from the
+    waitlist, renewed by the heartbeat endpoint, and released when the voter
+    leaves. Leases that pass ``expires_at`` are reaped in batches: the slot is
+    released, the waitlist entry closed and the next waiting voters promoted.
+    Grants, releases and promotions run in the caller's transaction.
+    """
+
+    _reaper_thread: Optional[threading.Thread] = None
+    _reaper_stop = threading.Event()
+
+    @staticmethod
+    def _expiry(now: datetime) -> datetime:
+        return now + timedelta(seconds=current_app.config.get('VOTING_SESSION_TTL', Config.VOTING_SESSION_TTL))
+
+    @staticmethod
+    def grant(election_id: int, voter_id: str, holds_slot: bool) -> VotingSessionLease:
+        """
+        Start or restart the lease of a voter's session
+
+        Args:
+            election_id: ID of the election
+            voter_id: Student ID of the voter
+            holds_slot: Whether the session was counted in voters_count
+
+        Returns:
+            The active lease
+        """
+        now = datetime.utcnow()
+        lease = VotingSessionLease.query.filter_by(
+            election_id=election_id, voter_id=voter_id
+        ).with_for_update().first()
+
+        if lease is None:
+            try:
+                # A concurrent grant may insert the same row; the savepoint keeps our transaction usable
+                with db.session.begin_nested():
+                    lease = VotingSessionLease(
+                        election_id=election_id,
+                        voter_id=voter_id,
+                        holds_slot=holds_slot,
+                        status='active',
+                        created_at=now,
+                        renewed_at=now,
+                        expires_at=SessionLeaseService._expiry(now)
+                    )
+                    db.session.add(lease)
+                return lease
+            except IntegrityError:
+                lease = VotingSessionLease.query.filter_by(
+                    election_id=election_id, voter_id=voter_id
+                ).with_for_update().one()
+
+        lease.holds_slot = holds_slot
+        lease.status = 'active'
+        lease.renewed_at = now
+        lease.expires_at = SessionLeaseService._expiry(now)
+        return lease
+
+    @staticmethod
+    def renew(election_id: int, voter_id: str) -> Optional[datetime]:
+        """
+        Extend an active lease (heartbeat)
+
+        Returns:
+            The new expiry, or None if the voter has no active lease
+        """
+        now = datetime.utcnow()
+        expires_at = SessionLeaseService._expiry(now)
+        renewed = db.session.execute(
+            update(VotingSessionLease)
+            .where(
+                VotingSessionLease.election_id == election_id,
+                VotingSessionLease.voter_id == voter_id,
+                VotingSessionLease.status == 'active'
+            )
+            .values(renewed_at=now, expires_at=expires_at)
+            .returning(VotingSessionLease.lease_id),
+            execution_options={'synchronize_session': False}
+        ).first()
+        return expires_at if renewed else None
+
+    @staticmethod
+    def end_session(election_id: int, voter_id: str) -> bool:
+        """
+        Release a voter's lease because they left or finished
+
+        Args:
+            election_id: ID of the election
+            voter_id: Student ID of the voter
+
+        Returns:
+            True if the caller should give back a voters_count slot: the lease
+            was active and held one, or the session predates leases. False if
+            the reaper already reclaimed it or the voter never held a slot.
+        """
+        lease = VotingSessionLease.query.filter_by(
+            election_id=election_id, voter_id=voter_id
+        ).with_for_update().first()
+        if lease is None:
+            return True
+        if lease.status != 'active':
+            return False
+        lease.status = 'released'
+        return lease.holds_slot
+
+    @staticmethod
+    def promote_next(election_id: int, count: int = 1) -> List[str]:
+        """
+        Activate the next waiting voters and give each a lease to claim their turn
+
+        Publish the activations with ``WaitlistEventBroker`` after committing.
+
+        Returns:
+            Voter IDs that were promoted
+        """
+        if count <= 0:
+            return []
+        entries = (
+            ElectionWaitlist.query
+            .filter_by(election_id=election_id, status='waiting')
+            .order_by(ElectionWaitlist.joined_at, ElectionWaitlist.id)
+            .limit(count)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for entry in entries:
+            entry.status = 'active'
+            SessionLeaseService.grant(election_id, entry.voter_id, holds_slot=False)
+        return [entry.voter_id for entry in entries]
+
+    @staticmethod
+    def reap_expired(batch_size: int = 100) -> Dict[str, int]:
+        """
+        Reclaim expired sessions, one committed batch at a time
+
+        Rows locked by a concurrent reaper are skipped, so every server
+        process can run one safely.
+
+        Args:
+            batch_size: Leases handled per transaction
+
+        Returns:
+            Counts of expired leases, released slots and promoted voters
+        """
+        totals = Counter()
+        while True:
+            now = datetime.utcnow()
+            leases = (
+                VotingSessionLease.query
+                .filter(VotingSessionLease.status == 'active', VotingSessionLease.expires_at < now)
+                .order_by(VotingSessionLease.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not leases:
+                db.session.rollback()
+                break
+
+            freed = Counter()
+            for lease in leases:
+                lease.status = 'expired'
+                if lease.holds_slot and VoterSlotCounter.release(lease.election_id) is not None:
+                    totals['slots_released'] += 1
+                ElectionWaitlist.query.filter_by(
+                    election_id=lease.election_id, voter_id=lease.voter_id, status='active'
+                ).update({'status': 'done'}, synchronize_session=False)
+                freed[lease.election_id] += 1
+
+            promoted: Dict[int, List[str]] = {}
+            queued = {
+                election_id for (election_id,) in db.session.query(Election.election_id).filter(
+                    Election.election_id.in_(list(freed)), Election.queued_access.is_(True)
+                )
+            }
+            for election_id in queued:
+                promoted[election_id] = SessionLeaseService.promote_next(election_id, freed[election_id])
+
+            db.session.commit()
+            totals['expired'] += len(leases)
+
+            for election_id, voter_ids in promoted.items():
+                totals['promoted'] += len(voter_ids)
+                for voter_id in voter_ids:
+                    WaitlistEventBroker.voter_activated(election_id, voter_id)
+
+            if len(leases) < batch_size:
+                break
+
+        if totals['expired']:
+            logger.info(f"Reaped {totals['expired']} expired voting sessions "
+                        f"({totals['slots_released']} slots released, {totals['promoted']} voters promoted)")
+        return dict(totals)
+
+    @classmethod
+    def start_reaper(cls, app) -> None:
+        """
+        Run reap_expired in a daemon thread every VOTING_SESSION_REAPER_INTERVAL seconds
+
+        Args:
+            app: Flask application providing the database context
+        """
+        interval = app.config.get('VOTING_SESSION_REAPER_INTERVAL', 0)
+        if interval <= 0 or (cls._reaper_thread is not None and cls._reaper_thread.is_alive()):
+            return
+
+        def run():
+            while not cls._reaper_stop.wait(interval):
+                with app.app_context():
+                    try:
+                        cls.reap_expired(app.config.get('VOTING_SESSION_REAPER_BATCH', 100))
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"Voting session reaper failed: {e}")
+                    finally:
+                        db.session.remove()
+
+        cls._reaper_stop.clear()
+        cls._reaper_thread = threading.Thread(target=run, name='voting-session-reaper', daemon=True)
+        cls._reaper_thread.start()
+        logger.info(f"Voting session reaper started (interval={interval}s)")
+
+    @classmethod
+    def stop_reaper(cls) -> None:
+        """
+        Stop the reaper thread
+        """
+        cls._reaper_stop.set()
+        if cls._reaper_thread is not None:
+            cls._reaper_thread.join(timeout=5)
+            cls._reaper_thread = None
@@ -0,0 +1,102 @@
+"""
+Atomic admission counter for concurrent voting slots
+"""
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select, update
+
+from app import db
+from app.models.election import Election
+
+logger = logging.getLogger(__name__)
+
+
+class VoterSlotCounter:
+    """
+    Admission control on ``Election.voters_count``.
+
+    Every change is a single ``UPDATE ... RETURNING`` statement, so the
+    capacity check and the increment happen atomically in the database and
+    concurrent requests can neither lose updates nor admit more voters than
+    ``max_concurrent_voters``. Statements run in the caller's transaction;
+    the caller commits, so a slot change and related waitlist updates land
+    together.
+    """
+
+    @staticmethod
+    def _current_count():
+        return func.coalesce(Election.voters_count, 0)
+
+    @staticmethod
+    def _capacity():
+        return func.coalesce(Election.max_concurrent_voters, 1)
+
+    @staticmethod
+    def _execute(stmt) -> Optional[int]:
+        return db.session.execute(
+            stmt.returning(Election.voters_count),
+            execution_options={'synchronize_session': False}
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def try_acquire(election_id: int) -> Optional[int]:
+        """
+        Take a slot if the election is below capacity
+
+        Args:
+            election_id: ID of the election
+
+        Returns:
+            The new voters_count, or None if the election is full or missing
+        """
+        return VoterSlotCounter._execute(
+            update(Election)
+            .where(
+                Election.election_id == election_id,
+                VoterSlotCounter._current_count() < VoterSlotCounter._capacity()
+            )
+            .values(voters_count=VoterSlotCounter._current_count() + 1)
+        )
+
+    @staticmethod
+    def force_acquire(election_id: int) -> Optional[int]:
+        """
+        Take a slot regardless of capacity, for voters already promoted from the waitlist
+
+        Returns:
+            The new voters_count, or None if the election is missing
+        """
+        return VoterSlotCounter._execute(
+            update(Election)
+            .where(Election.election_id == election_id)
+            .values(voters_count=VoterSlotCounter._current_count() + 1)
+        )
+
+    @staticmethod
+    def release(election_id: int) -> Optional[int]:
+        """
+        Give a slot back without letting the counter go below zero
+
+        Returns:
+            The new voters_count, or None if there was no slot to release
+        """
+        return VoterSlotCounter._execute(
+            update(Election)
+            .where(Election.election_id == election_id, Election.voters_count > 0)
+            .values(voters_count=Election.voters_count - 1)
+        )
+
+    @staticmethod
+    def snapshot(election_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Read the committed slot usage
+
+        Returns:
+            (voters_count, max_concurrent_voters), or None if the election is missing
+        """
+        row = db.session.execute(
+            select(VoterSlotCounter._current_count(), VoterSlotCounter._capacity())
+            .where(Election.election_id == election_id)
+        ).first()
+        return (row[0], row[1]) if row else None
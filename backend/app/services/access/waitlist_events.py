@@ -0,0 +1,98 @@
+"""
+In-process publish/subscribe for waitlist changes, consumed by the SSE endpoint
+"""
+import logging
+import queue
+import threading
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class WaitlistEventBroker:
+    """
+    Fan-out of waitlist events to the SSE streams of one process.
+
+    Publishers call ``queue_changed`` or ``voter_activated`` after committing.
+    Each subscriber gets a bounded queue. A subscriber that falls behind
+    loses its oldest events, and that is harmless: every event makes the
+    stream re-read the voter's state.
+
+    Events are only a shortcut within one process: they never cross to
+    other server processes. The database is the source of truth, and every
+    stream re-reads its voter's state at least once per
+    WAITLIST_SSE_KEEPALIVE. A change made by another gunicorn worker (or
+    its reaper) therefore reaches a voter within one keep-alive interval,
+    and one made in the same process arrives at once.
+    """
+    _subscribers: Dict[int, Set[queue.Queue]] = {}
+    _lock = threading.Lock()
+    _max_pending = 16
+
+    @classmethod
+    def subscribe(cls, election_id: int) -> queue.Queue:
+        """
+        Register a new stream for an election
+
+        Returns:
+            Queue the stream reads events from
+        """
+        subscriber: queue.Queue = queue.Queue(maxsize=cls._max_pending)
+        with cls._lock:
+            cls._subscribers.setdefault(election_id, set()).add(subscriber)
+        return subscriber
+
+    @classmethod
+    def unsubscribe(cls, election_id: int, subscriber: queue.Queue) -> None:
+        """
+        Remove a stream when its client disconnects
+        """
+        with cls._lock:
+            subscribers = cls._subscribers.get(election_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del cls._subscribers[election_id]
+
+    @classmethod
+    def subscriber_count(cls, election_id: int) -> int:
+        """
+        Number of open streams for an election
+        """
+        with cls._lock:
+            return len(cls._subscribers.get(election_id, ()))
+
+    @classmethod
+    def publish(cls, election_id: int, event: Dict[str, Any]) -> None:
+        """
+        Deliver an event to every stream of an election
+        """
+        with cls._lock:
+            subscribers = list(cls._subscribers.get(election_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Drop the oldest event; the stream re-reads its state on any event
+                try:
+                    subscriber.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    subscriber.put_nowait(event)
+                except queue.Full:
+                    pass
+
+    @classmethod
+    def queue_changed(cls, election_id: int) -> None:
+        """
+        Signal that waiting positions of an election may have moved
+        """
+        cls.publish(election_id, {'type': 'queue_changed'})
+
+    @classmethod
+    def voter_activated(cls, election_id: int, voter_id: Optional[str]) -> None:
+        """
+        Signal that a waiting voter was promoted to an active session
+        """
+        cls.publish(election_id, {'type': 'activated', 'voter_id': voter_id})
@@ -0,0 +1,10 @@
+from .paillier_keys import PaillierKeyCache, CachedPaillierKey
+from .ciphertext_codec import ciphertext_width, encode_ciphertext, decode_ciphertext
+from .shamir import (ShareFormatError, parse_share, parse_shares, lagrange_coefficients,
+                     reconstruct_secret, shares_consistent, find_bad_shares)
+from .key_pool import PaillierKeyPool, PooledKey, shamir_modulus
+
+__all__ = ['PaillierKeyCache', 'CachedPaillierKey', 'ciphertext_width', 'encode_ciphertext', 'decode_ciphertext',
+           'ShareFormatError', 'parse_share', 'parse_shares', 'lagrange_coefficients',
+           'reconstruct_secret', 'shares_consistent', 'find_bad_shares',
+           'PaillierKeyPool', 'PooledKey', 'shamir_modulus']
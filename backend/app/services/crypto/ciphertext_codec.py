@@ -0,0 +1,50 @@
+"""
+Fixed-width binary encoding of Paillier ciphertexts
+"""
+from typing import Optional
+
+
+def ciphertext_width(nsquare: int) -> int:
+    """
+    Number of bytes needed for any ciphertext of a key
+
+    Args:
+        nsquare: n^2 of the Paillier public key
+
+    Returns:
+        Byte length of n^2, the width every ciphertext of the key is stored at
+    """
+    return (nsquare.bit_length() + 7) // 8
+
+
+def encode_ciphertext(ciphertext: int, width: int) -> bytes:
+    """
+    Encode a ciphertext as fixed-width big-endian bytes
+
+    Args:
+        ciphertext: Ciphertext in [0, n^2)
+        width: Width from ``ciphertext_width``
+
+    Returns:
+        The encoded ciphertext
+    """
+    return ciphertext.to_bytes(width, 'big')
+
+
+def decode_ciphertext(binary: Optional[bytes], text: Optional[str]) -> int:
+    """
+    Read a stored ciphertext, preferring the binary column over the decimal one
+
+    Args:
+        binary: Value of the binary column, None for rows written before it existed
+        text: Value of the decimal text column
+
+    Returns:
+        The ciphertext as an integer
+
+    Raises:
+        ValueError: If only the text form is present and it is not an integer
+    """
+    if binary is not None:
+        return int.from_bytes(binary, 'big')
+    return int(text)
@@ -0,0 +1,171 @@
+"""
+Pool of pre-generated Paillier key pairs for election creation
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Deque, NamedTuple, Optional, Tuple
+
+from phe import paillier
+from sympy import nextprime
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _shamir_modulus_for_bits(secret_bits: int) -> int:
+    return int(nextprime(2 ** max(secret_bits + 128, 1024) + 1))
+
+
+def shamir_modulus(secret: int) -> int:
+    """
+    Prime modulus for Shamir-sharing ``secret``: the first prime above
+    2^max(bits + 128, 1024). It depends only on the secret's bit length, so
+    it is computed once per length.
+    """
+    prime = _shamir_modulus_for_bits(secret.bit_length())
+    candidate = 2 ** max(secret.bit_length() + 128, 1024) + 1
+    while prime <= secret:
+        candidate *= 2
+        prime = int(nextprime(candidate))
+    return prime
+
+
+def _generate_entry(key_bits: int) -> Tuple[int, int, int, int]:
+    """
+    Generate (n, p, q, shamir_prime) for one pool entry.
+
+    Runs in the pool's generator process, so it must stay a module-level function.
+    """
+    public_key, private_key = paillier.generate_paillier_keypair(n_length=key_bits)
+    p, q = int(private_key.p), int(private_key.q)
+    return int(public_key.n), p, q, shamir_modulus(p)
+
+
+class PooledKey(NamedTuple):
+    public_key: paillier.PaillierPublicKey
+    private_key: paillier.PaillierPrivateKey
+    shamir_prime: int
+
+
+class PaillierKeyPool:
+    """
+    Fresh Paillier key pairs generated ahead of time in a separate process.
+
+    Entries are held only in this process's memory, never written to the
+    database or disk, and each one is handed out exactly once. ``take``
+    returns None when the pool is empty so the caller generates a key
+    itself; every take wakes the refill thread.
+    """
+    _entries: Deque[Tuple[int, int, int, int]] = deque()
+    _lock = threading.Lock()
+    _wanted = threading.Event()
+    _stop = threading.Event()
+    _thread: Optional[threading.Thread] = None
+    _size = Config.KEY_POOL_SIZE
+    _key_bits = Config.KEY_POOL_KEY_BITS
+
+    @classmethod
+    def take(cls) -> Optional[PooledKey]:
+        """
+        Remove one pre-generated key pair from the pool
+
+        Returns:
+            The key pair and its Shamir modulus, or None if the pool is empty
+        """
+        with cls._lock:
+            entry = cls._entries.popleft() if cls._entries else None
+        cls._wanted.set()
+        if entry is None:
+            return None
+
+        n, p, q, shamir_prime = entry
+        public_key = paillier.PaillierPublicKey(n=n)
+        return PooledKey(public_key, paillier.PaillierPrivateKey(public_key, p, q), shamir_prime)
+
+    @classmethod
+    def available(cls) -> int:
+        with cls._lock:
+            return len(cls._entries)
+
+    @classmethod
+    def fill(cls, executor: Optional[ProcessPoolExecutor] = None) -> int:
+        """
+        Generate key pairs until the pool holds KEY_POOL_SIZE of them
+
+        Args:
+            executor: Process pool to generate in; generates in this thread if None
+
+        Returns:
+            Number of key pairs added
+        """
+        added = 0
+        while cls.available() < cls._size and not cls._stop.is_set():
+            started = time.perf_counter()
+            if executor is not None:
+                entry = executor.submit(_generate_entry, cls._key_bits).result()
+            else:
+                entry = _generate_entry(cls._key_bits)
+            with cls._lock:
+                cls._entries.append(entry)
+            added += 1
+            logger.info(f"Added a {cls._key_bits}-bit Paillier key pair to the pool "
+                        f"in {time.perf_counter() - started:.2f}s ({cls.available()}/{cls._size})")
+        return added
+
+    @classmethod
+    def start(cls, app) -> None:
+        """
+        Keep KEY_POOL_SIZE key pairs ready, refilling from a daemon thread
+
+        Called from start_background_services in the serving process only;
+        a no-op in child processes.
+
+        Args:
+            app: Flask application providing the configuration
+        """
+        size = app.config.get('KEY_POOL_SIZE', 0)
+        if size <= 0 or (cls._thread is not None and cls._thread.is_alive()):
+            return
+        # A spawned generator re-imports the entry point; it must never start a pool of its own
+        if multiprocessing.parent_process() is not None:
+            return
+        cls._size = size
+        cls._key_bits = app.config.get('KEY_POOL_KEY_BITS', cls._key_bits)
+
+        def run():
+            # Spawned so the generator does not inherit the server's sockets and connections
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                while not cls._stop.is_set():
+                    try:
+                        cls.fill(executor)
+                    except Exception as e:
+                        logger.error(f"Paillier key pool refill failed: {e}")
+                        cls._stop.wait(30)
+                    cls._wanted.wait()
+                    cls._wanted.clear()
+
+        cls._stop.clear()
+        cls._wanted.clear()
+        cls._thread = threading.Thread(target=run, name='paillier-key-pool', daemon=True)
+        cls._thread.start()
+        logger.info(f"Paillier key pool started (size={size}, bits={cls._key_bits})")
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Stop refilling and discard the pre-generated keys
+        """
+        cls._stop.set()
+        cls._wanted.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
+        with cls._lock:
+            cls._entries.clear()
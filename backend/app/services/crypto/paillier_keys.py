@@ -0,0 +1,234 @@
+"""
+Process-wide cache of parsed Paillier public keys, keyed by crypto config
+"""
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from phe import paillier
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import Config
+from app.models.crypto_config import CryptoConfig
+from app.services.crypto.ciphertext_codec import ciphertext_width, encode_ciphertext
+
+try:
+    import gmpy2
+except ImportError:  # pragma: no cover - gmpy2 is optional, phe works without it
+    gmpy2 = None
+
+logger = logging.getLogger(__name__)
+
+
+class CachedPaillierKey(NamedTuple):
+    crypto_id: int
+    public_key: paillier.PaillierPublicKey
+    nsquare: int
+    # public_key JSON the entry was parsed from, to detect a changed row
+    raw: Optional[str] = None
+    # gmpy2 versions of n and n^2 for big-integer arithmetic, None without gmpy2
+    n_mpz: Any = None
+    nsquare_mpz: Any = None
+
+    def parse_ciphertext(self, value) -> int:
+        """
+        Parse a ballot ciphertext and check it is a valid element of Z*_{n^2}
+
+        Args:
+            value: Decimal string (or int) as sent by the client
+
+        Returns:
+            The ciphertext as an integer
+
+        Raises:
+            ValueError: If the value is not an integer in [1, n^2) coprime to n
+        """
+        try:
+            ciphertext = int(str(value).strip())
+        except (TypeError, ValueError):
+            raise ValueError('ciphertext is not an integer')
+        if not 1 <= ciphertext < self.nsquare:
+            raise ValueError('ciphertext is outside [1, n^2)')
+        if math.gcd(ciphertext, self.public_key.n) != 1:
+            raise ValueError('ciphertext is not coprime to n')
+        return ciphertext
+
+    def to_bytes(self, ciphertext: int) -> bytes:
+        """
+        Encode a ciphertext of this key at the key's fixed width
+        """
+        return encode_ciphertext(ciphertext, ciphertext_width(self.nsquare))
+
+
+class PaillierKeyCache:
+    """
+    LRU cache of parsed Paillier public keys with a TTL.
+
+    Entries are keyed by ``crypto_id``; ``get`` additionally remembers which
+    config an election uses, reading the same CryptoConfig row as
+    ``tally_election`` so a ballot accepted at cast time is valid for the
+    tally. Entries are dropped when a CryptoConfig row is written in this
+    process (which covers ``update_election_id`` and
+    ``store_election_crypto_data``); the TTL bounds staleness for writes made
+    by other processes.
+    """
+    # crypto_id -> (entry, expires_at)
+    _entries: 'OrderedDict[int, Tuple[CachedPaillierKey, float]]' = OrderedDict()
+    # election_id -> (crypto_id, expires_at)
+    _election_configs: Dict[int, Tuple[int, float]] = {}
+    _lock = threading.Lock()
+    _max_entries = Config.PAILLIER_KEY_CACHE_SIZE
+    _ttl = Config.PAILLIER_KEY_CACHE_TTL
+
+    @staticmethod
+    def _parse(crypto_config: CryptoConfig) -> CachedPaillierKey:
+        try:
+            n = int(json.loads(crypto_config.public_key).get('n'))
+        except (TypeError, ValueError, AttributeError):
+            raise ValueError(f"Crypto config {crypto_config.crypto_id} has no usable Paillier public key")
+        public_key = paillier.PaillierPublicKey(n=n)
+        return CachedPaillierKey(
+            crypto_id=crypto_config.crypto_id,
+            public_key=public_key,
+            nsquare=public_key.nsquare,
+            raw=crypto_config.public_key,
+            n_mpz=gmpy2.mpz(n) if gmpy2 else None,
+            nsquare_mpz=gmpy2.mpz(public_key.nsquare) if gmpy2 else None
+        )
+
+    @classmethod
+    def _store(cls, entry: CachedPaillierKey, now: float) -> None:
+        with cls._lock:
+            cls._entries[entry.crypto_id] = (entry, now + cls._ttl)
+            cls._entries.move_to_end(entry.crypto_id)
+            while len(cls._entries) > cls._max_entries:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def for_config(cls, crypto_config: CryptoConfig) -> CachedPaillierKey:
+        """
+        Get the parsed key of a crypto config row the caller already loaded
+
+        Args:
+            crypto_config: CryptoConfig row holding the public key JSON
+
+        Returns:
+            The cached key, parsed again only if the row's public key changed
+
+        Raises:
+            ValueError: If the row has no usable Paillier public key
+        """
+        now = time.monotonic()
+        with cls._lock:
+            cached = cls._entries.get(crypto_config.crypto_id)
+            if cached and cached[1] > now and cached[0].raw == crypto_config.public_key:
+                cls._entries.move_to_end(crypto_config.crypto_id)
+                return cached[0]
+
+        entry = cls._parse(crypto_config)
+        cls._store(entry, now)
+        return entry
+
+    @classmethod
+    def get_by_crypto_id(cls, crypto_id: int) -> Optional[CachedPaillierKey]:
+        """
+        Get the parsed key of a crypto config, loading it on a miss
+
+        Returns:
+            The cached key, or None if the config is missing or has no usable key
+        """
+        crypto_id = int(crypto_id)
+        now = time.monotonic()
+        with cls._lock:
+            cached = cls._entries.get(crypto_id)
+            if cached and cached[1] > now:
+                cls._entries.move_to_end(crypto_id)
+                return cached[0]
+
+        crypto_config = CryptoConfig.query.get(crypto_id)
+        if not crypto_config:
+            return None
+        try:
+            return cls.for_config(crypto_config)
+        except ValueError as e:
+            logger.warning(str(e))
+            return None
+
+    @classmethod
+    def get(cls, election_id: int) -> Optional[CachedPaillierKey]:
+        """
+        Get the Paillier public key of an election, loading it on a miss
+
+        Args:
+            election_id: ID of the election
+
+        Returns:
+            The cached key, or None if the election has no usable key
+        """
+        election_id = int(election_id)
+        now = time.monotonic()
+        with cls._lock:
+            mapped = cls._election_configs.get(election_id)
+            crypto_id = mapped[0] if mapped and mapped[1] > now else None
+        if crypto_id is not None:
+            entry = cls.get_by_crypto_id(crypto_id)
+            if entry is not None:
+                return entry
+
+        crypto_config = CryptoConfig.query.filter_by(election_id=election_id).first()
+        if not crypto_config:
+            return None
+        try:
+            entry = cls.for_config(crypto_config)
+        except ValueError as e:
+            logger.warning(str(e))
+            return None
+        with cls._lock:
+            cls._election_configs[election_id] = (entry.crypto_id, now + cls._ttl)
+        return entry
+
+    @classmethod
+    def invalidate(cls, crypto_id=None, election_id=None) -> None:
+        """
+        Drop the cached key of a crypto config and/or an election's config mapping
+        """
+        with cls._lock:
+            if crypto_id is not None:
+                cls._entries.pop(int(crypto_id), None)
+            if election_id is not None:
+                cls._election_configs.pop(int(election_id), None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop every cached key
+        """
+        with cls._lock:
+            cls._entries.clear()
+            cls._election_configs.clear()
+
+
+@event.listens_for(CryptoConfig, 'after_insert')
+@event.listens_for(CryptoConfig, 'after_update')
+@event.listens_for(CryptoConfig, 'after_delete')
+def _crypto_config_changed(mapper, connection, target) -> None:
+    PaillierKeyCache.invalidate(crypto_id=target.crypto_id, election_id=target.election_id)
+    # A row moved to another election also invalidates the election it left
+    for previous_election_id in inspect(target).attrs.election_id.history.deleted or ():
+        if previous_election_id is not None:
+            PaillierKeyCache.invalidate(election_id=previous_election_id)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _crypto_config_bulk_changed(orm_execute_state) -> None:
+    # Query.update()/delete() bypass the mapper events above
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_arguments.get('mapper')
+    if mapper is not None and mapper.class_ is CryptoConfig:
+        PaillierKeyCache.clear()
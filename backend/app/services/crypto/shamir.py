@@ -0,0 +1,199 @@
+"""
+Shamir share parsing and reconstruction with cached Lagrange coefficients
+"""
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations, islice
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# (x, y) point of the sharing polynomial
+Share = Tuple[int, int]
+
+
+class ShareFormatError(ValueError):
+    """Raised when a submitted key share cannot be parsed"""
+
+
+def parse_share(value) -> Share:
+    """
+    Parse one key share in any of the formats the clients submit
+
+    Accepted formats are ``"x:hex(y)"`` (as issued at key generation),
+    a JSON ``"[x, y]"`` string, a ``"(x, y)"`` string and a two-item list or tuple.
+
+    Raises:
+        ShareFormatError: If the value matches none of the formats
+    """
+    try:
+        if isinstance(value, (list, tuple)) and len(value) == 2:
+            return int(value[0]), int(value[1])
+        if isinstance(value, str):
+            text = value.strip()
+            if ':' in text:
+                x_str, y_hex = text.split(':', 1)
+                return int(x_str), int(y_hex.strip(), 16)
+            if text.startswith('['):
+                data = json.loads(text)
+                if isinstance(data, list) and len(data) == 2:
+                    return int(data[0]), int(data[1])
+            if text.startswith('(') and text.endswith(')'):
+                parts = [part.strip() for part in text.strip('()').split(',')]
+                if len(parts) == 2:
+                    return int(parts[0]), int(parts[1])
+    except (TypeError, ValueError) as e:
+        raise ShareFormatError(f'Invalid share format in: {value} ({e})')
+    raise ShareFormatError(f'Invalid share format in: {value}')
+
+
+def parse_shares(values: Iterable) -> List[Share]:
+    """
+    Parse a list of submitted key shares, skipping blanks and repeated copies of a share
+
+    Raises:
+        ShareFormatError: If a share cannot be parsed or two shares have the same x with different y
+    """
+    shares = {}
+    for value in values:
+        if value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        x, y = parse_share(value)
+        if x in shares and shares[x] != y:
+            raise ShareFormatError(f'Conflicting shares submitted for index {x}')
+        shares[x] = y
+    return sorted(shares.items())
+
+
+def _batch_invert(values: Sequence[int], modulus: int) -> List[int]:
+    """
+    Invert every value mod ``modulus`` with a single modular inversion (Montgomery's trick)
+    """
+    prefix = [1] * (len(values) + 1)
+    for i, value in enumerate(values):
+        prefix[i + 1] = prefix[i] * value % modulus
+    inverse = pow(prefix[-1], -1, modulus)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        inverses[i] = prefix[i] * inverse % modulus
+        inverse = inverse * values[i] % modulus
+    return inverses
+
+
+@lru_cache(maxsize=Config.SHAMIR_COEFFICIENT_CACHE_SIZE)
+def lagrange_coefficients(xs: Tuple[int, ...], modulus: int, at: int = 0) -> Tuple[int, ...]:
+    """
+    Lagrange basis coefficients of the points ``xs`` evaluated at ``at``
+
+    O(k^2) multiplications and one modular inversion; cached per (x-set, modulus, at)
+    since the same authorities submit the same share indexes every time.
+
+    Raises:
+        ValueError: If the x values are not distinct mod ``modulus``
+    """
+    numerators = []
+    denominators = []
+    for i, xi in enumerate(xs):
+        numerator = denominator = 1
+        for j, xj in enumerate(xs):
+            if i != j:
+                numerator = numerator * (at - xj) % modulus
+                denominator = denominator * (xi - xj) % modulus
+        numerators.append(numerator)
+        denominators.append(denominator)
+    if any(d == 0 for d in denominators):
+        raise ValueError('share indexes must be distinct')
+    return tuple(n * d_inv % modulus for n, d_inv in zip(numerators, _batch_invert(denominators, modulus)))
+
+
+def evaluate(shares: Sequence[Share], modulus: int, at: int = 0) -> int:
+    """
+    Evaluate the polynomial through ``shares`` at ``at`` (0 gives the secret)
+    """
+    shares = sorted(shares)
+    coefficients = lagrange_coefficients(tuple(x for x, _ in shares), modulus, at)
+    return sum(y * c for (_, y), c in zip(shares, coefficients)) % modulus
+
+
+def reconstruct_secret(shares: Sequence[Share], modulus: int) -> int:
+    """
+    Reconstruct the shared secret from parsed shares; same result as ``shamirs.interpolate``
+
+    Raises:
+        ValueError: If no shares are given or their indexes are not distinct
+    """
+    if not shares:
+        raise ValueError('no shares to reconstruct from')
+    return evaluate(shares, modulus, 0)
+
+
+def shares_consistent(shares: Sequence[Share], threshold: int, modulus: int) -> bool:
+    """
+    Check that every share lies on the polynomial through the first ``threshold`` shares
+
+    With at most ``threshold`` shares any set is consistent, so this only says
+    something when extra shares are submitted.
+    """
+    shares = sorted(shares)
+    base, extra = shares[:threshold], shares[threshold:]
+    return all(evaluate(base, modulus, x) == y % modulus for x, y in extra)
+
+
+def _subset_secret(subset: Tuple[Share, ...], modulus: int) -> int:
+    # Module-level so it can run in pool workers
+    return reconstruct_secret(subset, modulus)
+
+
+def find_bad_shares(shares: Sequence[Share], threshold: int, modulus: int,
+                    is_valid_secret: Callable[[int], bool], max_workers: Optional[int] = None,
+                    max_subsets: int = 5000) -> Tuple[Optional[int], List[int]]:
+    """
+    Reconstruct from every ``threshold``-sized subset to identify bad shares
+
+    Subsets are reconstructed in a process pool; ``is_valid_secret`` (for
+    Paillier: the secret is a non-trivial factor of n) runs in this process.
+
+    Args:
+        shares: Parsed shares, more than ``threshold`` of them
+        threshold: Shares needed to reconstruct the secret
+        modulus: Shamir prime modulus
+        is_valid_secret: Predicate telling a correct secret from a wrong one
+        max_workers: Worker processes; defaults to the CPU count
+        max_subsets: Upper bound on the subsets tried
+
+    Returns:
+        The secret from a valid subset (or None if no subset is valid) and
+        the x indexes of shares that appear in no valid subset
+    """
+    shares = sorted(shares)
+    if threshold < 1 or len(shares) <= threshold:
+        return None, []
+    subsets = list(islice(combinations(shares, threshold), max_subsets))
+
+    workers = min(max_workers or os.cpu_count() or 1, len(subsets))
+    if workers > 1 and len(subsets) >= 2 * workers:
+        # Spawned, not forked: requests run next to other threads of the web process, and a
+        # forked child could inherit a lock one of them holds and deadlock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            secrets = list(pool.map(_subset_secret, subsets, [modulus] * len(subsets),
+                                    chunksize=max(1, len(subsets) // (workers * 4))))
+    else:
+        secrets = [_subset_secret(subset, modulus) for subset in subsets]
+
+    secret = None
+    good = set()
+    for subset, candidate in zip(subsets, secrets):
+        if is_valid_secret(candidate):
+            secret = candidate if secret is None else secret
+            good.update(x for x, _ in subset)
+    if secret is None:
+        return None, []
+    bad = [x for x, _ in shares if x not in good]
+    logger.info(f"Checked {len(subsets)} share subsets, bad share indexes: {bad}")
+    return secret, bad
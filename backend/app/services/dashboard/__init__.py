@@ -0,0 +1,4 @@
+from .aggregates import DashboardAggregates
+from .rollups import ActivityRollups
+
+__all__ = ['DashboardAggregates', 'ActivityRollups']
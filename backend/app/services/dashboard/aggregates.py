@@ -0,0 +1,268 @@
+"""
+Admin dashboard sections computed with grouped queries and cached briefly
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import and_, case, exists, func, or_, select
+
+from app import db
+from app.config import Config
+from app.models.audit_log import AuditLog
+from app.models.election import Election
+from app.models.election_result import ElectionResult
+from app.models.voter import Voter
+from app.services.access import EligibleVoterCounts
+from app.services.dashboard.rollups import ActivityRollups
+
+logger = logging.getLogger(__name__)
+
+# Default value of each dashboard section when computing it fails
+_SECTION_FALLBACKS = {
+    'stats': {},
+    'electionActivity': [],
+    'voterEngagement': [],
+    'systemLoad': [],
+    'recentActivity': [],
+    'systemAlerts': [],
+}
+
+
+class DashboardAggregates:
+    """
+    Sections of the admin dashboard, each computed with one or a few
+    grouped queries instead of a COUNT per day, month or time slot.
+
+    Vote and audit log activity is read from the per-minute rollups kept by
+    ActivityRollups, so those charts cost the same however long the history.
+
+    Every section is cached in memory for DASHBOARD_CACHE_TTL seconds, so
+    repeated dashboard refreshes within that window cost no queries.
+    """
+    _cache: Dict[str, Tuple[float, Any]] = {}
+    _lock = threading.Lock()
+    _ttl = Config.DASHBOARD_CACHE_TTL
+
+    @classmethod
+    def _cached(cls, section: str, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with cls._lock:
+            entry = cls._cache.get(section)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        value = compute()
+        with cls._lock:
+            cls._cache[section] = (now + cls._ttl, value)
+        return value
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop every cached section
+        """
+        with cls._lock:
+            cls._cache.clear()
+
+    @staticmethod
+    def _has_results():
+        return exists().where(ElectionResult.election_id == Election.election_id)
+
+    @classmethod
+    def _compute_stats(cls) -> Dict[str, Any]:
+        today = datetime.now().date()
+        has_results = cls._has_results()
+        active, completed, avg_participation = db.session.execute(
+            select(
+                func.coalesce(func.sum(case((Election.date_end > today, 1), else_=0)), 0),
+                func.coalesce(func.sum(case((has_results, 1), else_=0)), 0),
+                # Stored participation rates of completed elections; AVG skips the NULLs
+                func.avg(case((and_(has_results, Election.participation_rate > 0), Election.participation_rate)))
+            )
+        ).one()
+        return {
+            'activeElections': int(active),
+            'registeredVoters': EligibleVoterCounts.count(),
+            'completedElections': int(completed),
+            'averageParticipation': round(float(avg_participation), 1) if avg_participation else 0
+        }
+
+    @staticmethod
+    def _compute_election_activity() -> List[Dict[str, Any]]:
+        now = datetime.now()
+        days = [(now - timedelta(days=6 - i)) for i in range(7)]
+        first_day = days[0].date()
+
+        # Elections that can count on one of the days, grouped by their date range
+        ranges = db.session.execute(
+            select(Election.date_start, Election.date_end, func.count())
+            .where(or_(Election.date_end >= first_day, Election.date_start > first_day))
+            .group_by(Election.date_start, Election.date_end)
+        ).all()
+
+        result = []
+        for day in days:
+            d = day.date()
+            result.append({
+                'name': day.strftime('%a'),
+                'ongoing': sum(n for start, end, n in ranges if start <= d <= end),
+                'completed': sum(n for start, end, n in ranges if end == d),
+                'scheduled': sum(n for start, end, n in ranges if start > d)
+            })
+        return result
+
+    @staticmethod
+    def _compute_voter_engagement() -> List[Dict[str, Any]]:
+        now = datetime.now()
+        months = []
+        for i in range(4, -1, -1):  # Oldest to newest
+            month, year = now.month - i, now.year
+            while month <= 0:
+                month += 12
+                year -= 1
+            months.append((year, month))
+        active = ActivityRollups.distinct_voters_by_month(months)
+        return [
+            {'name': datetime(year, month, 1).strftime('%b'), 'active': active.get((year, month), 0)}
+            for year, month in months
+        ]
+
+    @staticmethod
+    def _compute_system_load() -> List[Dict[str, Any]]:
+        now = datetime.now()
+        start = now - timedelta(hours=24)
+        slots = [start + timedelta(hours=i) for i in range(0, 24, 4)]
+
+        # Votes and audit log entries of the last 24 hours in the six 4-hour slots
+        traffic_by_slot = ActivityRollups.counts_by_slot(slots, timedelta(hours=4))
+
+        result = []
+        for slot_start, traffic in zip(slots, traffic_by_slot):
+            # If no activity, show minimal baseline traffic
+            if traffic == 0:
+                traffic = 1 if 8 <= slot_start.hour <= 20 else 0
+            result.append({'name': slot_start.strftime('%H:%M'), 'traffic': traffic})
+        return result
+
+    @staticmethod
+    def _compute_recent_activity() -> List[Dict[str, Any]]:
+        rows = db.session.execute(
+            select(AuditLog.log_id, AuditLog.action, AuditLog.student_id, AuditLog.log_time,
+                   Voter.student_id.label('voter_id'), Election.election_name)
+            .outerjoin(Voter, Voter.student_id == AuditLog.student_id)
+            .outerjoin(Election, Election.election_id == AuditLog.election_id)
+            .order_by(AuditLog.log_time.desc())
+            .limit(50)
+        ).all()
+
+        result = []
+        for row in rows:
+            user_info = "System (automated)"
+            if row.voter_id:
+                user_info = f"Voter ({row.voter_id})"
+            elif row.student_id:
+                user_info = f"User ({row.student_id})"
+            action_text = row.action
+            if row.election_name:
+                action_text += f" for {row.election_name}"
+            result.append({
+                'id': row.log_id,
+                'action': action_text,
+                'user': user_info,
+                'timestamp': row.log_time.strftime("%m/%d/%Y, %H:%M") if row.log_time else "Unknown"
+            })
+        return result
+
+    @classmethod
+    def _compute_alerts(cls) -> List[Dict[str, Any]]:
+        now = datetime.now()
+        today = now.date()
+        timestamp = now.strftime("%m/%d/%Y, %H:%M")
+        result = []
+
+        def alert(message: str, level: str) -> None:
+            result.append({'id': len(result) + 1, 'message': message, 'level': level, 'timestamp': timestamp})
+
+        # Elections whose end date falls within the next 24 hours
+        ending_soon = db.session.execute(
+            select(Election.election_name, Election.date_end)
+            .where(Election.date_end > today, Election.date_end <= (now + timedelta(hours=24)).date())
+            .order_by(Election.date_end)
+        ).all()
+        for name, date_end in ending_soon:
+            hours_left = (datetime.combine(date_end, datetime.min.time()) - now).total_seconds() / 3600
+            alert(f'Election "{name}" ends in {int(hours_left)} hours', 'warning')
+
+        # Elections that ended within the last 7 days without results
+        pending = db.session.execute(
+            select(Election.election_name)
+            .where(Election.date_end <= today,
+                   Election.date_end >= (now - timedelta(days=7)).date() + timedelta(days=1),
+                   ~cls._has_results())
+            .order_by(Election.date_end)
+        ).scalars().all()
+        for name in pending:
+            alert(f'Results pending for completed election "{name}"', 'info')
+
+        # High system activity (more than 100 votes in the last hour)
+        recent_votes = ActivityRollups.count_since(now - timedelta(hours=1))
+        if recent_votes > 100:
+            alert(f'High voting activity detected ({recent_votes} votes in last hour)', 'info')
+
+        result = result[:10]
+        if not result:
+            alert('All systems operating normally', 'info')
+        return result
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return cls._cached('stats', cls._compute_stats)
+
+    @classmethod
+    def election_activity(cls) -> List[Dict[str, Any]]:
+        return cls._cached('electionActivity', cls._compute_election_activity)
+
+    @classmethod
+    def voter_engagement(cls) -> List[Dict[str, Any]]:
+        return cls._cached('voterEngagement', cls._compute_voter_engagement)
+
+    @classmethod
+    def system_load(cls) -> List[Dict[str, Any]]:
+        return cls._cached('systemLoad', cls._compute_system_load)
+
+    @classmethod
+    def recent_activity(cls) -> List[Dict[str, Any]]:
+        return cls._cached('recentActivity', cls._compute_recent_activity)
+
+    @classmethod
+    def alerts(cls) -> List[Dict[str, Any]]:
+        return cls._cached('systemAlerts', cls._compute_alerts)
+
+    @classmethod
+    def dashboard(cls) -> Dict[str, Any]:
+        """
+        Every dashboard section; a section that fails is logged and left empty
+
+        Returns:
+            Dictionary keyed by the dashboard's section names
+        """
+        sections = {
+            'stats': cls.stats,
+            'electionActivity': cls.election_activity,
+            'voterEngagement': cls.voter_engagement,
+            'systemLoad': cls.system_load,
+            'recentActivity': cls.recent_activity,
+            'systemAlerts': cls.alerts,
+        }
+        data = {}
+        for name, section in sections.items():
+            try:
+                data[name] = section()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error computing dashboard section {name}: {e}")
+                data[name] = _SECTION_FALLBACKS[name]
+        return data
@@ -0,0 +1,326 @@
+"""
+Per-minute/hour/day rollups of vote and audit log activity
+"""
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, func, insert, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.config import Config
+from app.models.activity_rollup import ActivityRollup
+from app.models.activity_rollup_state import ActivityRollupState
+from app.models.audit_log import AuditLog
+from app.models.vote import Vote
+
+logger = logging.getLogger(__name__)
+
+# Action recorded for rows of the votes table
+VOTE_ACTION = 'vote_cast'
+# Monthly distinct voters across all elections
+MONTHLY_VOTERS = ('month', 'vote', 'distinct_voters', 0)
+
+
+def _truncate(at: datetime, granularity: str) -> datetime:
+    if granularity == 'minute':
+        return at.replace(second=0, microsecond=0)
+    if granularity == 'hour':
+        return at.replace(minute=0, second=0, microsecond=0)
+    if granularity == 'day':
+        return at.replace(hour=0, minute=0, second=0, microsecond=0)
+    return at.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(year: int, month: int) -> datetime:
+    return datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+
+
+class ActivityRollups:
+    """
+    Counts of votes and audit log entries per minute, hour and day, per
+    election and action, kept in ``activity_rollups`` so chart queries read
+    a number of buckets instead of scanning ``votes`` and ``audit_logs``.
+
+    A compactor folds rows in by primary key: ``activity_rollup_state``
+    holds the highest id counted per source, and every run adds the rows
+    after it, in id order, once they are ACTIVITY_ROLLUP_SETTLE_SECONDS old
+    (so a slower transaction's lower id is not skipped). Readers add the
+    rows past the watermark, so counts are exact without waiting for the
+    compactor. Minute buckets older than ACTIVITY_ROLLUP_MINUTE_RETENTION_HOURS
+    are removed; hour and day buckets are kept.
+
+    Rows removed from votes or audit_logs afterwards stay counted, as the
+    charts show activity as it happened.
+    """
+    GRANULARITIES = ('minute', 'hour', 'day')
+    _stop = threading.Event()
+    _thread = None
+
+    @staticmethod
+    def _columns(source: str):
+        if source == 'vote':
+            return Vote.vote_id, Vote.cast_time, Vote.election_id, literal(VOTE_ACTION)
+        return AuditLog.log_id, AuditLog.log_time, AuditLog.election_id, AuditLog.action
+
+    @staticmethod
+    def _watermark(source: str):
+        return func.coalesce(
+            select(ActivityRollupState.last_id).where(ActivityRollupState.source == source).scalar_subquery(), 0
+        )
+
+    @staticmethod
+    def _add(counts: Dict[Tuple, int]) -> None:
+        table = ActivityRollup.__table__
+        for (granularity, bucket_start, election_id, source, action), n in counts.items():
+            key = and_(table.c.granularity == granularity, table.c.bucket_start == bucket_start,
+                       table.c.election_id == election_id, table.c.source == source, table.c.action == action)
+            updated = db.session.execute(update(table).where(key).values(count=table.c.count + n)).rowcount
+            if not updated:
+                db.session.execute(insert(table).values(granularity=granularity, bucket_start=bucket_start,
+                                                        election_id=election_id, source=source,
+                                                        action=action, count=n))
+
+    @staticmethod
+    def _refresh_monthly_voters(months: Iterable[Tuple[int, int]]) -> None:
+        table = ActivityRollup.__table__
+        granularity, source, action, election_id = MONTHLY_VOTERS
+        for year, month in months:
+            start = datetime(year, month, 1)
+            voters = db.session.execute(
+                select(func.count(func.distinct(Vote.student_id)))
+                .where(Vote.cast_time >= start, Vote.cast_time < _next_month(year, month))
+            ).scalar()
+            key = and_(table.c.granularity == granularity, table.c.bucket_start == start,
+                       table.c.election_id == election_id, table.c.source == source, table.c.action == action)
+            if not db.session.execute(update(table).where(key).values(count=voters)).rowcount:
+                db.session.execute(insert(table).values(granularity=granularity, bucket_start=start,
+                                                        election_id=election_id, source=source,
+                                                        action=action, count=voters))
+
+    @classmethod
+    def compact_source(cls, source: str, batch_size: int, settle_seconds: float = 0) -> int:
+        """
+        Fold the next batch of one source's rows into the rollups
+
+        Args:
+            source: 'vote' or 'audit'
+            batch_size: Most rows folded in this call
+            settle_seconds: Only fold rows at least this old
+
+        Returns:
+            Number of rows folded in
+        """
+        # Locking the state row serialises compactors in different processes
+        state = (
+            ActivityRollupState.query
+            .filter_by(source=source)
+            .with_for_update()
+            .first()
+        )
+        if state is None:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(ActivityRollupState(source=source, last_id=0))
+            except IntegrityError:
+                # Another compactor created it first
+                pass
+            state = ActivityRollupState.query.filter_by(source=source).with_for_update().one()
+
+        id_col, time_col, election_col, action_col = cls._columns(source)
+        rows = db.session.execute(
+            select(id_col, time_col, election_col, action_col)
+            .where(id_col > state.last_id)
+            .order_by(id_col)
+            .limit(batch_size)
+        ).all()
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settle_seconds)
+        counts = Counter()
+        months = set()
+        folded = 0
+        for row_id, at, election_id, action in rows:
+            if at is not None and at >= cutoff:
+                # Keep id order: later rows wait for this one
+                break
+            folded += 1
+            state.last_id = row_id
+            if at is None:
+                continue
+            for granularity in cls.GRANULARITIES:
+                counts[(granularity, _truncate(at, granularity), election_id, source, (action or '')[:100])] += 1
+            months.add((at.year, at.month))
+
+        if folded:
+            cls._add(counts)
+            if source == 'vote':
+                cls._refresh_monthly_voters(sorted(months))
+        db.session.commit()
+        return folded
+
+    @classmethod
+    def prune(cls, minute_retention_hours: float) -> int:
+        """
+        Remove minute buckets older than the retention period
+
+        Returns:
+            Number of rows removed
+        """
+        table = ActivityRollup.__table__
+        cutoff = datetime.utcnow() - timedelta(hours=minute_retention_hours)
+        removed = db.session.execute(
+            table.delete().where(table.c.granularity == 'minute', table.c.bucket_start < cutoff)
+        ).rowcount
+        db.session.commit()
+        return removed
+
+    @classmethod
+    def compact(cls, batch_size: int = Config.ACTIVITY_ROLLUP_BATCH,
+                settle_seconds: float = Config.ACTIVITY_ROLLUP_SETTLE_SECONDS) -> Dict[str, int]:
+        """
+        Fold every settled row of both sources into the rollups
+
+        Returns:
+            Rows folded in per source
+        """
+        folded = {}
+        for source in ('vote', 'audit'):
+            total = 0
+            while True:
+                n = cls.compact_source(source, batch_size, settle_seconds)
+                total += n
+                if n < batch_size:
+                    break
+            folded[source] = total
+        return folded
+
+    @classmethod
+    def start(cls, app) -> None:
+        """
+        Run compact and prune in a daemon thread every ACTIVITY_ROLLUP_INTERVAL seconds
+
+        Started by run_job_worker.py, never by create_app(), so web processes
+        and scripts do not each compete for the state rows.
+
+        Args:
+            app: Flask application providing the database context
+        """
+        interval = app.config.get('ACTIVITY_ROLLUP_INTERVAL', 0)
+        if interval <= 0 or (cls._thread is not None and cls._thread.is_alive()):
+            return
+
+        def run():
+            while not cls._stop.wait(interval):
+                with app.app_context():
+                    try:
+                        folded = cls.compact(app.config.get('ACTIVITY_ROLLUP_BATCH', Config.ACTIVITY_ROLLUP_BATCH),
+                                             app.config.get('ACTIVITY_ROLLUP_SETTLE_SECONDS',
+                                                            Config.ACTIVITY_ROLLUP_SETTLE_SECONDS))
+                        cls.prune(app.config.get('ACTIVITY_ROLLUP_MINUTE_RETENTION_HOURS',
+                                                 Config.ACTIVITY_ROLLUP_MINUTE_RETENTION_HOURS))
+                        if any(folded.values()):
+                            logger.debug(f"Activity rollups compacted: {folded}")
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.error(f"Activity rollup compaction failed: {e}")
+                    finally:
+                        db.session.remove()
+
+        cls._stop.clear()
+        cls._thread = threading.Thread(target=run, name='activity-rollups', daemon=True)
+        cls._thread.start()
+        logger.info(f"Activity rollup compactor started (interval={interval}s)")
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Stop the compactor thread
+        """
+        cls._stop.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
+
+    @classmethod
+    def _activity(cls, start: datetime, end: Optional[datetime], sources: Sequence[str]):
+        # (at, n) rows: minute buckets in [start, end) plus the rows not yet folded in
+        parts = []
+        for source in sources:
+            id_col, time_col, _, _ = cls._columns(source)
+            rollup_filters = [ActivityRollup.granularity == 'minute', ActivityRollup.source == source,
+                              ActivityRollup.bucket_start >= _truncate(start, 'minute')]
+            tail_filters = [id_col > cls._watermark(source), time_col >= start]
+            if end is not None:
+                rollup_filters.append(ActivityRollup.bucket_start < end)
+                tail_filters.append(time_col < end)
+            parts.append(select(ActivityRollup.bucket_start.label('at'), ActivityRollup.count.label('n'))
+                         .where(*rollup_filters))
+            parts.append(select(time_col.label('at'), literal(1).label('n')).where(*tail_filters))
+        return union_all(*parts).subquery()
+
+    @classmethod
+    def counts_by_slot(cls, slot_starts: Sequence[datetime], slot_length: timedelta,
+                       sources: Sequence[str] = ('vote', 'audit')) -> List[int]:
+        """
+        Activity in consecutive time slots, at minute resolution
+
+        Args:
+            slot_starts: Start of each slot, ascending
+            slot_length: Length of every slot
+            sources: 'vote' and/or 'audit'
+
+        Returns:
+            Count per slot
+        """
+        activity = cls._activity(slot_starts[0], slot_starts[-1] + slot_length, sources)
+        slot = case(
+            *[(activity.c.at < slot_start + slot_length, i) for i, slot_start in enumerate(slot_starts)],
+            else_=len(slot_starts) - 1
+        )
+        by_slot = dict(db.session.execute(select(slot, func.sum(activity.c.n)).group_by(slot)).all())
+        return [int(by_slot.get(i) or 0) for i in range(len(slot_starts))]
+
+    @classmethod
+    def count_since(cls, since: datetime, sources: Sequence[str] = ('vote',)) -> int:
+        """
+        Activity from ``since`` until now, at minute resolution
+        """
+        activity = cls._activity(since, None, sources)
+        return int(db.session.execute(select(func.coalesce(func.sum(activity.c.n), 0))).scalar())
+
+    @classmethod
+    def distinct_voters_by_month(cls, months: Sequence[Tuple[int, int]]) -> Dict[Tuple[int, int], int]:
+        """
+        Distinct voters per (year, month)
+
+        Months with a rollup row read it; a month the compactor has not seen
+        yet is counted from the votes table.
+        """
+        granularity, source, action, election_id = MONTHLY_VOTERS
+        starts = [datetime(year, month, 1) for year, month in months]
+        counts = {
+            (bucket_start.year, bucket_start.month): count
+            for bucket_start, count in db.session.execute(
+                select(ActivityRollup.bucket_start, ActivityRollup.count)
+                .where(ActivityRollup.granularity == granularity, ActivityRollup.source == source,
+                       ActivityRollup.action == action, ActivityRollup.election_id == election_id,
+                       ActivityRollup.bucket_start.in_(starts))
+            )
+        }
+        missing = [m for m in months if m not in counts]
+        if missing:
+            month_start = datetime(*missing[0], 1)
+            month_end = _next_month(*missing[-1])
+            year_bucket = func.extract('year', Vote.cast_time)
+            month_bucket = func.extract('month', Vote.cast_time)
+            for year, month, voters in db.session.execute(
+                select(year_bucket, month_bucket, func.count(func.distinct(Vote.student_id)))
+                .where(Vote.cast_time >= month_start, Vote.cast_time < month_end)
+                .group_by(year_bucket, month_bucket)
+            ):
+                if (int(year), int(month)) in missing:
+                    counts[(int(year), int(month))] = voters
+        return {m: counts.get(m, 0) for m in months}
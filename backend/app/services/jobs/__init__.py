@@ -0,0 +1,5 @@
+from .job_queue import JobQueue, JobError
+from . import handlers  # noqa: F401 - registers the job types
+from .worker import JobWorkerPool, run_worker
+
+__all__ = ['JobQueue', 'JobError', 'JobWorkerPool', 'run_worker']
@@ -0,0 +1,65 @@
+"""
+Job types backed by the existing controller actions
+"""
+from typing import Any, Callable, Dict
+
+from flask import current_app
+
+from app.services.jobs.job_queue import JobError, JobQueue
+
+
+def _call_view(view: Callable, params: Dict[str, Any], *args) -> Any:
+    """
+    Run a controller action as if it had received ``params`` as its JSON body
+
+    Raises:
+        JobError: If the action responded with an error status
+    """
+    with current_app.test_request_context(json=params):
+        response = view(*args)
+    if isinstance(response, tuple):
+        response, status = response[0], response[1]
+    else:
+        status = response.status_code
+    body = response.get_json(silent=True)
+    if status >= 400:
+        message = body.get('error') if isinstance(body, dict) else None
+        raise JobError(message or f"Request failed with status {status}")
+    return body
+
+
+@JobQueue.register('generate_key_pair', sensitive_result=True)
+def generate_key_pair(params: Dict[str, Any]) -> Any:
+    from app.controllers.crypto_config_controller import CryptoConfigController
+    return _call_view(CryptoConfigController.generate_key_pair_in_memory, params)
+
+
+@JobQueue.register('tally_election')
+def tally_election(params: Dict[str, Any]) -> Any:
+    from app.controllers.election_results_controller import ElectionResultsController
+    return _call_view(ElectionResultsController.tally_election, params)
+
+
+@JobQueue.register('decrypt_tally', sensitive_params=True)
+def decrypt_tally(params: Dict[str, Any]) -> Any:
+    from app.controllers.election_results_controller import ElectionResultsController
+    return _call_view(ElectionResultsController.decrypt_tally, params)
+
+
+@JobQueue.register('pdf_data')
+def pdf_data(params: Dict[str, Any]) -> Any:
+    from app.controllers.election_results_controller import ElectionResultsController
+    election_id = params.get('election_id')
+    if not election_id:
+        raise JobError('Missing election_id')
+    return _call_view(ElectionResultsController.get_pdf_data, params, int(election_id))
+
+
+@JobQueue.register('results_export')
+def results_export(params: Dict[str, Any]) -> Any:
+    from app.services.results import ResultsExporter
+    election_ids = params.get('election_ids') or ([params['election_id']] if params.get('election_id') else [])
+    try:
+        return ResultsExporter.export(election_ids, params.get('format', 'csv'))
+    except ValueError as e:
+        raise JobError(str(e))
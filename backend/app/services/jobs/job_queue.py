@@ -0,0 +1,278 @@
+"""
+Persistent queue of background jobs for long-running crypto operations
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import update
+
+from app import db
+from app.models.background_job import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Job being executed by this worker thread, for report_progress
+_current = threading.local()
+
+
+class JobError(Exception):
+    """Raised by a job handler to fail its job with a message"""
+
+
+class JobQueue:
+    """
+    Jobs live in the ``background_jobs`` table: a request enqueues one and
+    returns its id, a worker claims it with ``FOR UPDATE SKIP LOCKED`` and
+    records progress, timings and the result for status polling.
+
+    Handlers are registered per job type with ``register``. A handler gets the
+    job parameters, runs inside the worker's app context and returns a
+    JSON-serialisable result; raising fails the job. Handlers and anything
+    they call may report progress with ``JobQueue.report_progress``, which is
+    a no-op outside a job.
+
+    Jobs registered with ``sensitive_params`` (key material) are never
+    written to the table with their parameters: the enqueuing process runs
+    them itself in a thread, handing the parameters over in memory, and
+    the row only tracks status and progress.
+    """
+    # job_type -> (handler, sensitive_params, sensitive_result)
+    _handlers: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], bool, bool]] = {}
+
+    @classmethod
+    def register(cls, job_type: str, sensitive_params: bool = False, sensitive_result: bool = False):
+        """
+        Decorator registering the handler of a job type
+
+        Args:
+            job_type: Name clients use to enqueue the job
+            sensitive_params: Keep the parameters out of the database; the job runs in the enqueuing process
+            sensitive_result: Clear the result once it has been read
+        """
+        def decorator(handler):
+            cls._handlers[job_type] = (handler, sensitive_params, sensitive_result)
+            return handler
+        return decorator
+
+    @classmethod
+    def job_types(cls):
+        return sorted(cls._handlers)
+
+    @classmethod
+    def enqueue(cls, job_type: str, params: Optional[Dict[str, Any]] = None,
+                election_id: Optional[int] = None) -> BackgroundJob:
+        """
+        Add a job to the queue
+
+        Returns:
+            The committed BackgroundJob row
+
+        Raises:
+            ValueError: If the job type is unknown
+        """
+        if job_type not in cls._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        sensitive_params = cls._handlers[job_type][1]
+        job = BackgroundJob(
+            job_type=job_type,
+            status='queued',
+            election_id=election_id,
+            params=None if sensitive_params else json.dumps(params or {}),
+            progress=0.0
+        )
+        if sensitive_params:
+            # Claimed by this process up front, so no worker picks up a job without its parameters
+            now = datetime.utcnow()
+            job.status = 'running'
+            job.worker_id = f"{socket.gethostname()}:{os.getpid()}:local"
+            job.started_at = now
+            job.heartbeat_at = now
+        db.session.add(job)
+        db.session.commit()
+        logger.info(f"Queued job {job.job_id} ({job_type})")
+        if sensitive_params:
+            cls._run_local(job.job_id, job_type, dict(params or {}), job.worker_id)
+        return job
+
+    @classmethod
+    def status(cls, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Status, progress, timings and result of a job
+
+        The result of a job with a sensitive result is returned once and then cleared.
+
+        Returns:
+            Job dictionary, or None if the job does not exist
+        """
+        job = db.session.get(BackgroundJob, job_id)
+        if not job:
+            return None
+        data = job.to_dict()
+        sensitive_result = cls._handlers.get(job.job_type, (None, False, False))[2]
+        if sensitive_result and job.status == 'succeeded' and job.result is not None:
+            job.result = None
+            db.session.commit()
+        return data
+
+    @classmethod
+    def claim_next(cls, worker_id: str) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Mark the oldest queued job as running for this worker
+
+        Returns:
+            (job_id, job_type, params) of the claimed job, or None if the queue is empty
+        """
+        job = (
+            BackgroundJob.query
+            .filter(BackgroundJob.status == 'queued')
+            .order_by(BackgroundJob.created_at, BackgroundJob.job_id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if not job:
+            db.session.rollback()
+            return None
+
+        now = datetime.utcnow()
+        params = json.loads(job.params) if job.params else {}
+        job.status = 'running'
+        job.worker_id = worker_id
+        job.started_at = now
+        job.heartbeat_at = now
+        # Sensitive jobs queued before they ran in the enqueuing process
+        if cls._handlers.get(job.job_type, (None, False, False))[1]:
+            job.params = None
+        db.session.commit()
+        return job.job_id, job.job_type, params
+
+    @staticmethod
+    def _update(engine, job_id: int, **values) -> None:
+        # Own transaction, so pollers see it while the handler's session is still open
+        with engine.begin() as conn:
+            conn.execute(
+                update(BackgroundJob.__table__)
+                .where(BackgroundJob.__table__.c.job_id == job_id)
+                .values(**values)
+            )
+
+    @classmethod
+    def report_progress(cls, fraction: float, message: str) -> None:
+        """
+        Record the progress of the job running in this thread and the time its last step took
+
+        Args:
+            fraction: Completed share of the job, 0 to 1
+            message: Step just completed
+        """
+        current = getattr(_current, 'job', None)
+        if current is None:
+            return
+        now = time.perf_counter()
+        current['steps'].append([message, round(now - current['last_step'], 4)])
+        current['last_step'] = now
+        cls._update(
+            current['engine'], current['job_id'],
+            progress=min(max(float(fraction), 0.0), 1.0),
+            progress_message=message[:255],
+            timings=json.dumps(current['steps']),
+            heartbeat_at=datetime.utcnow()
+        )
+
+    @classmethod
+    def _run_local(cls, job_id: int, job_type: str, params: Dict[str, Any], worker_id: str) -> threading.Thread:
+        # Runs a job in a thread of this process; its parameters never leave memory
+        app = current_app._get_current_object()
+        heartbeat_interval = app.config.get('JOB_HEARTBEAT_INTERVAL', 0)
+
+        def run():
+            with app.app_context():
+                try:
+                    cls._execute(job_id, job_type, params, worker_id, heartbeat_interval)
+                finally:
+                    db.session.remove()
+
+        thread = threading.Thread(target=run, name=f'job-{job_id}', daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def run_next(cls, worker_id: str, heartbeat_interval: float = 0) -> bool:
+        """
+        Claim and execute one job
+
+        Args:
+            worker_id: Identifier recorded on the job
+            heartbeat_interval: Seconds between heartbeats while the job runs, 0 for none
+
+        Returns:
+            True if a job was executed, False if the queue was empty
+        """
+        claimed = cls.claim_next(worker_id)
+        if claimed is None:
+            return False
+        cls._execute(*claimed, worker_id, heartbeat_interval)
+        return True
+
+    @classmethod
+    def _execute(cls, job_id: int, job_type: str, params: Dict[str, Any], worker_id: str,
+                 heartbeat_interval: float) -> None:
+        engine = db.engine
+        logger.info(f"Worker {worker_id} running job {job_id} ({job_type})")
+
+        stop_heartbeat = threading.Event()
+        if heartbeat_interval > 0:
+            def heartbeat():
+                while not stop_heartbeat.wait(heartbeat_interval):
+                    try:
+                        cls._update(engine, job_id, heartbeat_at=datetime.utcnow())
+                    except Exception as e:
+                        logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+            threading.Thread(target=heartbeat, name=f'job-{job_id}-heartbeat', daemon=True).start()
+
+        _current.job = {'engine': engine, 'job_id': job_id, 'steps': [], 'last_step': time.perf_counter()}
+        try:
+            handler = cls._handlers.get(job_type, (None,))[0]
+            if handler is None:
+                raise JobError(f"Unknown job type: {job_type}")
+            result = handler(params)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Job {job_id} ({job_type}) failed: {e}\n{traceback.format_exc()}")
+            cls._update(engine, job_id, status='failed', error=str(e) or e.__class__.__name__,
+                        timings=json.dumps(_current.job['steps']), finished_at=datetime.utcnow())
+        else:
+            cls._update(engine, job_id, status='succeeded', result=json.dumps(result), progress=1.0,
+                        timings=json.dumps(_current.job['steps']), finished_at=datetime.utcnow())
+            logger.info(f"Job {job_id} ({job_type}) succeeded")
+        finally:
+            stop_heartbeat.set()
+            _current.job = None
+
+    @classmethod
+    def fail_stale(cls, stale_after: float) -> int:
+        """
+        Fail running jobs whose worker stopped sending heartbeats
+
+        Returns:
+            Number of jobs marked failed
+        """
+        now = datetime.utcnow()
+        count = (
+            BackgroundJob.query
+            .filter(BackgroundJob.status == 'running',
+                    BackgroundJob.heartbeat_at < now - timedelta(seconds=stale_after))
+            .update({'status': 'failed', 'error': 'Worker stopped responding', 'finished_at': now},
+                    synchronize_session=False)
+        )
+        db.session.commit()
+        if count:
+            logger.warning(f"Marked {count} stale jobs as failed")
+        return count
@@ -0,0 +1,125 @@
+"""
+Worker processes executing background jobs
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from typing import List, Optional
+
+from app.config import Config
+from app.services.jobs.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(stop_event=None, poll_interval: float = Config.JOB_POLL_INTERVAL,
+               heartbeat_interval: float = Config.JOB_HEARTBEAT_INTERVAL,
+               stale_after: float = Config.JOB_STALE_AFTER) -> None:
+    """
+    Execute queued jobs until ``stop_event`` is set or the parent process exits
+
+    Entry point of the pool processes; also usable directly to run a worker
+    outside the web server (see run_job_worker.py).
+    """
+    from app import create_app, db
+
+    app = create_app()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    parent = multiprocessing.parent_process()
+    logger.info(f"Job worker {worker_id} started")
+
+    last_stale_check = 0.0
+    with app.app_context():
+        while not (stop_event is not None and stop_event.is_set()):
+            if parent is not None and not parent.is_alive():
+                break
+            ran = False
+            try:
+                if time.monotonic() - last_stale_check > stale_after / 2:
+                    JobQueue.fail_stale(stale_after)
+                    last_stale_check = time.monotonic()
+                ran = JobQueue.run_next(worker_id, heartbeat_interval)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Job worker {worker_id} failed to run a job: {e}")
+            finally:
+                db.session.remove()
+            if not ran:
+                if stop_event is not None:
+                    stop_event.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+    logger.info(f"Job worker {worker_id} stopped")
+
+
+class JobWorkerPool:
+    """
+    Pool of worker processes, started by run_job_worker.py or, when
+    JOB_WORKER_PROCESSES is set, next to the web server by
+    start_background_services. create_app() never starts it.
+
+    Processes are spawned rather than forked so they do not inherit the
+    server's database connections, and are not daemonic so jobs can use the
+    tally engine's own process pool.
+    """
+    _processes: List[multiprocessing.Process] = []
+    _stop_event = None
+
+    @classmethod
+    def start(cls, app=None, processes: Optional[int] = None) -> None:
+        """
+        Start JOB_WORKER_PROCESSES worker processes
+
+        Args:
+            app: Flask application providing the configuration, or None to use Config
+            processes: Override of JOB_WORKER_PROCESSES
+        """
+        config = app.config if app is not None else {}
+
+        def setting(name):
+            return config.get(name, getattr(Config, name))
+
+        count = processes if processes is not None else setting('JOB_WORKER_PROCESSES')
+        # Workers create the app themselves; never let them start workers of their own
+        if count <= 0 or cls._processes or multiprocessing.parent_process() is not None:
+            return
+
+        context = multiprocessing.get_context('spawn')
+        cls._stop_event = context.Event()
+        for number in range(count):
+            process = context.Process(
+                target=run_worker,
+                args=(cls._stop_event, setting('JOB_POLL_INTERVAL'), setting('JOB_HEARTBEAT_INTERVAL'),
+                      setting('JOB_STALE_AFTER')),
+                name=f'job-worker-{number}'
+            )
+            process.start()
+            cls._processes.append(process)
+        atexit.register(cls.stop)
+        logger.info(f"Started {count} job worker processes")
+
+    @classmethod
+    def join(cls) -> None:
+        """
+        Wait for the worker processes to exit
+        """
+        for process in cls._processes:
+            process.join()
+
+    @classmethod
+    def stop(cls, timeout: float = 10) -> None:
+        """
+        Ask the workers to stop after their current job, terminating any still running after ``timeout``
+        """
+        if cls._stop_event is not None:
+            cls._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in cls._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        cls._processes = []
+        cls._stop_event = None
@@ -0,0 +1,5 @@
+from .read_model import ElectionResultsReadModel
+from .snapshot import ResultsSnapshotService
+from .export import ResultsExporter
+
+__all__ = ['ElectionResultsReadModel', 'ResultsSnapshotService', 'ResultsExporter']
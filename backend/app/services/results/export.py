@@ -0,0 +1,261 @@
+"""
+CSV and PDF exports of election results, cached on disk by snapshot hash
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import pydyf
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.config import Config
+from app.models.results_snapshot import ResultsSnapshot
+from app.services.jobs import JobQueue
+from app.services.results.snapshot import ResultsSnapshotService
+
+logger = logging.getLogger(__name__)
+
+CSV_HEADER = ['election_id', 'election_name', 'organization', 'position', 'rank', 'candidate', 'party',
+              'votes', 'percentage', 'winner']
+
+
+class _PdfPages:
+    """
+    A4 pages of plain text in the standard Helvetica fonts.
+
+    Each page's content is compressed as soon as the next page starts, so
+    memory grows with the compressed document rather than the text drawn.
+    """
+    WIDTH, HEIGHT, MARGIN = 595, 842, 50
+
+    def __init__(self):
+        self.pdf = pydyf.PDF()
+        fonts = {}
+        for name, base_font in (('F1', '/Helvetica'), ('F2', '/Helvetica-Bold')):
+            font = pydyf.Dictionary({
+                'Type': '/Font',
+                'Subtype': '/Type1',
+                'BaseFont': base_font,
+                'Encoding': '/WinAnsiEncoding'
+            })
+            self.pdf.add_object(font)
+            fonts[name] = font.reference
+        self.resources = pydyf.Dictionary({'Font': pydyf.Dictionary(fonts)})
+        self.stream = None
+        self.y = 0
+
+    def _finish_page(self) -> None:
+        if self.stream is None:
+            return
+        content = pydyf.Stream([zlib.compress(b'\n'.join(self.stream.stream))], {'Filter': '/FlateDecode'})
+        self.pdf.add_object(content)
+        self.pdf.add_page(pydyf.Dictionary({
+            'Type': '/Page',
+            'Parent': self.pdf.pages.reference,
+            'MediaBox': pydyf.Array([0, 0, self.WIDTH, self.HEIGHT]),
+            'Contents': content.reference,
+            'Resources': self.resources
+        }))
+        self.stream = None
+
+    def new_page(self) -> None:
+        self._finish_page()
+        self.stream = pydyf.Stream()
+        self.y = self.HEIGHT - self.MARGIN
+
+    def row(self, cells: Sequence[Tuple[int, str]], size: int = 10, bold: bool = False) -> None:
+        """
+        Draw one line of text cells at their x offsets, starting a page when this one is full
+        """
+        if self.stream is None or self.y < self.MARGIN + size:
+            self.new_page()
+        self.y -= size + 4
+        for x, text in cells:
+            self.stream.begin_text()
+            self.stream.set_font_size('F2' if bold else 'F1', size)
+            self.stream.set_text_matrix(1, 0, 0, 1, self.MARGIN + x, self.y)
+            # The standard fonts only cover WinAnsi (cp1252) characters
+            self.stream.show_text_string(str(text).encode('cp1252', 'replace'))
+            self.stream.end_text()
+
+    def space(self, points: int = 8) -> None:
+        self.y -= points
+
+    def write(self, output) -> None:
+        self._finish_page()
+        self.pdf.write(output)
+
+
+def _fit(text: Any, length: int) -> str:
+    text = '' if text is None else str(text)
+    return text if len(text) <= length else text[:length - 3] + '...'
+
+
+class ResultsExporter:
+    """
+    Exports of one or many finished elections as CSV or PDF.
+
+    Both formats are written from the elections' 'pdf' results snapshots,
+    one election at a time, to a file in RESULTS_EXPORT_DIR named after the
+    SHA-256 of the snapshots' content hashes. An export whose snapshots have
+    not changed is served from that file instead of being written again;
+    the oldest files beyond RESULTS_EXPORT_CACHE_FILES are removed.
+    Exports run as 'results_export' background jobs.
+    """
+    FORMATS = {'csv': 'text/csv', 'pdf': 'application/pdf'}
+
+    @staticmethod
+    def export_dir() -> str:
+        path = os.path.abspath(current_app.config.get('RESULTS_EXPORT_DIR', Config.RESULTS_EXPORT_DIR))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @classmethod
+    def path_for(cls, filename: str) -> str:
+        """
+        Path of an export file, or '' if the name is not one this exporter writes
+        """
+        name, _, ext = filename.rpartition('.')
+        if ext not in cls.FORMATS or not name.startswith('results-') or \
+                not all(ch.isalnum() or ch == '-' for ch in name):
+            return ''
+        return os.path.join(cls.export_dir(), filename)
+
+    @staticmethod
+    def _snapshot_views(snapshots: List[Tuple[int, str]]) -> Iterator[Dict[str, Any]]:
+        # One payload in memory at a time, never kept in the session's identity map
+        for election_id, content_hash in snapshots:
+            payload = db.session.execute(
+                select(ResultsSnapshot.payload).where(
+                    ResultsSnapshot.election_id == election_id,
+                    ResultsSnapshot.view == 'pdf',
+                    ResultsSnapshot.content_hash == content_hash
+                )
+            ).scalar()
+            if payload is None:
+                raise ValueError(f"Results of election {election_id} changed during the export, try again")
+            yield json.loads(payload)['data']
+
+    @staticmethod
+    def _write_csv(path: str, views: Iterator[Dict[str, Any]], total: int) -> None:
+        with open(path, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            writer.writerow(CSV_HEADER)
+            for n, data in enumerate(views, 1):
+                for position in data['positions']:
+                    for c in position['candidates']:
+                        writer.writerow([
+                            data['election_id'], data['election_name'], data['organization'] or '',
+                            position['position_name'], c['rank'], c['fullname'], c['party'],
+                            c['vote_count'], c['percentage'], 'yes' if c['is_winner'] else 'no'
+                        ])
+                JobQueue.report_progress(n / total, f"Election {data['election_id']} written")
+
+    @staticmethod
+    def _write_pdf(path: str, views: Iterator[Dict[str, Any]], total: int) -> None:
+        pages = _PdfPages()
+        for n, data in enumerate(views, 1):
+            pages.new_page()
+            pages.row([(0, _fit(data['election_name'], 60))], size=16, bold=True)
+            pages.row([(0, _fit(data['organization'] or '', 80))], size=11)
+            pages.space()
+            pages.row([(0, f"Votes cast: {data['total_votes']}    Eligible voters: {data['total_voters']}    "
+                           f"Participation: {data['participation_rate']}%")])
+            pages.row([(0, data['verification_message'].lstrip('✓⚠ '))])
+            pages.row([(0, f"Results as of {data['generation_date']}")], size=8)
+
+            for position in data['positions']:
+                pages.space(12)
+                pages.row([(0, _fit(position['position_name'], 70))], size=12, bold=True)
+                pages.row([(0, '#'), (25, 'Candidate'), (250, 'Party'), (380, 'Votes'), (430, '%'),
+                           (470, 'Winner')], size=9, bold=True)
+                for c in position['candidates']:
+                    pages.row([(0, c['rank']), (25, _fit(c['fullname'], 40)), (250, _fit(c['party'], 24)),
+                               (380, c['vote_count']), (430, c['percentage']),
+                               (470, 'Yes' if c['is_winner'] else '')], size=9)
+            JobQueue.report_progress(n / total, f"Election {data['election_id']} written")
+
+        with open(path, 'wb') as out:
+            pages.write(out)
+
+    @staticmethod
+    def _prune(directory: str, keep: int) -> None:
+        files = [entry for entry in os.scandir(directory)
+                 if entry.is_file() and entry.name.startswith('results-') and not entry.name.endswith('.tmp')]
+        files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in files[keep:]:
+            try:
+                os.remove(entry.path)
+            except OSError as e:
+                logger.warning(f"Could not remove old results export {entry.name}: {e}")
+
+    @classmethod
+    def export(cls, election_ids: Sequence[int], fmt: str) -> Dict[str, Any]:
+        """
+        Write (or reuse) the export of the given elections
+
+        Args:
+            election_ids: Finished elections, in the order they appear in the export
+            fmt: 'csv' or 'pdf'
+
+        Returns:
+            Export file name, download URL, size and whether it was already cached
+
+        Raises:
+            ValueError: If the format is unknown or an election has no final results
+        """
+        if fmt not in cls.FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        election_ids = list(dict.fromkeys(int(election_id) for election_id in election_ids))
+        if not election_ids:
+            raise ValueError('No elections to export')
+
+        snapshots = []
+        for election_id in election_ids:
+            row = ResultsSnapshotService.get(election_id, 'pdf')
+            if row is None:
+                raise ValueError(f"Election {election_id} has no final results")
+            snapshots.append((election_id, row.content_hash))
+
+        key = hashlib.sha256(
+            f"{fmt}:{','.join(f'{election_id}:{content_hash}' for election_id, content_hash in snapshots)}".encode()
+        ).hexdigest()[:24]
+        prefix = f"results-{election_ids[0]}" if len(election_ids) == 1 else 'results-batch'
+        filename = f"{prefix}-{key}.{fmt}"
+        directory = cls.export_dir()
+        path = os.path.join(directory, filename)
+
+        cached = os.path.exists(path)
+        if cached:
+            # Recently served files are the last to be pruned
+            os.utime(path)
+        else:
+            started = datetime.utcnow()
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            writer = cls._write_csv if fmt == 'csv' else cls._write_pdf
+            try:
+                writer(tmp_path, cls._snapshot_views(snapshots), len(snapshots))
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            logger.info(f"Wrote results export {filename} for {len(snapshots)} election(s) "
+                        f"in {(datetime.utcnow() - started).total_seconds():.2f}s")
+            cls._prune(directory, current_app.config.get('RESULTS_EXPORT_CACHE_FILES',
+                                                         Config.RESULTS_EXPORT_CACHE_FILES))
+
+        return {
+            'filename': filename,
+            'format': fmt,
+            'election_ids': election_ids,
+            'bytes': os.path.getsize(path),
+            'cached': cached,
+            'download_url': f'/api/election_results/exports/{filename}'
+        }
@@ -0,0 +1,156 @@
+"""
+Set-based read model of tallied election results
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, select
+
+from app import db
+from app.models.candidate import Candidate
+from app.models.election import Election
+from app.models.election_result import ElectionResult
+from app.models.organization import Organization
+from app.models.position import Position
+
+logger = logging.getLogger(__name__)
+
+
+class ElectionResultsReadModel:
+    """
+    Results of every tallied election, read with two queries regardless of
+    how many elections, positions and candidates there are: one for the page
+    of elections (with the total count as a window function) and one joined,
+    grouped query for their candidates' vote counts.
+    """
+
+    @staticmethod
+    def _elections_page(status: Optional[str], date_from: Optional[date], date_to: Optional[date],
+                        page: Optional[int], per_page: Optional[int]) -> Tuple[List[Any], int]:
+        filters = [exists().where(ElectionResult.election_id == Election.election_id)]
+        if status:
+            filters.append(Election.election_status == status)
+        if date_from:
+            filters.append(Election.date_end >= date_from)
+        if date_to:
+            filters.append(Election.date_end <= date_to)
+
+        query = (
+            select(
+                Election.election_id,
+                Election.election_name,
+                Election.date_end,
+                Election.participation_rate,
+                Organization.org_name,
+                func.count().over().label('total')
+            )
+            .outerjoin(Organization, Organization.org_id == Election.org_id)
+            .where(*filters)
+            .order_by(Election.election_id)
+        )
+        if per_page:
+            query = query.limit(per_page).offset((max(page or 1, 1) - 1) * per_page)
+
+        rows = db.session.execute(query).all()
+        if rows:
+            return rows, rows[0].total
+        if per_page and (page or 1) > 1:
+            # Past the last page: the window count is not available, ask for it separately
+            total = db.session.execute(select(func.count()).select_from(Election).where(*filters)).scalar()
+            return rows, total
+        return rows, 0
+
+    @staticmethod
+    def _candidate_rows(election_ids: List[int]) -> List[Any]:
+        # Candidates whose position belongs to the election's organization, with their tallied votes
+        query = (
+            select(
+                Candidate.election_id,
+                Candidate.candidate_id,
+                Candidate.fullname,
+                Position.position_id,
+                Position.position_name,
+                func.coalesce(func.max(ElectionResult.vote_count), 0).label('votes')
+            )
+            .join(Election, Election.election_id == Candidate.election_id)
+            .join(Position, and_(Position.position_id == Candidate.position_id, Position.org_id == Election.org_id))
+            .outerjoin(ElectionResult, and_(ElectionResult.election_id == Candidate.election_id,
+                                            ElectionResult.candidate_id == Candidate.candidate_id))
+            .where(Candidate.election_id.in_(election_ids))
+            .group_by(Candidate.election_id, Candidate.candidate_id, Candidate.fullname,
+                      Position.position_id, Position.position_name)
+            .order_by(Candidate.election_id, Position.position_id, Candidate.candidate_id)
+        )
+        return db.session.execute(query).all()
+
+    @staticmethod
+    def _assemble(election_rows: List[Any], candidate_rows: List[Any]) -> List[Dict[str, Any]]:
+        # Candidate rows arrive ordered by election and position, so each position is one contiguous run
+        by_election: Dict[int, List[List[Dict[str, Any]]]] = {}
+        last_key = None
+        for row in candidate_rows:
+            key = (row.election_id, row.position_id)
+            if key != last_key:
+                by_election.setdefault(row.election_id, []).append([])
+                last_key = key
+            by_election[row.election_id][-1].append({
+                'candidate_id': row.candidate_id,
+                'name': row.fullname,
+                'position_id': row.position_id,
+                'position_name': row.position_name,
+                'votes': row.votes,
+                'percentage': 0,
+                'winner': False
+            })
+
+        results = []
+        for election in election_rows:
+            candidate_results = []
+            winners = []
+            total_votes = 0
+            for position_candidates in by_election.get(election.election_id, []):
+                position_votes = sum(c['votes'] for c in position_candidates)
+                max_votes = max(c['votes'] for c in position_candidates)
+                total_votes += position_votes
+                for c in position_candidates:
+                    c['percentage'] = round(c['votes'] / position_votes * 100, 1) if position_votes > 0 else 0
+                    if c['votes'] == max_votes and max_votes > 0:
+                        c['winner'] = True
+                        winners.append(c['name'])
+                candidate_results.extend(position_candidates)
+
+            results.append({
+                'election_id': election.election_id,
+                'election_name': election.election_name,
+                'organization': election.org_name or '',
+                'ended_at': election.date_end.isoformat() if election.date_end else '',
+                'winner': ', '.join(winners) if winners else 'No winner',
+                'total_votes': total_votes,
+                'participation_rate': election.participation_rate or 0,
+                'candidates': candidate_results
+            })
+        return results
+
+    @classmethod
+    def list_results(cls, status: Optional[str] = None, date_from: Optional[date] = None,
+                     date_to: Optional[date] = None, page: Optional[int] = None,
+                     per_page: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Results of tallied elections, one entry per election, with per-position winners
+
+        Args:
+            status: Only elections with this election_status
+            date_from: Only elections that ended on or after this date
+            date_to: Only elections that ended on or before this date
+            page: 1-based page number, used with per_page
+            per_page: Elections per page, or None for all of them
+
+        Returns:
+            (results, total) where total counts every matching election
+        """
+        election_rows, total = cls._elections_page(status, date_from, date_to, page, per_page)
+        if not election_rows:
+            return [], total
+        candidate_rows = cls._candidate_rows([row.election_id for row in election_rows])
+        return cls._assemble(election_rows, candidate_rows), total
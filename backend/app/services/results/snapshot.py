@@ -0,0 +1,378 @@
+"""
+Immutable, precomputed results views of finished elections
+"""
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app, request
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.candidate import Candidate
+from app.models.election import Election
+from app.models.election_result import ElectionResult
+from app.models.organization import Organization
+from app.models.position import Position
+from app.models.results_snapshot import ResultsSnapshot
+from app.models.vote import Vote
+from app.services.access import EligibleVoterCounts
+
+logger = logging.getLogger(__name__)
+
+
+
+class ResultsSnapshotService:
+    """
+    Response bodies of the decrypted results, PDF data and result detail
+    endpoints of a finished election, computed once and stored in
+    ``results_snapshots``.
+
+    Snapshots are written when decryption succeeds, or on the first read of
+    a finished election that has none. Each row records a fingerprint of
+    the rows it was built from (counts, vote totals and last updates of the
+    election's results and candidates, and the election itself); a read
+    checks it with one aggregate query and rebuilds the snapshot when the
+    results were re-tallied, archived or restored. Responses carry the
+    payload's SHA-256 as their ETag and answer If-None-Match with 304
+    without loading the payload.
+    """
+    VIEWS = ('decrypted', 'pdf', 'detail')
+
+    @staticmethod
+    def _source_state(election_id: int) -> Tuple[bool, str]:
+        """
+        Whether the election has final results, and the fingerprint of its source rows
+
+        Final means finished with every result decrypted.
+        """
+        candidates = select(Candidate.updated_at).where(Candidate.election_id == election_id).subquery()
+        election = select(Election.election_status, Election.updated_at).where(Election.election_id == election_id).subquery()
+        row = db.session.execute(
+            select(
+                func.count(ElectionResult.result_id),
+                func.count(ElectionResult.vote_count),
+                func.sum(ElectionResult.vote_count),
+                func.max(ElectionResult.updated_at),
+                select(func.count()).select_from(candidates).scalar_subquery(),
+                select(func.max(candidates.c.updated_at)).scalar_subquery(),
+                select(election.c.election_status).scalar_subquery(),
+                select(election.c.updated_at).scalar_subquery()
+            ).where(ElectionResult.election_id == election_id)
+        ).one()
+        result_count, decrypted_count, status = row[0], row[1], row[6]
+        final = status == 'Finished' and result_count > 0 and decrypted_count == result_count
+        return final, hashlib.sha256(repr(tuple(row)).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _load(election_id: int, election: Optional[Election]) -> Dict[str, Any]:
+        results = (
+            ElectionResult.query
+            .filter_by(election_id=election_id)
+            .order_by(ElectionResult.result_id)
+            .all()
+        )
+        result_candidate_ids = {r.candidate_id for r in results}
+        candidates = (
+            Candidate.query
+            .filter(or_(Candidate.election_id == election_id,
+                        Candidate.candidate_id.in_(result_candidate_ids)))
+            .order_by(Candidate.candidate_id)
+            .all()
+        )
+        position_ids = {c.position_id for c in candidates if c.position_id is not None}
+        position_filter = Position.position_id.in_(position_ids)
+        if election is not None:
+            position_filter = or_(position_filter, Position.org_id == election.org_id)
+        positions = Position.query.filter(position_filter).order_by(Position.position_id).all()
+
+        return {
+            'results': results,
+            'candidates': {c.candidate_id: c for c in candidates},
+            'positions': {p.position_id: p for p in positions},
+            'actual_votes': Vote.query.filter_by(election_id=election_id).count()
+        }
+
+    @staticmethod
+    def _results_by_position(data: Dict[str, Any], default_party: Optional[str]) -> Dict[int, List[Dict[str, Any]]]:
+        # Results whose candidate and position exist, grouped by position in result order
+        grouped = defaultdict(list)
+        for r in data['results']:
+            candidate = data['candidates'].get(r.candidate_id)
+            position = data['positions'].get(candidate.position_id) if candidate else None
+            if position is None:
+                continue
+            grouped[position.position_id].append({
+                'candidate_id': candidate.candidate_id,
+                'fullname': candidate.fullname,
+                'party': candidate.party or default_party,
+                'vote_count': r.vote_count or 0
+            })
+        return grouped
+
+    @classmethod
+    def _decrypted_view(cls, election_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        results = []
+        for position_id, candidates in cls._results_by_position(data, None).items():
+            max_votes = max(c['vote_count'] for c in candidates)
+            for c in candidates:
+                c['is_winner'] = c['vote_count'] == max_votes
+            results.append({
+                'position_id': position_id,
+                'position_name': data['positions'][position_id].position_name,
+                'candidates': candidates
+            })
+        results.sort(key=lambda x: x['position_id'])
+
+        total_decrypted = sum(c['vote_count'] for position in results for c in position['candidates'])
+        verification_status = {
+            'verified': all(getattr(r, 'verified', False) for r in data['results']),
+            'vote_count_match': True,
+            'total_decrypted': total_decrypted
+        }
+        actual_votes = data['actual_votes']
+        if total_decrypted != actual_votes:
+            verification_status['vote_count_match'] = False
+            verification_status['message'] = f"Vote count mismatch: decrypted {total_decrypted}, actual {actual_votes}"
+            logger.warning(f"Vote count mismatch for election {election_id}: decrypted={total_decrypted}, actual={actual_votes}")
+
+        return {'results': results, 'verification_status': verification_status}
+
+    @classmethod
+    def _pdf_view(cls, election: Election, organization: Optional[Organization],
+                  data: Dict[str, Any]) -> Dict[str, Any]:
+        positions_for_pdf = []
+        all_winners = []
+        total_votes = 0
+        for position_id, candidates in cls._results_by_position(data, 'Independent').items():
+            position_name = data['positions'][position_id].position_name
+            candidates.sort(key=lambda x: x['vote_count'], reverse=True)
+            position_total = sum(c['vote_count'] for c in candidates)
+            total_votes += position_total
+            max_votes = candidates[0]['vote_count']
+
+            for i, candidate in enumerate(candidates):
+                candidate['is_winner'] = candidate['vote_count'] == max_votes
+                candidate['rank'] = i + 1
+                candidate['percentage'] = round((candidate['vote_count'] / position_total * 100), 2) if position_total > 0 else 0
+                if candidate['is_winner']:
+                    all_winners.append({
+                        'fullname': candidate['fullname'],
+                        'party': candidate['party'],
+                        'position_name': position_name,
+                        'vote_count': candidate['vote_count']
+                    })
+
+            positions_for_pdf.append({
+                'position_id': position_id,
+                'position_name': position_name,
+                'candidates': candidates,
+                'total_votes': position_total
+            })
+        positions_for_pdf.sort(key=lambda x: x['position_id'])
+
+        actual_votes = data['actual_votes']
+        # Restricted to the organization's college, or open to all colleges
+        total_registered_voters = EligibleVoterCounts.for_election(election)
+        participation_rate = round((actual_votes / total_registered_voters * 100), 2) if total_registered_voters > 0 else 0
+        # Stored with the snapshot: "results as of" this time, not when a report is produced from it
+        now = datetime.now()
+
+        return {'success': True, 'data': {
+            'election_name': election.election_name,
+            'election_id': election.election_id,
+            'organization': organization.org_name if organization else None,
+            'total_voters': total_registered_voters,
+            'total_votes': actual_votes,
+            'participation_rate': participation_rate,
+            'generation_date': now.strftime('%B %d, %Y'),
+            'generation_timestamp': now.strftime('%Y-%m-%d %H:%M:%S UTC'),
+            'positions': positions_for_pdf,
+            'winners': all_winners,
+            'is_verified': total_votes == actual_votes,
+            'verification_message': f'✓ VERIFIED: All {actual_votes} votes successfully decrypted and tallied' if total_votes == actual_votes else f'⚠ WARNING: Vote count mismatch (Decrypted: {total_votes}, Actual: {actual_votes})'
+        }}
+
+    @staticmethod
+    def _detail_view(election: Election, organization: Optional[Organization],
+                     data: Dict[str, Any]) -> Dict[str, Any]:
+        from app.models.crypto_config import CryptoConfig
+
+        results = data['results']
+        votes_by_candidate = {}
+        for r in results:
+            votes_by_candidate.setdefault(r.candidate_id, r.vote_count if r.vote_count is not None else 0)
+
+        pos_to_candidates = {}
+        for cand in data['candidates'].values():
+            if cand.election_id == election.election_id:
+                pos_to_candidates.setdefault(cand.position_id, []).append(cand)
+
+        position_results = []
+        all_candidates = []  # For backward compatibility
+        for pos in data['positions'].values():
+            if pos.org_id != election.org_id:
+                continue
+            cands = pos_to_candidates.get(pos.position_id, [])
+            if not cands:
+                continue
+
+            position_cands = []
+            position_total = 0
+            for cand in cands:
+                votes = votes_by_candidate.get(cand.candidate_id, 0)
+                position_total += votes
+                candidate_data = {
+                    'id': cand.candidate_id,
+                    'name': cand.fullname,
+                    'votes': votes,
+                    'percentage': 0,
+                    'winner': False,
+                    'position_id': pos.position_id,
+                    'position_name': pos.position_name
+                }
+                position_cands.append(candidate_data)
+                all_candidates.append(candidate_data)
+
+            max_votes = max(c['votes'] for c in position_cands)
+            for c in position_cands:
+                c['percentage'] = round((c['votes'] / position_total * 100), 1) if position_total > 0 else 0
+                if c['votes'] == max_votes:
+                    c['winner'] = True
+            position_results.append({
+                'position_id': pos.position_id,
+                'position_name': pos.position_name,
+                'candidates': position_cands
+            })
+
+        crypto_config = CryptoConfig.query.filter_by(election_id=election.election_id).first()
+        crypto_enabled = crypto_config is not None
+
+        return {
+            'election_id': election.election_id,
+            'election_name': election.election_name,
+            'organization': {'org_name': organization.org_name} if organization else None,
+            'status': election.election_status,
+            'published_at': election.created_at.isoformat() if election.created_at else None,
+            'description': election.election_desc,
+            'voters_count': EligibleVoterCounts.for_election(election),
+            'total_votes': sum(r.vote_count or 0 for r in results),
+            'crypto_enabled': crypto_enabled,
+            'threshold_crypto': crypto_enabled and crypto_config.status == 'active',
+            'zkp_verified': bool(getattr(results[0], 'verified', False)),
+            'positions': position_results,  # Primary data structure grouped by positions
+            'candidates': all_candidates,  # For backward compatibility with existing frontend code
+            'result_count': len(results)
+        }
+
+    @classmethod
+    def build_views(cls, election_id: int, views: Iterable[str] = VIEWS) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute results views from the current tables
+
+        Args:
+            election_id: Election to compute the views of
+            views: Names of the views to compute
+
+        Returns:
+            Dictionary of view name -> response body
+
+        Raises:
+            LookupError: If the election, or for 'detail' its results, do not exist
+        """
+        election = db.session.get(Election, election_id)
+        if election is None and set(views) - {'decrypted'}:
+            raise LookupError('Election not found')
+        data = cls._load(election_id, election)
+        if 'detail' in views and not data['results']:
+            raise LookupError('No results found for this election')
+        organization = db.session.get(Organization, election.org_id) if election and election.org_id else None
+
+        built = {}
+        for view in views:
+            if view == 'decrypted':
+                built[view] = cls._decrypted_view(election_id, data)
+            elif view == 'pdf':
+                built[view] = cls._pdf_view(election, organization, data)
+            elif view == 'detail':
+                built[view] = cls._detail_view(election, organization, data)
+            else:
+                raise ValueError(f"Unknown results view: {view}")
+        return built
+
+    @classmethod
+    def write(cls, election_id: int) -> Dict[str, ResultsSnapshot]:
+        """
+        Compute and store every view of a finished election, replacing any existing snapshot
+
+        Returns:
+            Dictionary of view name -> stored snapshot row
+
+        Raises:
+            ValueError: If the election is not finished or not fully decrypted
+        """
+        final, source_version = cls._source_state(election_id)
+        if not final:
+            raise ValueError(f"Election {election_id} has no final results to snapshot")
+
+        rows = {}
+        for view, body in cls.build_views(election_id).items():
+            payload = current_app.json.dumps(body)
+            rows[view] = ResultsSnapshot(
+                election_id=election_id,
+                view=view,
+                content_hash=hashlib.sha256(payload.encode('utf-8')).hexdigest(),
+                source_version=source_version,
+                payload=payload
+            )
+        db.session.execute(delete(ResultsSnapshot).where(ResultsSnapshot.election_id == election_id))
+        db.session.add_all(rows.values())
+        db.session.commit()
+        logger.info(f"Stored results snapshot of election {election_id}")
+        return rows
+
+    @classmethod
+    def get(cls, election_id: int, view: str) -> Optional[ResultsSnapshot]:
+        """
+        Current snapshot row of a view, (re)written first if it is missing or stale
+
+        Returns:
+            The row (payload not yet loaded), or None if the election has no final results
+        """
+        final, source_version = cls._source_state(election_id)
+        if not final:
+            return None
+        row = db.session.get(ResultsSnapshot, (election_id, view))
+        if row is not None and row.source_version == source_version:
+            return row
+        try:
+            return cls.write(election_id)[view]
+        except IntegrityError:
+            # Another request stored it first
+            db.session.rollback()
+            return db.session.get(ResultsSnapshot, (election_id, view))
+
+    @classmethod
+    def respond(cls, election_id: int, view: str):
+        """
+        Serve a view from its snapshot with ETag / If-None-Match support
+
+        Returns:
+            The response, or None if the election has no snapshot and the caller
+            should compute the view itself
+        """
+        row = cls.get(election_id, view)
+        if row is None:
+            return None
+        response = current_app.response_class(mimetype=current_app.json.mimetype)
+        response.set_etag(row.content_hash)
+        # Revalidate every time: a re-tally replaces the snapshot
+        response.headers['Cache-Control'] = 'private, no-cache'
+        if request.if_none_match.contains(row.content_hash):
+            response.status_code = 304
+            return response
+        response.set_data(row.payload)
+        return response
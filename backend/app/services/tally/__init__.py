@@ -0,0 +1,6 @@
+from .homomorphic_tally import HomomorphicTallyEngine
+from .vote_reader import VoteReader
+from .running_tally import RunningTallyService
+from .batch_decrypt import BatchDecryptor
+
+__all__ = ['HomomorphicTallyEngine', 'VoteReader', 'RunningTallyService', 'BatchDecryptor']
@@ -0,0 +1,111 @@
+"""
+Batch CRT decryption of Paillier ciphertexts for closing an election
+"""
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Hashable, Optional, Tuple
+
+from phe import paillier
+
+try:
+    from gmpy2 import mpz, powmod
+    GMPY2_AVAILABLE = True
+except ImportError:
+    GMPY2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# (p, q, p^2, q^2, hp, hq, p^-1 mod q)
+CrtParams = Tuple[int, int, int, int, int, int, int]
+
+
+def _crt_decrypt(ciphertext: int, params: CrtParams) -> int:
+    """
+    Decrypt one ciphertext with exponentiations mod p^2 and q^2 joined by CRT.
+
+    Same arithmetic as ``PaillierPrivateKey.raw_decrypt``. Runs inside pool
+    workers, so it must stay a module-level function.
+    """
+    p, q, psquare, qsquare, hp, hq, p_inverse = params
+    if GMPY2_AVAILABLE:
+        c = mpz(ciphertext)
+        mp = (powmod(c, p - 1, psquare) - 1) // p * hp % p
+        mq = (powmod(c, q - 1, qsquare) - 1) // q * hq % q
+        return int(mp + ((mq - mp) * p_inverse % q) * p)
+
+    mp = (pow(ciphertext, p - 1, psquare) - 1) // p * hp % p
+    mq = (pow(ciphertext, q - 1, qsquare) - 1) // q * hq % q
+    return mp + ((mq - mp) * p_inverse % q) * p
+
+
+class BatchDecryptor:
+    """
+    Decrypts many ciphertexts under one private key.
+
+    The CRT parameters are taken from the private key once and the
+    ciphertexts are spread over a process pool when there are enough of them
+    to amortise starting it; small batches are decrypted inline.
+    """
+
+    def __init__(self, private_key: paillier.PaillierPrivateKey, max_workers: Optional[int] = None,
+                 parallel_threshold: int = 8):
+        """
+        Args:
+            private_key: Reconstructed Paillier private key
+            max_workers: Worker processes; defaults to the CPU count, 1 disables the pool
+            parallel_threshold: Smallest batch decrypted in the pool
+        """
+        self.public_key = private_key.public_key
+        self.params: CrtParams = (
+            int(private_key.p), int(private_key.q), int(private_key.psquare), int(private_key.qsquare),
+            int(private_key.hp), int(private_key.hq), int(private_key.p_inverse)
+        )
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.parallel_threshold = parallel_threshold
+        self.last_stats: Dict[str, float] = {}
+
+    def decrypt_all(self, ciphertexts: Dict[Hashable, int]) -> Dict[Hashable, int]:
+        """
+        Decrypt a batch of raw ciphertexts
+
+        Args:
+            ciphertexts: Mapping of any key (e.g. candidate_id) to raw ciphertext
+
+        Returns:
+            Mapping of the same keys to raw plaintexts; see ``decode``
+        """
+        started = time.perf_counter()
+        keys = list(ciphertexts)
+        values = [ciphertexts[key] for key in keys]
+
+        workers = min(self.max_workers, len(values))
+        if workers > 1 and len(values) >= self.parallel_threshold:
+            # Spawned, not forked: decrypt jobs run in a thread of the web process, and a forked
+            # child could inherit a lock held by one of its other threads and deadlock
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                plaintexts = list(pool.map(_crt_decrypt, values, repeat(self.params),
+                                           chunksize=max(1, len(values) // (workers * 4))))
+        else:
+            workers = 1
+            plaintexts = [_crt_decrypt(value, self.params) for value in values]
+
+        self.last_stats = {
+            'ciphertexts': len(values),
+            'workers': workers,
+            'seconds': round(time.perf_counter() - started, 4),
+        }
+        logger.info(f"Batch decryption stats: {self.last_stats}")
+        return dict(zip(keys, plaintexts))
+
+    def decode(self, plaintext: int) -> int:
+        """
+        Interpret a raw plaintext as a signed integer, exactly as ``PaillierPrivateKey.decrypt`` does
+
+        Raises:
+            OverflowError: If the plaintext is outside the range phe can encode
+        """
+        return paillier.EncodedNumber(self.public_key, plaintext, 0).decode()
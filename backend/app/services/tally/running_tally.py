@@ -0,0 +1,141 @@
+"""
+Incremental per-candidate tallies maintained at vote-cast time
+"""
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.running_tally import RunningTally
+from app.services.crypto.paillier_keys import PaillierKeyCache
+from app.services.tally.homomorphic_tally import _product_mod
+
+logger = logging.getLogger(__name__)
+
+
+class RunningTallyService:
+    """
+    Folds newly cast ballots into ``running_tallies`` so that closing an
+    election needs a single read instead of an O(votes) pass.
+
+    Folding runs inside the caller's transaction. Rows are locked with
+    ``SELECT ... FOR UPDATE`` in candidate order, so concurrent casts for the
+    same candidate serialise on that row and cannot deadlock each other.
+    Folding never fails a cast: any problem is logged and the affected tally
+    simply drifts from the Vote table, which ``read_totals`` detects.
+    """
+
+    @staticmethod
+    def _lock_row(election_id: int, candidate_id: int, crypto_id: int) -> RunningTally:
+        """
+        Lock the running tally row of a candidate, creating it if needed
+        """
+        row = RunningTally.query.filter_by(
+            election_id=election_id, candidate_id=candidate_id
+        ).with_for_update().first()
+        if row:
+            return row
+
+        try:
+            # A concurrent cast may insert the same row; the savepoint keeps our transaction usable
+            with db.session.begin_nested():
+                row = RunningTally(
+                    election_id=election_id,
+                    candidate_id=candidate_id,
+                    crypto_id=crypto_id,
+                    encrypted_product='1',
+                    ballot_count=0
+                )
+                db.session.add(row)
+            return row
+        except IntegrityError:
+            return RunningTally.query.filter_by(
+                election_id=election_id, candidate_id=candidate_id
+            ).with_for_update().one()
+
+    @staticmethod
+    def fold_ballots(election_id: int, ballots: Iterable[Tuple[int, str]]) -> bool:
+        """
+        Multiply newly cast ciphertexts into the candidates' running tallies
+
+        Args:
+            election_id: ID of the election
+            ballots: (candidate_id, encrypted_vote) pairs added in the current transaction
+
+        Returns:
+            True if every ballot was folded in
+        """
+        key = PaillierKeyCache.get(election_id)
+        if key is None:
+            logger.warning(f"Running tally skipped for election {election_id}: no usable public key")
+            return False
+        crypto_id = key.crypto_id
+        # gmpy2 multiplies 4096-bit values several times faster than int when it is installed
+        nsquare = key.nsquare_mpz if key.nsquare_mpz is not None else key.nsquare
+
+        grouped: Dict[int, list] = {}
+        try:
+            for candidate_id, encrypted_vote in ballots:
+                grouped.setdefault(int(candidate_id), []).append(int(encrypted_vote))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Running tally skipped for election {election_id}: unparseable ballot ({e})")
+            return False
+
+        try:
+            with db.session.begin_nested():
+                # Lock in a fixed order so concurrent multi-position ballots cannot deadlock
+                for candidate_id in sorted(grouped):
+                    ciphertexts = grouped[candidate_id]
+                    row = RunningTallyService._lock_row(election_id, candidate_id, crypto_id)
+                    if row.crypto_id != crypto_id:
+                        # Key was regenerated; the old product is meaningless under the new key
+                        row.crypto_id = crypto_id
+                        row.encrypted_product = '1'
+                        row.ballot_count = 0
+                    row.encrypted_product = str(
+                        int(_product_mod([int(row.encrypted_product)] + ciphertexts, nsquare))
+                    )
+                    row.ballot_count = row.ballot_count + len(ciphertexts)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to fold ballots into running tally for election {election_id}: {e}")
+            return False
+
+    @staticmethod
+    def read_totals(election_id: int, crypto_id: int, expected_counts: Dict[int, int]) -> Optional[Dict[int, int]]:
+        """
+        Read the running tallies if they account for every ballot
+
+        Args:
+            election_id: ID of the election
+            crypto_id: ID of the key the tally must have been computed under
+            expected_counts: Mapping of candidate_id to number of ballots in the Vote table
+
+        Returns:
+            Mapping of candidate_id to raw encrypted total, or None if the running
+            tallies are missing or out of step and a full tally is required
+        """
+        rows = RunningTally.query.filter_by(election_id=election_id).all()
+        folded = {row.candidate_id: row for row in rows if row.ballot_count}
+
+        if set(folded) != set(expected_counts):
+            logger.info(f"Running tally for election {election_id} does not cover the same candidates as the votes")
+            return None
+        for candidate_id, row in folded.items():
+            if row.crypto_id != crypto_id or row.ballot_count != expected_counts[candidate_id]:
+                logger.info(f"Running tally for election {election_id}, candidate {candidate_id} is stale "
+                            f"({row.ballot_count} folded, {expected_counts[candidate_id]} cast)")
+                return None
+
+        return {candidate_id: int(row.encrypted_product) for candidate_id, row in folded.items()}
+
+    @staticmethod
+    def reset(election_id: int) -> int:
+        """
+        Delete the running tallies of an election
+
+        Returns:
+            Number of rows deleted
+        """
+        return RunningTally.query.filter_by(election_id=election_id).delete()
@@ -0,0 +1,162 @@
+"""
+Streaming access to ballots for tallying and verification
+"""
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models.vote import Vote
+from app.services.crypto.ciphertext_codec import decode_ciphertext
+
+logger = logging.getLogger(__name__)
+
+
+class VoteReader:
+    """
+    Reads ballots without materialising one ORM object per vote.
+
+    Ciphertext reads select only the candidate and ciphertext columns and are
+    streamed with ``yield_per`` (a server-side cursor on PostgreSQL), so peak
+    memory is bounded by the batch size rather than by the election size.
+    Counts are computed with GROUP BY in the database.
+    """
+
+    DEFAULT_BATCH_SIZE = 1000
+
+    @staticmethod
+    def iter_ciphertexts(
+        election_id: int,
+        candidate_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Stream the encrypted ballots of an election
+
+        Args:
+            election_id: ID of the election
+            candidate_id: Optionally restrict to one candidate
+            batch_size: Rows fetched from the cursor per round trip
+
+        Yields:
+            (candidate_id, encrypted_vote) tuples
+        """
+        stmt = select(Vote.candidate_id, Vote.encrypted_vote).where(Vote.election_id == election_id)
+        if candidate_id is not None:
+            stmt = stmt.where(Vote.candidate_id == candidate_id)
+        stmt = stmt.execution_options(yield_per=batch_size)
+
+        for row in db.session.execute(stmt):
+            yield row.candidate_id, row.encrypted_vote
+
+    @staticmethod
+    def iter_encoded_ciphertexts(
+        election_id: int,
+        candidate_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+        """
+        Stream the encrypted ballots of an election as stored, without decoding
+
+        For callers that decode each ballot themselves (``decode_ciphertext``)
+        and report a malformed one instead of stopping.
+
+        Args:
+            election_id: ID of the election
+            candidate_id: Optionally restrict to one candidate
+            batch_size: Rows fetched from the cursor per round trip
+
+        Yields:
+            (candidate_id, encrypted_vote_bytes, encrypted_vote) tuples
+        """
+        stmt = select(Vote.candidate_id, Vote.encrypted_vote_bytes, Vote.encrypted_vote).where(
+            Vote.election_id == election_id
+        )
+        if candidate_id is not None:
+            stmt = stmt.where(Vote.candidate_id == candidate_id)
+        stmt = stmt.execution_options(yield_per=batch_size)
+
+        for row in db.session.execute(stmt):
+            yield row.candidate_id, row.encrypted_vote_bytes, row.encrypted_vote
+
+    @staticmethod
+    def iter_ciphertext_values(
+        election_id: int,
+        candidate_id: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Stream the encrypted ballots of an election as integers
+
+        Ballots with a binary ciphertext are decoded with ``int.from_bytes``;
+        older ballots fall back to parsing the decimal text.
+
+        Args:
+            election_id: ID of the election
+            candidate_id: Optionally restrict to one candidate
+            batch_size: Rows fetched from the cursor per round trip
+
+        Yields:
+            (candidate_id, ciphertext) tuples
+
+        Raises:
+            ValueError: If a ballot has neither bytes nor a parseable decimal ciphertext
+        """
+        for row_candidate_id, ciphertext_bytes, text in VoteReader.iter_encoded_ciphertexts(
+                election_id, candidate_id, batch_size):
+            yield row_candidate_id, decode_ciphertext(ciphertext_bytes, text)
+
+    @staticmethod
+    def count_by_candidate(election_id: int) -> Dict[int, int]:
+        """
+        Count ballots per candidate with a single GROUP BY
+
+        Args:
+            election_id: ID of the election
+
+        Returns:
+            Mapping of candidate_id to number of ballots
+        """
+        rows = db.session.execute(
+            select(Vote.candidate_id, func.count(Vote.vote_id))
+            .where(Vote.election_id == election_id)
+            .group_by(Vote.candidate_id)
+        )
+        return {candidate_id: count for candidate_id, count in rows}
+
+    @staticmethod
+    def find_malformed(election_id: int, min_length: int = 10, paillier_key: Any = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> List[int]:
+        """
+        Find ballots whose ciphertext is missing, implausibly short or, given
+        the election key, not an element of Z*_{n^2}
+
+        Ballots stored with a binary ciphertext are skipped: those were
+        validated at cast time, or by the 20240606_binary_ciphertexts backfill.
+
+        Args:
+            election_id: ID of the election
+            min_length: Minimum number of characters in a stored ciphertext
+            paillier_key: CachedPaillierKey of the election, or None to check lengths only
+            batch_size: Rows fetched from the cursor per round trip
+
+        Returns:
+            List of vote IDs that fail the check
+        """
+        stmt = (
+            select(Vote.vote_id, Vote.encrypted_vote)
+            .where(Vote.election_id == election_id, Vote.encrypted_vote_bytes.is_(None))
+            .execution_options(yield_per=batch_size)
+        )
+        malformed = []
+        for vote_id, ciphertext in db.session.execute(stmt):
+            if ciphertext is None or len(ciphertext) < min_length:
+                malformed.append(vote_id)
+                continue
+            if paillier_key is not None:
+                try:
+                    paillier_key.parse_ciphertext(ciphertext)
+                except ValueError:
+                    malformed.append(vote_id)
+        return malformed
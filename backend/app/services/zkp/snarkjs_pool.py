@@ -0,0 +1,332 @@
+"""
+Pool of long-lived node processes for snarkjs proof verification
+"""
+import atexit
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snarkjs_worker.js')
+
+
+class SnarkjsWorkerError(Exception):
+    """A worker crashed, timed out or returned a protocol error"""
+
+
+class SnarkjsPoolBusy(SnarkjsWorkerError):
+    """Every worker is busy and the wait queue is full"""
+
+
+class _SnarkjsWorker:
+    """
+    One node process speaking line-delimited JSON over stdin/stdout.
+
+    A worker serves one request at a time; the pool guarantees exclusive use.
+    """
+
+    def __init__(self, command: List[str], env: Dict[str, str]):
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                env=env
+            )
+        except OSError as e:
+            raise SnarkjsWorkerError(f"Could not start snarkjs worker: {e}")
+        self.loaded_keys = set()
+        self._ids = itertools.count(1)
+        self._lines: queue.Queue = queue.Queue()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+
+    def _read_stdout(self) -> None:
+        for line in self.process.stdout:
+            self._lines.put(line)
+        # EOF: the process exited
+        self._lines.put(None)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Send one request and wait for its response
+
+        Raises:
+            SnarkjsWorkerError: If the worker exits, times out or answers garbage
+        """
+        request_id = next(self._ids)
+        message = dict(message, id=request_id)
+        try:
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise SnarkjsWorkerError(f"Worker stdin closed: {e}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SnarkjsWorkerError(f"Worker did not answer within {timeout}s")
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                raise SnarkjsWorkerError(f"Worker did not answer within {timeout}s")
+            if line is None:
+                raise SnarkjsWorkerError(f"Worker exited with code {self.process.poll()}")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring non-protocol output from snarkjs worker: {line.strip()[:200]}")
+                continue
+            if response.get('id') == request_id:
+                return response
+
+    def close(self) -> None:
+        """Terminate the process, killing it if it does not exit promptly"""
+        try:
+            self.process.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.process.terminate()
+            self.process.wait(timeout=2)
+        except Exception:
+            self.process.kill()
+
+
+class SnarkjsWorkerPool:
+    """
+    Bounded pool of snarkjs verifier workers.
+
+    Workers are started lazily up to ``size`` and reused across requests, so
+    node start-up and verification-key parsing are paid once per worker
+    instead of once per proof. A worker that crashes or times out is killed
+    and replaced on the next request. At most ``size + max_queued`` callers
+    may hold or wait for a worker; beyond that ``SnarkjsPoolBusy`` is raised
+    immediately so overload surfaces as a fast error rather than a pile-up.
+    """
+
+    _instance: Optional['SnarkjsWorkerPool'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        size: int = 2,
+        timeout: float = 10.0,
+        max_queued: int = 32,
+        command: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            size: Maximum number of worker processes
+            timeout: Seconds to wait for a worker to answer one request
+            max_queued: Callers allowed to wait for a free worker
+            command: Worker command line (defaults to node running snarkjs_worker.js)
+        """
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.command = command or ['node', WORKER_SCRIPT]
+        self._idle: queue.Queue = queue.Queue()
+        self._admission = threading.BoundedSemaphore(self.size + max(0, max_queued))
+        self._lock = threading.Lock()
+        self._workers: List[_SnarkjsWorker] = []
+        self._closed = False
+
+        # Resolve require('snarkjs') from the working directory like the one-shot verifier did
+        self._env = dict(os.environ)
+        node_paths = [os.path.join(os.getcwd(), 'node_modules')]
+        if self._env.get('NODE_PATH'):
+            node_paths.append(self._env['NODE_PATH'])
+        self._env['NODE_PATH'] = os.pathsep.join(node_paths)
+
+    @classmethod
+    def get_instance(cls) -> Optional['SnarkjsWorkerPool']:
+        """
+        Return the process-wide pool, or None if it is disabled or node is missing
+        """
+        if cls._instance is not None:
+            return cls._instance
+
+        with cls._instance_lock:
+            if cls._instance is None:
+                from app.config import Config
+                if Config.SNARKJS_WORKERS <= 0 or shutil.which('node') is None:
+                    return None
+                cls._instance = cls(
+                    size=Config.SNARKJS_WORKERS,
+                    timeout=Config.SNARKJS_WORKER_TIMEOUT,
+                    max_queued=Config.SNARKJS_MAX_QUEUED
+                )
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    @staticmethod
+    def key_id_for(verification_key: Dict[str, Any]) -> str:
+        """
+        Content-derived id for a verification key
+        """
+        canonical = json.dumps(verification_key, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+    def _acquire(self) -> _SnarkjsWorker:
+        if not self._admission.acquire(blocking=False):
+            raise SnarkjsPoolBusy("snarkjs verifier pool is saturated")
+        try:
+            while True:
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    worker = None
+                    with self._lock:
+                        if self._closed:
+                            raise SnarkjsWorkerError("snarkjs verifier pool is closed")
+                        if len(self._workers) < self.size:
+                            worker = _SnarkjsWorker(self.command, self._env)
+                            self._workers.append(worker)
+                            logger.info(f"Started snarkjs worker pid={worker.process.pid} "
+                                        f"({len(self._workers)}/{self.size})")
+                    if worker is None:
+                        try:
+                            worker = self._idle.get(timeout=self.timeout)
+                        except queue.Empty:
+                            raise SnarkjsPoolBusy("Timed out waiting for a free snarkjs worker")
+
+                if worker.alive:
+                    return worker
+                logger.warning(f"snarkjs worker pid={worker.process.pid} died while idle, replacing it")
+                self._discard(worker)
+        except BaseException:
+            self._admission.release()
+            raise
+
+    def _release(self, worker: _SnarkjsWorker) -> None:
+        self._idle.put(worker)
+        self._admission.release()
+
+    def _discard(self, worker: _SnarkjsWorker) -> None:
+        worker.close()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def _call(self, verification_key: Dict[str, Any], key_id: str, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Run one request on a pooled worker, sending the key only if the worker lacks it
+        """
+        worker = self._acquire()
+        message = dict(message, key_id=key_id)
+        try:
+            if key_id not in worker.loaded_keys:
+                message['vkey'] = verification_key
+            response = worker.request(message, timeout)
+
+            if not response.get('ok') and response.get('error') == 'unknown_key':
+                # The worker evicted the key; send it again
+                message['vkey'] = verification_key
+                response = worker.request(message, timeout)
+        except SnarkjsWorkerError:
+            logger.error(f"snarkjs worker pid={worker.process.pid} failed, restarting it")
+            self._discard(worker)
+            self._admission.release()
+            raise
+
+        worker.loaded_keys.add(key_id)
+        self._release(worker)
+        return response
+
+    def verify(
+        self,
+        verification_key: Dict[str, Any],
+        public_signals: List[str],
+        proof: Dict[str, Any],
+        key_id: Optional[str] = None
+    ) -> bool:
+        """
+        Verify a Groth16 proof on a pooled worker
+
+        Args:
+            verification_key: The verification key
+            public_signals: The public signals (inputs)
+            proof: The proof to verify
+            key_id: Stable id of the verification key (derived from its content if omitted)
+
+        Returns:
+            True if the proof is valid, False otherwise
+
+        Raises:
+            SnarkjsPoolBusy: If the pool is saturated
+            SnarkjsWorkerError: If the worker crashed or timed out
+        """
+        key_id = key_id or self.key_id_for(verification_key)
+        response = self._call(
+            verification_key, key_id,
+            {'op': 'verify', 'proof': proof, 'publicSignals': public_signals},
+            self.timeout
+        )
+
+        if not response.get('ok'):
+            # snarkjs rejected the input itself (malformed proof or key)
+            logger.warning(f"snarkjs worker could not verify proof: {response.get('error')}")
+            return False
+        return bool(response.get('valid'))
+
+    def verify_batch(
+        self,
+        verification_key: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        key_id: Optional[str] = None
+    ) -> List[bool]:
+        """
+        Verify several Groth16 proofs under one key in a single worker round trip
+
+        Args:
+            verification_key: The verification key
+            items: List of {"proof": ..., "publicSignals": ...}
+            key_id: Stable id of the verification key (derived from its content if omitted)
+
+        Returns:
+            Per-item validity, in input order
+
+        Raises:
+            SnarkjsPoolBusy: If the pool is saturated
+            SnarkjsWorkerError: If the worker crashed or timed out
+        """
+        if not items:
+            return []
+        key_id = key_id or self.key_id_for(verification_key)
+        payload = [{'proof': item.get('proof'), 'publicSignals': item.get('publicSignals')} for item in items]
+        # The per-request timeout budgets one proof; a batch gets one budget per item
+        response = self._call(
+            verification_key, key_id,
+            {'op': 'verify_batch', 'items': payload},
+            self.timeout * len(items)
+        )
+
+        results = response.get('results') if response.get('ok') else None
+        if not isinstance(results, list) or len(results) != len(items):
+            logger.warning(f"snarkjs worker could not verify batch: {response.get('error')}")
+            return [False] * len(items)
+        return [bool(valid) for valid in results]
+
+    def close(self) -> None:
+        """Stop all workers"""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
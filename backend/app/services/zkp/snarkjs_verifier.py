@@ -7,6 +7,7 @@ import os
 from typing import Dict, Any, List, Optional
 import tempfile
 import logging
+from app.services.zkp.snarkjs_pool import SnarkjsPoolBusy, SnarkjsWorkerError, SnarkjsWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +20,94 @@ class SnarkjsVerifier:
     def verify_proof(
         verification_key: Dict[str, Any], 
         public_signals: List[str], 
-        proof: Dict[str, Any]
+        proof: Dict[str, Any],
+        key_id: Optional[str] = None
     ) -> bool:
         """
         Verify a zkSnark proof using snarkjs
         
+        Proofs are verified on the long-lived worker pool when it is enabled;
+        a worker crash or timeout falls back to a one-shot node process.
+        
         Args:
-            verification_key: The verification key
+            verification_key: The verification key (dict or JSON string)
             public_signals: The public signals (inputs)
             proof: The proof to verify
+            key_id: Stable id of the verification key, used by the pool's key cache
             
         Returns:
             True if the proof is valid, False otherwise
+            
+        Raises:
+            SnarkjsPoolBusy: If the worker pool is saturated
+        """
+        if isinstance(verification_key, str):
+            try:
+                verification_key = json.loads(verification_key)
+            except json.JSONDecodeError as e:
+                logger.error(f"Verification key is not valid JSON: {e}")
+                return False
+        
+        pool = SnarkjsWorkerPool.get_instance()
+        if pool is not None:
+            try:
+                return pool.verify(verification_key, public_signals, proof, key_id=key_id)
+            except SnarkjsPoolBusy:
+                raise
+            except SnarkjsWorkerError as e:
+                logger.warning(f"snarkjs worker pool failed, falling back to a one-shot process: {e}")
+        
+        return SnarkjsVerifier._verify_proof_subprocess(verification_key, public_signals, proof)
+    
+    @staticmethod
+    def verify_proofs_batch(
+        verification_key: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        key_id: Optional[str] = None
+    ) -> List[bool]:
+        """
+        Verify several zkSnark proofs that share one verification key
+        
+        Args:
+            verification_key: The verification key (dict or JSON string)
+            items: List of {"proof": ..., "publicSignals": ...}
+            key_id: Stable id of the verification key, used by the pool's key cache
+            
+        Returns:
+            Per-item validity, in input order
+            
+        Raises:
+            SnarkjsPoolBusy: If the worker pool is saturated
+        """
+        if isinstance(verification_key, str):
+            try:
+                verification_key = json.loads(verification_key)
+            except json.JSONDecodeError as e:
+                logger.error(f"Verification key is not valid JSON: {e}")
+                return [False] * len(items)
+        
+        pool = SnarkjsWorkerPool.get_instance()
+        if pool is not None:
+            try:
+                return pool.verify_batch(verification_key, items, key_id=key_id)
+            except SnarkjsPoolBusy:
+                raise
+            except SnarkjsWorkerError as e:
+                logger.warning(f"snarkjs worker pool failed, falling back to one-shot processes: {e}")
+        
+        return [
+            SnarkjsVerifier._verify_proof_subprocess(verification_key, item.get('publicSignals'), item.get('proof'))
+            for item in items
+        ]
+    
+    @staticmethod
+    def _verify_proof_subprocess(
+        verification_key: Dict[str, Any], 
+        public_signals: List[str], 
+        proof: Dict[str, Any]
+    ) -> bool:
+        """
+        Verify a zkSnark proof in a fresh node process
         """
         try:
             # Create temporary files for the verification process
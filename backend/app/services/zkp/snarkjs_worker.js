@@ -0,0 +1,100 @@
+/**
+ * Long-lived snarkjs verifier worker used by SnarkjsWorkerPool.
+ *
+ * Protocol: one JSON request per line on stdin, one JSON response per line
+ * on stdout, each echoing the request "id".
+ *
+ *   {"id": 1, "op": "ping"}
+ *   {"id": 2, "op": "verify", "key_id": "...", "vkey": {...}?, "proof": {...}, "publicSignals": [...]}
+ *   {"id": 3, "op": "verify_batch", "key_id": "...", "vkey": {...}?, "items": [{"proof": {...}, "publicSignals": [...]}, ...]}
+ *
+ * Verification keys are cached by key_id, so the Python side only sends a
+ * key the first time a worker sees it. If a key has been evicted the worker
+ * answers {"ok": false, "error": "unknown_key"} and the caller resends it.
+ */
+const readline = require('readline');
+const snarkjs = require('snarkjs');
+
+// stdout carries the protocol; keep library logging off it
+console.log = console.error;
+
+const MAX_KEYS = parseInt(process.env.SNARKJS_WORKER_MAX_KEYS || '32', 10);
+const keys = new Map();
+
+function rememberKey(keyId, vkey) {
+  keys.delete(keyId);
+  keys.set(keyId, vkey);
+  while (keys.size > MAX_KEYS) {
+    keys.delete(keys.keys().next().value);
+  }
+}
+
+function lookupKey(keyId) {
+  const vkey = keys.get(keyId);
+  if (vkey !== undefined) {
+    // Refresh LRU position
+    keys.delete(keyId);
+    keys.set(keyId, vkey);
+  }
+  return vkey;
+}
+
+async function handle(msg) {
+  if (msg.op === 'ping') {
+    return { ok: true };
+  }
+
+  if (msg.vkey) {
+    rememberKey(msg.key_id, msg.vkey);
+  }
+  const vkey = lookupKey(msg.key_id);
+  if (vkey === undefined) {
+    return { ok: false, error: 'unknown_key' };
+  }
+
+  if (msg.op === 'verify') {
+    const valid = await snarkjs.groth16.verify(vkey, msg.publicSignals, msg.proof);
+    return { ok: true, valid: valid === true };
+  }
+
+  if (msg.op === 'verify_batch') {
+    // One round trip for many proofs under the same key; a bad item fails only itself
+    const results = [];
+    for (const item of msg.items) {
+      try {
+        results.push((await snarkjs.groth16.verify(vkey, item.publicSignals, item.proof)) === true);
+      } catch (err) {
+        results.push(false);
+      }
+    }
+    return { ok: true, results };
+  }
+
+  return { ok: false, error: `unknown op ${msg.op}` };
+}
+
+function respond(response) {
+  process.stdout.write(JSON.stringify(response) + '\n');
+}
+
+// Requests are answered strictly in order
+let chain = Promise.resolve();
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  chain = chain.then(async () => {
+    let msg;
+    try {
+      msg = JSON.parse(line);
+    } catch (err) {
+      respond({ id: null, ok: false, error: `invalid json: ${err.message}` });
+      return;
+    }
+    try {
+      respond(Object.assign({ id: msg.id }, await handle(msg)));
+    } catch (err) {
+      respond({ id: msg.id, ok: false, error: String(err && err.message ? err.message : err) });
+    }
+  });
+}).on('close', () => {
+  chain.then(() => process.exit(0));
+});
@@ -0,0 +1,162 @@
+"""
+In-process cache of parsed ZKP verification keys per election
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import Config
+from app.models.crypto_config import CryptoConfig
+from app.services.zkp.snarkjs_pool import SnarkjsWorkerPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../public/verification_key.json')
+
+
+class CachedVerificationKey(NamedTuple):
+    key_id: str
+    key: Any
+    raw: str
+
+
+class VerificationKeyCache:
+    """
+    LRU cache of verification keys with a TTL.
+
+    Lookups fall back from the election's ``verification_key`` config to the
+    ``default_verification_key`` config and then ``public/verification_key.json``. Each entry carries a content-derived
+    ``key_id`` that the snarkjs worker pool uses for its own key cache, so a
+    key crosses the process boundary once per worker.
+
+    Entries are dropped when a CryptoConfig row is written in this process.
+    The TTL bounds staleness for writes made by other processes.
+    """
+    # election_id (None for the default key) -> (entry, expires_at)
+    _entries: 'OrderedDict[Optional[int], Tuple[CachedVerificationKey, float]]' = OrderedDict()
+    _lock = threading.Lock()
+    _max_entries = Config.VERIFICATION_KEY_CACHE_SIZE
+    _ttl = Config.VERIFICATION_KEY_CACHE_TTL
+
+    @staticmethod
+    def _normalise_election_id(election_id) -> Optional[int]:
+        if election_id in (None, ''):
+            return None
+        try:
+            return int(election_id)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _load(election_id: Optional[int]) -> Optional[str]:
+        """
+        Read the verification key JSON from the database or the bundled file
+        """
+        if election_id is not None:
+            crypto_config = CryptoConfig.query.filter_by(
+                election_id=election_id,
+                key_type="verification_key"
+            ).first()
+            if crypto_config:
+                return crypto_config.public_key
+
+        default_key_config = CryptoConfig.query.filter_by(
+            key_type="default_verification_key"
+        ).first()
+        if default_key_config:
+            return default_key_config.public_key
+
+        if os.path.exists(DEFAULT_KEY_PATH):
+            with open(DEFAULT_KEY_PATH, 'r') as f:
+                return f.read()
+        return None
+
+    @classmethod
+    def get(cls, election_id=None) -> Optional[CachedVerificationKey]:
+        """
+        Get the verification key for an election, loading it on a miss
+
+        Args:
+            election_id: Election ID, or None for the default key
+
+        Returns:
+            The cached key, or None if no verification key is configured
+        """
+        election_id = cls._normalise_election_id(election_id)
+        now = time.monotonic()
+
+        with cls._lock:
+            cached = cls._entries.get(election_id)
+            if cached and cached[1] > now:
+                cls._entries.move_to_end(election_id)
+                return cached[0]
+
+        raw = cls._load(election_id)
+        if raw is None:
+            return None
+
+        try:
+            key: Any = json.loads(raw)
+        except (TypeError, json.JSONDecodeError):
+            logger.warning(f"Verification key for election {election_id} is not valid JSON")
+            key = raw
+        key_id = SnarkjsWorkerPool.key_id_for(key) if isinstance(key, dict) else ''
+        entry = CachedVerificationKey(key_id=key_id, key=key, raw=raw)
+
+        with cls._lock:
+            cls._entries[election_id] = (entry, now + cls._ttl)
+            cls._entries.move_to_end(election_id)
+            while len(cls._entries) > cls._max_entries:
+                cls._entries.popitem(last=False)
+        return entry
+
+    @classmethod
+    def invalidate(cls, election_id=None) -> None:
+        """
+        Drop the cached key of one election
+        """
+        with cls._lock:
+            cls._entries.pop(cls._normalise_election_id(election_id), None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop every cached key
+        """
+        with cls._lock:
+            cls._entries.clear()
+
+
+def _invalidate_for(target: CryptoConfig) -> None:
+    if target.key_type == "default_verification_key" or target.election_id is None:
+        # Every election without its own key falls back to the default one
+        VerificationKeyCache.clear()
+    else:
+        VerificationKeyCache.invalidate(target.election_id)
+
+
+@event.listens_for(CryptoConfig, 'after_insert')
+@event.listens_for(CryptoConfig, 'after_update')
+@event.listens_for(CryptoConfig, 'after_delete')
+def _crypto_config_changed(mapper, connection, target) -> None:
+    _invalidate_for(target)
+    # A row moved to another election also invalidates the election it left
+    for previous_election_id in inspect(target).attrs.election_id.history.deleted or ():
+        VerificationKeyCache.invalidate(previous_election_id)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _crypto_config_bulk_changed(orm_execute_state) -> None:
+    # Query.update()/delete() bypass the mapper events above
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_arguments.get('mapper')
+    if mapper is not None and mapper.class_ is CryptoConfig:
+        VerificationKeyCache.clear()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark the hot vote and waitlist lookups with and without the model indexes.
+
+Seeds a scratch database with synthetic ballots and waitlist entries, times each
+query shape on bare tables, then creates the indexes declared on Vote and
+ElectionWaitlist and times them again.
+
+Usage:
+    python benchmark_vote_indexes.py [--ballots 100000] [--positions 3] [--database-url URL]
+
+The database must not already contain votes or election_waitlist tables; by
+default a temporary SQLite file is used.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import (Column, DateTime, Index, Integer, MetaData, String, Table, Text,
+                        UniqueConstraint, create_engine, func, inspect, select, text)
+
+from app.models.vote import Vote
+from app.models.election_waitlist import ElectionWaitlist
+
+ELECTIONS = 20
+CANDIDATES_PER_POSITION = 4
+LOOKUPS = 300
+
+
+def build_tables(metadata):
+    """Bare copies of the columns the benchmarked queries touch, without any index"""
+    votes = Table(
+        'votes', metadata,
+        Column('vote_id', Integer, primary_key=True),
+        Column('election_id', Integer, nullable=False),
+        Column('student_id', String(10), nullable=False),
+        Column('candidate_id', Integer, nullable=False),
+        Column('position_id', Integer),
+        Column('encrypted_vote', Text, nullable=False),
+        Column('vote_status', String(50), nullable=False),
+    )
+    waitlist = Table(
+        'election_waitlist', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('election_id', Integer, nullable=False),
+        Column('voter_id', String(10), nullable=False),
+        Column('joined_at', DateTime),
+        Column('status', String(20)),
+    )
+    return votes, waitlist
+
+
+def model_indexes(model_table, bare_table):
+    """Recreate the indexes and unique constraints of a model table on its bare copy"""
+    indexes = []
+    for index in model_table.indexes:
+        indexes.append(Index(
+            index.name, *[bare_table.c[col.name] for col in index.columns],
+            unique=index.unique, **index.dialect_kwargs
+        ))
+    for constraint in model_table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            indexes.append(Index(
+                constraint.name, *[bare_table.c[col.name] for col in constraint.columns], unique=True
+            ))
+    return indexes
+
+
+def seed(engine, votes, waitlist, ballots, positions):
+    rng = random.Random(42)
+    voters_per_election = ballots // ELECTIONS
+    start = datetime(2024, 6, 1, 8, 0, 0)
+    vote_rows, waitlist_rows = [], []
+    with engine.begin() as conn:
+        for election_id in range(1, ELECTIONS + 1):
+            for n in range(voters_per_election):
+                student_id = f'{election_id:02d}-{n:05d}'
+                for position in range(positions):
+                    position_id = election_id * 100 + position
+                    vote_rows.append({
+                        'election_id': election_id,
+                        'student_id': student_id,
+                        'candidate_id': position_id * 10 + rng.randrange(CANDIDATES_PER_POSITION),
+                        'position_id': position_id,
+                        'encrypted_vote': '1',
+                        'vote_status': 'cast',
+                    })
+                waitlist_rows.append({
+                    'election_id': election_id,
+                    'voter_id': student_id,
+                    'joined_at': start + timedelta(seconds=n),
+                    'status': rng.choice(('waiting', 'active', 'done', 'done')),
+                })
+                if len(vote_rows) >= 20000:
+                    conn.execute(votes.insert(), vote_rows)
+                    vote_rows = []
+        if vote_rows:
+            conn.execute(votes.insert(), vote_rows)
+        conn.execute(waitlist.insert(), waitlist_rows)
+    return voters_per_election
+
+
+def query_shapes(votes, waitlist, voters_per_election, positions):
+    """Parameterised queries mirroring the controllers, each paired with a random-argument generator"""
+    def student():
+        election_id = random.randint(1, ELECTIONS)
+        return election_id, f'{election_id:02d}-{random.randrange(voters_per_election):05d}'
+
+    def candidate():
+        election_id = random.randint(1, ELECTIONS)
+        position_id = election_id * 100 + random.randrange(positions)
+        return election_id, position_id * 10 + random.randrange(CANDIDATES_PER_POSITION)
+
+    start = datetime(2024, 6, 1, 8, 0, 0)
+    return [
+        ('votes by (election_id, student_id)',
+         lambda: select(votes.c.vote_id).where(
+             votes.c.election_id == (s := student())[0], votes.c.student_id == s[1]).limit(1)),
+        ('votes count by (election_id, candidate_id)',
+         lambda: select(func.count()).select_from(votes).where(
+             votes.c.election_id == (c := candidate())[0], votes.c.candidate_id == c[1])),
+        ('votes count by election_id',
+         lambda: select(func.count()).select_from(votes).where(
+             votes.c.election_id == random.randint(1, ELECTIONS))),
+        ('waitlist position (election_id, status, joined_at)',
+         lambda: select(func.count()).select_from(waitlist).where(
+             waitlist.c.election_id == random.randint(1, ELECTIONS), waitlist.c.status == 'waiting',
+             waitlist.c.joined_at < start + timedelta(seconds=random.randrange(voters_per_election)))),
+        ('waitlist entry (election_id, voter_id, status)',
+         lambda: select(waitlist.c.id).where(
+             waitlist.c.election_id == (s := student())[0], waitlist.c.voter_id == s[1],
+             waitlist.c.status == 'waiting')),
+    ]
+
+
+def time_queries(engine, shapes):
+    timings = {}
+    with engine.connect() as conn:
+        for name, make in shapes:
+            random.seed(7)
+            statements = [make() for _ in range(LOOKUPS)]
+            began = time.perf_counter()
+            for statement in statements:
+                conn.execute(statement).all()
+            timings[name] = (time.perf_counter() - began) * 1000 / LOOKUPS
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ballots', type=int, default=100000, help='Ballots (voters who voted) to seed')
+    parser.add_argument('--positions', type=int, default=3, help='Votes per ballot')
+    parser.add_argument('--database-url', help='Scratch database URL (default: temporary SQLite file)')
+    args = parser.parse_args()
+
+    temp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        temp_dir = tempfile.mkdtemp()
+        database_url = f"sqlite:///{os.path.join(temp_dir, 'benchmark.db')}"
+    engine = create_engine(database_url)
+
+    existing = set(inspect(engine).get_table_names())
+    if existing & {'votes', 'election_waitlist'}:
+        sys.exit('Refusing to run: point --database-url at an empty scratch database')
+
+    metadata = MetaData()
+    votes, waitlist = build_tables(metadata)
+    metadata.create_all(engine)
+    try:
+        print(f'Seeding {args.ballots} ballots x {args.positions} positions into {engine.url.get_backend_name()}...')
+        began = time.perf_counter()
+        voters_per_election = seed(engine, votes, waitlist, args.ballots, args.positions)
+        print(f'Seeded in {time.perf_counter() - began:.1f}s')
+
+        shapes = query_shapes(votes, waitlist, voters_per_election, args.positions)
+        before = time_queries(engine, shapes)
+
+        began = time.perf_counter()
+        for index in model_indexes(Vote.__table__, votes) + model_indexes(ElectionWaitlist.__table__, waitlist):
+            index.create(engine)
+        with engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+        print(f'Created indexes in {time.perf_counter() - began:.1f}s')
+        after = time_queries(engine, shapes)
+
+        print()
+        print(f"{'Query':<52} {'no index (ms)':>14} {'indexed (ms)':>13} {'speedup':>9}")
+        print('-' * 91)
+        for name, _ in shapes:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            print(f'{name:<52} {before[name]:>14.3f} {after[name]:>13.3f} {speedup:>8.1f}x')
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
+        if temp_dir:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main()
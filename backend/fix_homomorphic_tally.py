@@ -27,6 +27,7 @@ from app.models.election_result import ElectionResult
 from app.models.election import Election
 from app.models.candidate import Candidate
 from app.models.crypto_config import CryptoConfig
+from app.services.tally import HomomorphicTallyEngine, VoteReader
 from phe import paillier
 
 # Configure logging
@@ -50,15 +51,14 @@ def analyze_election_state(election_id):
     print(f"Status: {election.election_status}")
     
     # Check votes
-    votes = Vote.query.filter_by(election_id=election_id).all()
-    print(f"Total votes in database: {len(votes)}")
+    vote_distribution = VoteReader.count_by_candidate(election_id)
+    print(f"Total votes in database: {sum(vote_distribution.values())}")
     
-    if not votes:
+    if not vote_distribution:
         print("❌ No votes found for this election")
         return False
     
     # Analyze vote distribution
-    vote_distribution = Counter(v.candidate_id for v in votes)
     print(f"Vote distribution by candidate:")
     for candidate_id, count in vote_distribution.items():
         candidate = Candidate.query.get(candidate_id)
@@ -141,11 +141,12 @@ def fix_homomorphic_tally(election_id):
     """
     print(f"\n=== FIXING HOMOMORPHIC TALLY FOR ELECTION {election_id} ===")
     
-    # Get all votes for this election
-    votes = Vote.query.filter_by(election_id=election_id).all()
-    print(f"Found {len(votes)} votes to tally")
+    # Count votes per candidate in the database
+    vote_distribution = VoteReader.count_by_candidate(election_id)
+    total_votes = sum(vote_distribution.values())
+    print(f"Found {total_votes} votes to tally")
     
-    if not votes:
+    if not total_votes:
         print("❌ No votes found for this election")
         return False
     
@@ -164,58 +165,43 @@ def fix_homomorphic_tally(election_id):
         print(f"❌ Error parsing public key: {e}")
         return False
     
-    # Group encrypted votes by candidate
-    candidate_totals = {}
-    for v in votes:
-        if v.candidate_id not in candidate_totals:
-            candidate_totals[v.candidate_id] = []
-        candidate_totals[v.candidate_id].append(v.encrypted_vote)
-    
-    print(f"Grouped votes for {len(candidate_totals)} candidates")
+    print(f"Streaming votes for {len(vote_distribution)} candidates")
     
     # Homomorphically add encrypted votes per candidate
     encrypted_results = {}
     encryption_errors = []
-    
-    for candidate_id, enc_votes in candidate_totals.items():
-        print(f"Processing {len(enc_votes)} encrypted votes for candidate {candidate_id}")
-        
-        enc_sum = None
-        valid_votes = 0
-        invalid_votes = 0
-        
-        for i, enc_vote in enumerate(enc_votes):
+    valid_votes = Counter()
+    invalid_votes = Counter()
+    
+    def valid_ciphertexts():
+        for i, (candidate_id, enc_vote) in enumerate(VoteReader.iter_ciphertexts(election_id)):
+            # Ensure encrypted vote is valid
+            if not enc_vote or len(enc_vote) < 10:
+                print(f"  Skipping invalid encrypted vote (index {i})")
+                invalid_votes[candidate_id] += 1
+                continue
             try:
-                # Ensure encrypted vote is valid
-                if not enc_vote or len(enc_vote) < 10:
-                    print(f"  Skipping invalid encrypted vote (index {i})")
-                    invalid_votes += 1
-                    continue
-                
-                # Create EncryptedNumber object
-                enc = paillier.EncryptedNumber(pubkey, int(enc_vote), 0)
-                
-                # Add to running sum
-                if enc_sum is None:
-                    enc_sum = enc
-                else:
-                    enc_sum = enc_sum + enc
-                
-                valid_votes += 1
-                if valid_votes % 10 == 0:
-                    print(f"  Processed {valid_votes}/{len(enc_votes)} votes")
-                
+                ciphertext = int(enc_vote)
             except Exception as e:
                 error_msg = f"Error processing encrypted vote {i} for candidate {candidate_id}: {e}"
                 print(f"  ❌ {error_msg}")
                 encryption_errors.append(error_msg)
-                invalid_votes += 1
-        
-        if enc_sum:
+                invalid_votes[candidate_id] += 1
+                continue
+            valid_votes[candidate_id] += 1
+            yield candidate_id, ciphertext
+    
+    engine = HomomorphicTallyEngine(pubkey.n)
+    raw_totals = engine.tally_stream(valid_ciphertexts())
+    print(f"Tally stats: {engine.last_stats}")
+    
+    for candidate_id in vote_distribution:
+        if candidate_id in raw_totals:
+            enc_sum = paillier.EncryptedNumber(pubkey, raw_totals[candidate_id], 0)
             encrypted_results[candidate_id] = str(enc_sum.ciphertext())
-            print(f"✅ Successfully tallied {valid_votes} votes for candidate {candidate_id}")
-            if invalid_votes > 0:
-                print(f"  ⚠️ {invalid_votes} votes were invalid and skipped")
+            print(f"✅ Successfully tallied {valid_votes[candidate_id]} votes for candidate {candidate_id}")
+            if invalid_votes[candidate_id] > 0:
+                print(f"  ⚠️ {invalid_votes[candidate_id]} votes were invalid and skipped")
         else:
             print(f"❌ Failed to tally votes for candidate {candidate_id}")
     
@@ -293,8 +279,7 @@ def verify_results(election_id):
     print(f"\n=== VERIFYING ELECTION {election_id} RESULTS ===")
     
     # Get the actual vote distribution
-    votes = Vote.query.filter_by(election_id=election_id).all()
-    vote_distribution = Counter(v.candidate_id for v in votes)
+    vote_distribution = VoteReader.count_by_candidate(election_id)
     
     # Check current election results
     results = ElectionResult.query.filter_by(election_id=election_id).all()
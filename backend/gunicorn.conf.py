@@ -0,0 +1,23 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for serving wsgi:app in production.
+
+Every worker process serves requests, so every worker starts the background
+services itself: threads and process pools started in the gunicorn master
+would not survive the fork into the workers (with or without --preload).
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+# Waitlist event streams (SSE) stay open for a voter's whole wait. Threaded workers give each
+# stream a thread; sync workers would give each one a whole worker process. Size the threads
+# for the expected number of waiting voters per worker
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '64'))
+
+
+def post_worker_init(worker):
+    # Called in the worker once its app is loaded, before it accepts requests
+    from app import start_background_services
+    start_background_services(worker.wsgi)
@@ -0,0 +1,38 @@
+"""Add running_tallies table for incremental homomorphic tallying
+
+Revision ID: 20240601_running_tallies
+Revises: 20240518_add_key_type
+Create Date: 2024-06-01 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240601_running_tallies'
+down_revision = '20240518_add_key_type'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'running_tallies',
+        sa.Column('tally_id', sa.Integer(), nullable=False),
+        sa.Column('election_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('crypto_id', sa.Integer(), nullable=False),
+        sa.Column('encrypted_product', sa.Text(), nullable=False),
+        sa.Column('ballot_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['election_id'], ['elections.election_id']),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.candidate_id']),
+        sa.ForeignKeyConstraint(['crypto_id'], ['crypto_configs.crypto_id']),
+        sa.PrimaryKeyConstraint('tally_id'),
+        sa.UniqueConstraint('election_id', 'candidate_id', name='unique_running_tally_candidate')
+    )
+
+
+def downgrade():
+    op.drop_table('running_tallies')
@@ -0,0 +1,28 @@
+"""Add composite queue index to election_waitlist
+
+Revision ID: 20240602_waitlist_queue_index
+Revises: 20240601_running_tallies
+Create Date: 2024-06-02 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240602_waitlist_queue_index'
+down_revision = '20240601_running_tallies'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_election_waitlist_queue',
+        'election_waitlist',
+        ['election_id', 'status', 'joined_at', 'id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_election_waitlist_queue', table_name='election_waitlist')
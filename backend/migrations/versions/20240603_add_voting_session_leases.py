@@ -0,0 +1,44 @@
+"""Add voting_session_leases table for heartbeat-based session expiry
+
+Revision ID: 20240603_voting_session_leases
+Revises: 20240602_waitlist_queue_index
+Create Date: 2024-06-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240603_voting_session_leases'
+down_revision = '20240602_waitlist_queue_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'voting_session_leases',
+        sa.Column('lease_id', sa.Integer(), nullable=False),
+        sa.Column('election_id', sa.Integer(), nullable=False),
+        sa.Column('voter_id', sa.String(length=10), nullable=False),
+        sa.Column('holds_slot', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='active'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('renewed_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['election_id'], ['elections.election_id']),
+        sa.ForeignKeyConstraint(['voter_id'], ['voters.student_id']),
+        sa.PrimaryKeyConstraint('lease_id'),
+        sa.UniqueConstraint('election_id', 'voter_id', name='unique_voting_session_lease')
+    )
+    op.create_index(
+        'ix_voting_session_leases_status_expires',
+        'voting_session_leases',
+        ['status', 'expires_at']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_voting_session_leases_status_expires', table_name='voting_session_leases')
+    op.drop_table('voting_session_leases')
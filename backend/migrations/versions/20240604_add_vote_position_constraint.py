@@ -0,0 +1,87 @@
+"""Add votes.position_id with a one-vote-per-position constraint and elections.ballots_cast
+
+The upgrade stops before changing anything if a student already has more
+than one vote for a position, listing those (election_id, student_id,
+position_id) rows; the extra votes must be resolved by hand first.
+
+Revision ID: 20240604_vote_position_unique
+Revises: 20240603_voting_session_leases
+Create Date: 2024-06-04 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240604_vote_position_unique'
+down_revision = '20240603_voting_session_leases'
+branch_labels = None
+depends_on = None
+
+# Duplicate groups listed in the error message
+MAX_REPORTED_DUPLICATES = 50
+
+
+def _check_duplicate_votes(bind):
+    """Fail with the (election_id, student_id, position_id) rows the unique constraint would reject"""
+    rows = bind.execute(sa.text(
+        """
+        SELECT votes.election_id, votes.student_id, candidates.position_id, COUNT(*)
+        FROM votes JOIN candidates ON candidates.candidate_id = votes.candidate_id
+        GROUP BY votes.election_id, votes.student_id, candidates.position_id
+        HAVING COUNT(*) > 1
+        ORDER BY votes.election_id, votes.student_id, candidates.position_id
+        """
+    )).fetchall()
+    if not rows:
+        return
+    listed = '\n'.join(
+        f"  election_id={election_id} student_id={student_id} position_id={position_id}: {count} votes"
+        for election_id, student_id, position_id, count in rows[:MAX_REPORTED_DUPLICATES]
+    )
+    more = len(rows) - MAX_REPORTED_DUPLICATES
+    if more > 0:
+        listed += f"\n  ... and {more} more"
+    raise RuntimeError(
+        f"Cannot add unique_vote_per_position: {len(rows)} (election_id, student_id, position_id) "
+        f"groups have more than one vote. Keep one vote per position for these voters and run "
+        f"the upgrade again:\n{listed}"
+    )
+
+
+def upgrade():
+    _check_duplicate_votes(op.get_bind())
+
+    op.add_column('votes', sa.Column('position_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('votes_position_id_fkey', 'votes', 'positions', ['position_id'], ['position_id'])
+    op.execute(
+        """
+        UPDATE votes
+        SET position_id = (
+            SELECT candidates.position_id FROM candidates
+            WHERE candidates.candidate_id = votes.candidate_id
+        )
+        """
+    )
+    op.create_unique_constraint(
+        'unique_vote_per_position', 'votes', ['election_id', 'student_id', 'position_id']
+    )
+
+    op.add_column('elections', sa.Column('ballots_cast', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        """
+        UPDATE elections
+        SET ballots_cast = (
+            SELECT COUNT(DISTINCT votes.student_id) FROM votes
+            WHERE votes.election_id = elections.election_id
+        )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('elections', 'ballots_cast')
+    op.drop_constraint('unique_vote_per_position', 'votes', type_='unique')
+    op.drop_constraint('votes_position_id_fkey', 'votes', type_='foreignkey')
+    op.drop_column('votes', 'position_id')
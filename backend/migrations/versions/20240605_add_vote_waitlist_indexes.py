@@ -0,0 +1,36 @@
+"""Add composite indexes for vote and waitlist lookups and a partial unique index on votes
+
+Revision ID: 20240605_vote_waitlist_indexes
+Revises: 20240604_vote_position_unique
+Create Date: 2024-06-05 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240605_vote_waitlist_indexes'
+down_revision = '20240604_vote_position_unique'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (election_id, student_id) and election_id alone are served by unique_vote_per_position,
+    # election_results (election_id, candidate_id) by unique_election_candidate
+    op.create_index('ix_votes_election_candidate', 'votes', ['election_id', 'candidate_id'])
+    op.create_index(
+        'uq_votes_unpositioned_candidate',
+        'votes',
+        ['election_id', 'student_id', 'candidate_id'],
+        unique=True,
+        postgresql_where=sa.text('position_id IS NULL')
+    )
+    op.create_index('ix_election_waitlist_voter', 'election_waitlist', ['election_id', 'voter_id', 'status'])
+
+
+def downgrade():
+    op.drop_index('ix_election_waitlist_voter', table_name='election_waitlist')
+    op.drop_index('uq_votes_unpositioned_candidate', table_name='votes')
+    op.drop_index('ix_votes_election_candidate', table_name='votes')
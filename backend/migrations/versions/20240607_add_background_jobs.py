@@ -0,0 +1,46 @@
+"""Add background_jobs table for queued long-running operations
+
+Revision ID: 20240607_background_jobs
+Revises: 20240606_binary_ciphertexts
+Create Date: 2024-06-07 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240607_background_jobs'
+down_revision = '20240606_binary_ciphertexts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'background_jobs',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('election_id', sa.Integer(), nullable=True),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('progress', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('progress_message', sa.String(length=255), nullable=True),
+        sa.Column('timings', sa.Text(), nullable=True),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_background_jobs_status_created', 'background_jobs', ['status', 'created_at'])
+    op.create_index('ix_background_jobs_election', 'background_jobs', ['election_id'])
+
+
+def downgrade():
+    op.drop_index('ix_background_jobs_election', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_status_created', table_name='background_jobs')
+    op.drop_table('background_jobs')
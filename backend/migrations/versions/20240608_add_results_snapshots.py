@@ -0,0 +1,33 @@
+"""Add results_snapshots table for precomputed results of finished elections
+
+Revision ID: 20240608_results_snapshots
+Revises: 20240607_background_jobs
+Create Date: 2024-06-08 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240608_results_snapshots'
+down_revision = '20240607_background_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'results_snapshots',
+        sa.Column('election_id', sa.Integer(), nullable=False),
+        sa.Column('view', sa.String(length=20), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('source_version', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('election_id', 'view')
+    )
+
+
+def downgrade():
+    op.drop_table('results_snapshots')
@@ -0,0 +1,45 @@
+"""Add activity_rollups and activity_rollup_state for dashboard time series
+
+Revision ID: 20240609_activity_rollups
+Revises: 20240608_results_snapshots
+Create Date: 2024-06-09 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20240609_activity_rollups'
+down_revision = '20240608_results_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'activity_rollups',
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('election_id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(length=10), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'election_id', 'source', 'action')
+    )
+    op.create_index('ix_activity_rollups_granularity_bucket', 'activity_rollups', ['granularity', 'bucket_start'])
+    op.create_table(
+        'activity_rollup_state',
+        sa.Column('source', sa.String(length=10), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('source')
+    )
+    op.create_index('ix_votes_cast_time', 'votes', ['cast_time'])
+
+
+def downgrade():
+    op.drop_index('ix_votes_cast_time', table_name='votes')
+    op.drop_table('activity_rollup_state')
+    op.drop_index('ix_activity_rollups_granularity_bucket', table_name='activity_rollups')
+    op.drop_table('activity_rollups')
@@ -1,5 +1,7 @@
 # run.py
-from app import create_app, db
+import os
+
+from app import create_app, db, start_background_services
 
 app = create_app()
 
@@ -7,4 +9,10 @@ if __name__ == "__main__":
     with app.app_context():
         # Create database tables if they don't exist
         db.create_all()
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    # Development server; production uses gunicorn with wsgi.py and gunicorn.conf.py.
+    # With debug on, the reloader re-runs this file in a child process that serves requests;
+    # only that child starts the background services, not the parent that watches for changes
+    debug = os.getenv('FLASK_DEBUG', 'True') == 'True'
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services(app)
+    app.run(debug=debug, host="0.0.0.0", port=5000)
\ No newline at end of file
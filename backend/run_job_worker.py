@@ -0,0 +1,36 @@
+# run_job_worker.py
+"""
+Run background job workers outside the web server.
+
+The web server starts no workers unless JOB_WORKER_PROCESSES is set, so
+start this next to it, e.g.
+    python run_job_worker.py --processes 2
+
+Jobs with secret parameters (decrypt_tally) run in the web process that
+queued them and are never picked up here. This process also runs the
+activity rollup compactor for the admin dashboard.
+"""
+import argparse
+
+from app import create_app
+from app.config import Config
+from app.services.dashboard import ActivityRollups
+from app.services.jobs import JobWorkerPool, run_worker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run background job workers')
+    parser.add_argument('--processes', type=int, default=max(1, Config.JOB_WORKER_PROCESSES),
+                        help='Worker processes to run')
+    args = parser.parse_args()
+
+    # One compactor per job runner folds new votes and audit log entries into the dashboard's activity rollups
+    ActivityRollups.start(create_app())
+
+    if args.processes == 1:
+        run_worker()
+    else:
+        JobWorkerPool.start(processes=args.processes)
+        try:
+            JobWorkerPool.join()
+        except KeyboardInterrupt:
+            JobWorkerPool.stop()
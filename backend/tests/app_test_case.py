@@ -0,0 +1,48 @@
+"""
+Shared fixture: the application from create_app() on a temporary SQLite database
+"""
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+from datetime import datetime
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+# create_app() reads these without defaults
+for name, value in (('SESSION_TIMEOUT_MINUTES', '30'), ('MAIL_PORT', '587'),
+                    ('CORS_ORIGINS', 'http://localhost:3000')):
+    os.environ.setdefault(name, value)
+
+from app import create_app, db
+from app.models.voter import Voter
+
+class AppTestCase(unittest.TestCase):
+    """Runs each test against create_app() with every table in a fresh file-backed SQLite database"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(self.test_dir, 'test.db')}"
+        })
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.test_dir)
+
+    def add_voters(self, *voters):
+        """Insert (student_id, college_id) voters with placeholder personal details"""
+        db.session.execute(Voter.__table__.insert(), [
+            {'student_id': student_id, 'college_id': college_id, 'student_email': f'{student_id}@example.com',
+             'lastname': 'Voter', 'firstname': student_id, 'status': 'Enrolled', 'updated_at': datetime.utcnow()}
+            for student_id, college_id in voters
+        ])
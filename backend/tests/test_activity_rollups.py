@@ -0,0 +1,92 @@
+"""
+Test suite for ActivityRollups
+"""
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.vote import Vote
+from app.models.audit_log import AuditLog
+from app.models.activity_rollup import ActivityRollup
+from app.models.activity_rollup_state import ActivityRollupState
+from app.services.dashboard import ActivityRollups
+
+class TestActivityRollups(AppTestCase):
+    """Test cases for compacting and reading vote/audit activity rollups"""
+
+    def setUp(self):
+        super().setUp()
+        self.now = datetime.utcnow().replace(second=30, microsecond=0) - timedelta(minutes=10)
+        self.votes = 0
+
+    def add_vote(self, student_id, cast_time, election_id=1):
+        self.votes += 1
+        db.session.add(Vote(election_id=election_id, student_id=student_id, candidate_id=self.votes,
+                            position_id=self.votes, encrypted_vote='0', vote_status='cast', cast_time=cast_time))
+
+    def rollup(self, granularity, source='vote'):
+        return {
+            (row.bucket_start, row.election_id, row.action): row.count
+            for row in ActivityRollup.query.filter_by(granularity=granularity, source=source)
+        }
+
+    def test_compaction_counts_each_bucket_once(self):
+        """Minute, hour and day buckets are counted, and compacting again adds nothing"""
+        minute = self.now.replace(second=0)
+        self.add_vote('2024-00001', self.now)
+        self.add_vote('2024-00002', self.now + timedelta(seconds=10))
+        self.add_vote('2024-00003', self.now + timedelta(minutes=1), election_id=2)
+        db.session.add_all([
+            AuditLog(election_id=1, student_id='2024-00001', action='Vote cast', log_time=self.now),
+            AuditLog(election_id=2, action='Login', log_time=self.now)
+        ])
+        db.session.commit()
+
+        self.assertEqual(ActivityRollups.compact(batch_size=2, settle_seconds=0), {'vote': 3, 'audit': 2})
+        self.assertEqual(ActivityRollups.compact(batch_size=2, settle_seconds=0), {'vote': 0, 'audit': 0})
+
+        self.assertEqual(self.rollup('minute'), {
+            (minute, 1, 'vote_cast'): 2,
+            (minute + timedelta(minutes=1), 2, 'vote_cast'): 1
+        })
+        self.assertEqual(sum(self.rollup('hour').values()), 3)
+        self.assertEqual(self.rollup('day')[(minute.replace(hour=0, minute=0), 1, 'vote_cast')], 2)
+        self.assertEqual(self.rollup('minute', source='audit'), {(minute, 1, 'Vote cast'): 1, (minute, 2, 'Login'): 1})
+        self.assertEqual(ActivityRollupState.query.filter_by(source='vote').one().last_id, 3)
+
+    def test_readers_include_rows_not_yet_compacted(self):
+        """Readers add the rows past the watermark, and the settle window holds back recent rows"""
+        self.add_vote('2024-00001', self.now - timedelta(days=40))
+        self.add_vote('2024-00001', self.now)
+        db.session.commit()
+        ActivityRollups.compact(settle_seconds=0)
+        # Cast after the compaction, and too recent for the next one
+        self.add_vote('2024-00002', datetime.utcnow())
+        db.session.add(AuditLog(election_id=1, action='Login', log_time=self.now))
+        db.session.commit()
+        self.assertEqual(ActivityRollups.compact(settle_seconds=3600), {'vote': 0, 'audit': 0})
+
+        self.assertEqual(ActivityRollups.count_since(self.now - timedelta(hours=1)), 2)
+        # Slots are read at minute resolution
+        minute = self.now.replace(second=0)
+        self.assertEqual(ActivityRollups.counts_by_slot([minute - timedelta(hours=1), minute], timedelta(hours=1)),
+                         [0, 3])
+        self.assertEqual(ActivityRollups.counts_by_slot([minute - timedelta(hours=1), minute], timedelta(hours=1),
+                                                        sources=('vote',)), [0, 2])
+
+        months = [(self.now.year, self.now.month)]
+        self.assertEqual(ActivityRollups.distinct_voters_by_month(months), {months[0]: 1})
+        ActivityRollups.compact(settle_seconds=0)
+        self.assertEqual(ActivityRollups.distinct_voters_by_month(months), {months[0]: 2})
+        self.assertEqual(ActivityRollups.count_since(self.now - timedelta(hours=1)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Test suite for the single-statement ballot insert in ElectionCastController
+"""
+import unittest
+import sys
+import os
+from datetime import date
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from phe import paillier
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from app_test_case import AppTestCase
+from app import db
+from app.models.election import Election
+from app.models.candidate import Candidate
+from app.models.vote import Vote
+from app.controllers.election_cast_controller import ElectionCastController
+from app.services.crypto import CachedPaillierKey
+from app.services.tally import VoteReader
+
+class TestBallotInsert(AppTestCase):
+    """Test cases for ElectionCastController._insert_ballot"""
+
+    def setUp(self):
+        super().setUp()
+
+        elections = [
+            Election(org_id=1, election_name=name, election_status='Ongoing',
+                     date_start=date.today(), date_end=date.today())
+            for name in ('Council', 'Other')
+        ]
+        db.session.add_all(elections)
+        db.session.flush()
+        self.election_id = elections[0].election_id
+        self.president = Candidate(election_id=self.election_id, fullname='A', position_id=1)
+        self.president_2 = Candidate(election_id=self.election_id, fullname='B', position_id=1)
+        self.secretary = Candidate(election_id=self.election_id, fullname='C', position_id=2)
+        self.foreign = Candidate(election_id=elections[1].election_id, fullname='D', position_id=3)
+        db.session.add_all([self.president, self.president_2, self.secretary, self.foreign])
+        db.session.commit()
+
+    def ballot(self, *candidates):
+        return [{'candidate_id': c.candidate_id, 'encrypted_vote': '12345', 'zkp_proof': {'pi_a': []}}
+                for c in candidates]
+
+    def test_ballot_inserted_with_candidate_positions(self):
+        """All votes land in one statement and take position_id from the candidate"""
+        inserted = ElectionCastController._insert_ballot(
+            self.election_id, '2024-00001', self.ballot(self.president, self.secretary))
+        db.session.commit()
+
+        self.assertEqual(sorted(c for _, c in inserted),
+                         sorted([self.president.candidate_id, self.secretary.candidate_id]))
+        stored = {v.candidate_id: (v.position_id, v.zkp_proof, v.vote_status) for v in Vote.query.all()}
+        self.assertEqual(stored[self.president.candidate_id], (1, 'verified_with_proof', 'cast'))
+        self.assertEqual(stored[self.secretary.candidate_id], (2, 'verified_with_proof', 'cast'))
+
+    def test_repeat_ballot_and_foreign_candidates_insert_nothing(self):
+        """A second ballot from the same voter or a candidate from another election adds no rows"""
+        ElectionCastController._insert_ballot(self.election_id, '2024-00001', self.ballot(self.president))
+        db.session.commit()
+
+        self.assertEqual(ElectionCastController._insert_ballot(
+            self.election_id, '2024-00001', self.ballot(self.secretary)), [])
+        self.assertEqual(ElectionCastController._insert_ballot(
+            self.election_id, '2024-00002', self.ballot(self.foreign)), [])
+        db.session.commit()
+        self.assertEqual(Vote.query.count(), 1)
+
+    def test_ciphertexts_stored_as_fixed_width_bytes(self):
+        """With the election key, ciphertexts are also stored as bytes and read back as integers"""
+        public_key, _ = paillier.generate_paillier_keypair(n_length=512)
+        key = CachedPaillierKey(crypto_id=1, public_key=public_key, nsquare=public_key.nsquare)
+        ciphertext = public_key.encrypt(1).ciphertext()
+        ballot = [{'candidate_id': self.president.candidate_id, 'encrypted_vote': str(ciphertext)}]
+
+        ElectionCastController._insert_ballot(self.election_id, '2024-00001', ballot, key)
+        db.session.commit()
+
+        stored = Vote.query.one()
+        self.assertEqual(len(stored.encrypted_vote_bytes), (public_key.nsquare.bit_length() + 7) // 8)
+        self.assertEqual(list(VoteReader.iter_ciphertext_values(self.election_id)),
+                         [(self.president.candidate_id, ciphertext)])
+
+    def test_ballot_without_key_casts_null_bytes(self):
+        """Without an election key, a multi-position ballot stores NULL bytes typed as bytea"""
+        ballot = self.ballot(self.president, self.secretary)
+        sql = str(ElectionCastController._ballot_statement(self.election_id, '2024-00001', ballot)
+                  .compile(dialect=postgresql.dialect()))
+        self.assertIn('UNION ALL', sql)
+        self.assertEqual(sql.count('AS BYTEA)'), 2)
+
+        ElectionCastController._insert_ballot(self.election_id, '2024-00001', ballot)
+        db.session.commit()
+        self.assertEqual([v.encrypted_vote_bytes for v in Vote.query.all()], [None, None])
+
+    def test_find_malformed_checks_ciphertexts_without_bytes(self):
+        """Ballots stored without bytes are checked against the election key"""
+        public_key, _ = paillier.generate_paillier_keypair(n_length=512)
+        key = CachedPaillierKey(crypto_id=1, public_key=public_key, nsquare=public_key.nsquare)
+        valid = public_key.encrypt(1).ciphertext()
+        for student_id, candidate, ciphertext in (('2024-00001', self.president, str(valid)),
+                                                  ('2024-00002', self.president, str(public_key.n * 5)),
+                                                  ('2024-00003', self.secretary, '123')):
+            ElectionCastController._insert_ballot(
+                self.election_id, student_id, [{'candidate_id': candidate.candidate_id, 'encrypted_vote': ciphertext}])
+        db.session.commit()
+        ids = {v.student_id: v.vote_id for v in Vote.query.all()}
+
+        self.assertEqual(VoteReader.find_malformed(self.election_id), [ids['2024-00003']])
+        self.assertEqual(sorted(VoteReader.find_malformed(self.election_id, paillier_key=key)),
+                         sorted([ids['2024-00002'], ids['2024-00003']]))
+
+    def test_encoded_ciphertexts_leave_decoding_to_the_caller(self):
+        """A malformed ballot is streamed as stored instead of ending the stream"""
+        for student_id, candidate, ciphertext in (('2024-00001', self.president, 'not-a-number'),
+                                                  ('2024-00002', self.president, '12345')):
+            ElectionCastController._insert_ballot(
+                self.election_id, student_id, [{'candidate_id': candidate.candidate_id, 'encrypted_vote': ciphertext}])
+        db.session.commit()
+
+        rows = list(VoteReader.iter_encoded_ciphertexts(self.election_id, self.president.candidate_id))
+        self.assertEqual(sorted(text for _, _, text in rows), ['12345', 'not-a-number'])
+        with self.assertRaises(ValueError):
+            list(VoteReader.iter_ciphertext_values(self.election_id))
+
+    def test_two_votes_for_one_position_violate_constraint(self):
+        """The unique constraint rejects two votes for the same position"""
+        with self.assertRaises(IntegrityError):
+            ElectionCastController._insert_ballot(
+                self.election_id, '2024-00001', self.ballot(self.president, self.president_2))
+        db.session.rollback()
+        self.assertEqual(Vote.query.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Test suite for BatchDecryptor
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from phe import paillier
+from app.services.tally import BatchDecryptor
+
+class TestBatchDecryptor(unittest.TestCase):
+    """Test cases for batch CRT decryption"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generate a small key pair once for all tests"""
+        cls.public_key, cls.private_key = paillier.generate_paillier_keypair(n_length=512)
+
+    def encrypt(self, value):
+        return self.public_key.encrypt(value).ciphertext()
+
+    def test_matches_phe_decrypt(self):
+        """Batch results equal PaillierPrivateKey.decrypt, including negative values"""
+        values = {candidate_id: value for candidate_id, value in enumerate([0, 1, 7, 250, -3])}
+        ciphertexts = {k: self.encrypt(v) for k, v in values.items()}
+
+        decryptor = BatchDecryptor(self.private_key, max_workers=1)
+        plaintexts = decryptor.decrypt_all(ciphertexts)
+
+        self.assertEqual({k: decryptor.decode(p) for k, p in plaintexts.items()}, values)
+        for k, c in ciphertexts.items():
+            self.assertEqual(decryptor.decode(plaintexts[k]),
+                             self.private_key.decrypt(paillier.EncryptedNumber(self.public_key, c, 0)))
+
+    def test_parallel_batch(self):
+        """Large batches are split over worker processes with the same results"""
+        values = {candidate_id: candidate_id * 3 for candidate_id in range(12)}
+        decryptor = BatchDecryptor(self.private_key, max_workers=2, parallel_threshold=4)
+        plaintexts = decryptor.decrypt_all({k: self.encrypt(v) for k, v in values.items()})
+
+        self.assertEqual(decryptor.last_stats['workers'], 2)
+        self.assertEqual({k: decryptor.decode(p) for k, p in plaintexts.items()}, values)
+
+if __name__ == '__main__':
+    unittest.main()
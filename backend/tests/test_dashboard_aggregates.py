@@ -0,0 +1,115 @@
+"""
+Test suite for DashboardAggregates
+"""
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from sqlalchemy import event
+from app_test_case import AppTestCase
+from app import db
+from app.models.organization import Organization
+from app.models.election import Election
+from app.models.election_result import ElectionResult
+from app.models.vote import Vote
+from app.models.audit_log import AuditLog
+from app.services.access import EligibleVoterCounts
+from app.services.dashboard import DashboardAggregates
+
+class TestDashboardAggregates(AppTestCase):
+    """Test cases for the grouped dashboard sections"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_voters(('2024-00001', 1))
+        DashboardAggregates.clear()
+        EligibleVoterCounts.clear()
+
+        now = datetime.now()
+        today = now.date()
+        org = Organization(org_name='Student Council')
+        db.session.add(org)
+        db.session.flush()
+        elections = {}
+        for name, start, end, rate in (('Finished', -10, -2, 40.0), ('Running', -1, 1, None),
+                                       ('Upcoming', 3, 5, None), ('Untallied', -8, -3, None)):
+            elections[name] = Election(org_id=org.org_id, election_name=name, election_status='Ongoing',
+                                       date_start=today + timedelta(days=start),
+                                       date_end=today + timedelta(days=end), participation_rate=rate)
+        db.session.add_all(elections.values())
+        db.session.flush()
+        db.session.add(ElectionResult(election_id=elections['Finished'].election_id, candidate_id=1, vote_count=3))
+
+        running = elections['Running'].election_id
+        recent = now - timedelta(minutes=1)
+        for i, (student_id, cast_time) in enumerate((('2024-00001', recent), ('2024-00002', recent),
+                                                     ('2024-00001', recent),
+                                                     ('2024-00003', now - timedelta(days=62)))):
+            db.session.add(Vote(election_id=running, student_id=student_id, candidate_id=i, position_id=i,
+                                encrypted_vote='0', vote_status='cast', cast_time=cast_time))
+        db.session.add_all([
+            AuditLog(election_id=running, student_id='2024-00001', action='Vote cast',
+                     log_time=recent + timedelta(seconds=1)),
+            AuditLog(election_id=running, action='Tally started', log_time=recent)
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        DashboardAggregates.clear()
+        EligibleVoterCounts.clear()
+        super().tearDown()
+
+    def count_queries(self, fn):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return result, len(statements)
+
+    def test_sections(self):
+        """Each section matches counts taken by hand"""
+        data, queries = self.count_queries(DashboardAggregates.dashboard)
+        self.assertLessEqual(queries, 10)
+
+        self.assertEqual(data['stats'], {'activeElections': 2, 'registeredVoters': 1,
+                                         'completedElections': 1, 'averageParticipation': 40.0})
+        activity = data['electionActivity']
+        self.assertEqual(len(activity), 7)
+        # Three, two and zero days ago
+        self.assertEqual({k: activity[3][k] for k in ('ongoing', 'completed', 'scheduled')},
+                         {'ongoing': 2, 'completed': 1, 'scheduled': 2})
+        self.assertEqual({k: activity[4][k] for k in ('ongoing', 'completed', 'scheduled')},
+                         {'ongoing': 1, 'completed': 1, 'scheduled': 2})
+        self.assertEqual({k: activity[6][k] for k in ('ongoing', 'completed', 'scheduled')},
+                         {'ongoing': 1, 'completed': 0, 'scheduled': 1})
+
+        self.assertEqual(data['voterEngagement'][-1]['active'], 2)
+        self.assertEqual(sum(month['active'] for month in data['voterEngagement']), 3)
+        self.assertEqual(data['systemLoad'][-1]['traffic'], 5)
+
+        self.assertEqual([(a['action'], a['user']) for a in data['recentActivity']],
+                         [('Vote cast for Running', 'Voter (2024-00001)'),
+                          ('Tally started for Running', 'System (automated)')])
+        messages = [alert['message'] for alert in data['systemAlerts']]
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(messages[0].startswith('Election "Running" ends in'))
+        self.assertEqual(messages[1], 'Results pending for completed election "Untallied"')
+
+    def test_sections_are_cached(self):
+        """A refresh within the TTL runs no queries"""
+        first = DashboardAggregates.dashboard()
+        second, queries = self.count_queries(DashboardAggregates.dashboard)
+        self.assertEqual(queries, 0)
+        self.assertEqual(first, second)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Test suite for EligibleVoterCounts
+"""
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.voter import Voter
+from app.services.access import EligibleVoterCounts
+
+class TestEligibleVoterCounts(AppTestCase):
+    """Test cases for the cached eligible-voter counts"""
+
+    def setUp(self):
+        super().setUp()
+        self.add_voters(('2024-00001', 1), ('2024-00002', 1), ('2024-00003', 2))
+        db.session.commit()
+        EligibleVoterCounts.clear()
+
+    def tearDown(self):
+        EligibleVoterCounts.clear()
+        super().tearDown()
+
+    def test_counts_per_college_and_overall(self):
+        """One grouped query serves every college and the all-college total"""
+        with patch.object(EligibleVoterCounts, '_load', wraps=EligibleVoterCounts._load) as load:
+            self.assertEqual(EligibleVoterCounts.count(1), 2)
+            self.assertEqual(EligibleVoterCounts.count(2), 1)
+            self.assertEqual(EligibleVoterCounts.count(3), 0)
+            self.assertEqual(EligibleVoterCounts.count(), 3)
+        self.assertEqual(load.call_count, 1)
+
+    def test_bulk_voter_change_invalidates(self):
+        """Moving voters between colleges is visible after commit"""
+        self.assertEqual(EligibleVoterCounts.count(2), 1)
+        Voter.query.filter(Voter.student_id == '2024-00001').update(
+            {'college_id': 2}, synchronize_session=False)
+        db.session.commit()
+        self.assertEqual(EligibleVoterCounts.count(1), 1)
+        self.assertEqual(EligibleVoterCounts.count(2), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Test suite for HomomorphicTallyEngine
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from phe import paillier
+from app.services.tally.homomorphic_tally import HomomorphicTallyEngine
+
+class TestHomomorphicTallyEngine(unittest.TestCase):
+    """Test cases for HomomorphicTallyEngine"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generate a small key pair and a set of ballots once for all tests"""
+        cls.public_key, cls.private_key = paillier.generate_paillier_keypair(n_length=512)
+        cls.ballots = {
+            1: [cls.public_key.encrypt(1).ciphertext() for _ in range(23)],
+            2: [cls.public_key.encrypt(1).ciphertext() for _ in range(7)],
+            3: [cls.public_key.encrypt(1).ciphertext()],
+        }
+
+    def sequential_sum(self, ciphertexts):
+        """Reference implementation: the original one-by-one phe addition"""
+        enc_sum = None
+        for c in ciphertexts:
+            enc = paillier.EncryptedNumber(self.public_key, c, 0)
+            enc_sum = enc if enc_sum is None else enc_sum + enc
+        return enc_sum.ciphertext(be_secure=False)
+
+    def test_matches_sequential_sum(self):
+        """Chunked totals must equal the sequential phe sum exactly"""
+        engine = HomomorphicTallyEngine(self.public_key.n, chunk_size=4, max_workers=1)
+        totals = engine.tally(self.ballots)
+
+        for candidate_id, ciphertexts in self.ballots.items():
+            self.assertEqual(totals[candidate_id], self.sequential_sum(ciphertexts))
+
+    def test_process_pool_decrypts_to_vote_counts(self):
+        """Totals computed in the process pool decrypt to the ballot counts"""
+        engine = HomomorphicTallyEngine(self.public_key.n, chunk_size=3, max_workers=2)
+        totals = engine.tally(self.ballots)
+
+        for candidate_id, ciphertexts in self.ballots.items():
+            decrypted = self.private_key.decrypt(paillier.EncryptedNumber(self.public_key, totals[candidate_id], 0))
+            self.assertEqual(decrypted, len(ciphertexts))
+        self.assertEqual(engine.last_stats['ciphertexts'], 31)
+
+    def test_tally_stream_accepts_interleaved_generator(self):
+        """Streaming interleaved (candidate, ciphertext) pairs gives the same totals"""
+        def interleaved():
+            queues = {cid: list(cts) for cid, cts in self.ballots.items()}
+            while any(queues.values()):
+                for cid, cts in queues.items():
+                    if cts:
+                        yield cid, cts.pop(0)
+
+        engine = HomomorphicTallyEngine(self.public_key.n, chunk_size=5, max_workers=1)
+        streamed = engine.tally_stream(interleaved())
+        self.assertEqual(streamed, engine.tally(self.ballots))
+
+    def test_empty_candidates_are_skipped(self):
+        """Candidates without ciphertexts produce no total"""
+        engine = HomomorphicTallyEngine(self.public_key.n, max_workers=1)
+        self.assertEqual(engine.tally({5: []}), {})
+
+if __name__ == '__main__':
+    unittest.main()
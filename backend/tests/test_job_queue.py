@@ -0,0 +1,73 @@
+"""
+Test suite for the background job queue
+"""
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.background_job import BackgroundJob
+from app.services.jobs import JobQueue
+
+@JobQueue.register('test_square')
+def square(params):
+    JobQueue.report_progress(0.5, 'Halfway')
+    return {'value': params['x'] ** 2}
+
+@JobQueue.register('test_fail')
+def fail(params):
+    raise ValueError('boom')
+
+@JobQueue.register('test_secret', sensitive_params=True, sensitive_result=True)
+def secret(params):
+    return {'echo': params['secret']}
+
+class TestJobQueue(AppTestCase):
+    """Test cases for queueing, running and polling jobs"""
+
+    def test_run_records_progress_and_result(self):
+        """A worker runs queued jobs in order and records progress, timings and results"""
+        first = JobQueue.enqueue('test_square', {'x': 3}, election_id=7).job_id
+        second = JobQueue.enqueue('test_fail').job_id
+
+        self.assertTrue(JobQueue.run_next('worker-1'))
+        status = JobQueue.status(first)
+        self.assertEqual(status['status'], 'succeeded')
+        self.assertEqual(status['result'], {'value': 9})
+        self.assertEqual(status['progress'], 1.0)
+        self.assertEqual(status['timings']['steps'][0][0], 'Halfway')
+        self.assertIsNotNone(status['timings']['run_seconds'])
+
+        self.assertTrue(JobQueue.run_next('worker-1'))
+        status = JobQueue.status(second)
+        self.assertEqual(status['status'], 'failed')
+        self.assertEqual(status['error'], 'boom')
+
+        self.assertFalse(JobQueue.run_next('worker-1'))
+
+    def test_sensitive_params_stay_in_memory(self):
+        """Secret parameters are never stored; the enqueuing process runs the job and the result is handed out once"""
+        job_id = JobQueue.enqueue('test_secret', {'secret': 'p'}).job_id
+        self.assertIsNone(db.session.get(BackgroundJob, job_id).params)
+        self.assertFalse(JobQueue.run_next('worker-1'))
+        for thread in threading.enumerate():
+            if thread.name == f'job-{job_id}':
+                thread.join(10)
+        db.session.expire_all()
+
+        self.assertEqual(JobQueue.status(job_id)['result'], {'echo': 'p'})
+        self.assertIsNone(JobQueue.status(job_id)['result'])
+
+    def test_unknown_job_type_rejected(self):
+        with self.assertRaises(ValueError):
+            JobQueue.enqueue('no_such_job')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Test suite for PaillierKeyPool
+"""
+import unittest
+import sys
+import os
+import importlib.util
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from flask import Flask
+from sympy import nextprime
+from app.services.crypto import PaillierKeyPool, shamir_modulus
+
+class TestPaillierKeyPool(unittest.TestCase):
+    """Test cases for the pre-generated key pool"""
+
+    def setUp(self):
+        """Small keys so the pool fills quickly"""
+        self.saved = (PaillierKeyPool._size, PaillierKeyPool._key_bits)
+        PaillierKeyPool._size, PaillierKeyPool._key_bits = 2, 512
+        PaillierKeyPool._stop.clear()
+
+    def tearDown(self):
+        PaillierKeyPool.stop()
+        PaillierKeyPool._stop.clear()
+        PaillierKeyPool._size, PaillierKeyPool._key_bits = self.saved
+
+    def test_take_hands_out_each_key_once(self):
+        """Filled entries are valid key pairs, handed out once, then the pool is empty"""
+        self.assertEqual(PaillierKeyPool.fill(), 2)
+        self.assertEqual(PaillierKeyPool.fill(), 0)
+
+        first = PaillierKeyPool.take()
+        second = PaillierKeyPool.take()
+        self.assertIsNone(PaillierKeyPool.take())
+        self.assertNotEqual(first.public_key.n, second.public_key.n)
+
+        for pooled in (first, second):
+            self.assertEqual(pooled.private_key.p * pooled.private_key.q, pooled.public_key.n)
+            self.assertGreater(pooled.shamir_prime, pooled.private_key.p)
+            self.assertEqual(pooled.private_key.decrypt(pooled.public_key.encrypt(42)), 42)
+
+    def test_shamir_modulus_matches_key_generation(self):
+        """Same modulus as generate_key_pair always chose for a secret of that size"""
+        secret = nextprime(2 ** 1023)
+        self.assertEqual(shamir_modulus(secret), nextprime(2 ** 1152 + 1))
+        self.assertEqual(shamir_modulus(12345), nextprime(2 ** 1024 + 1))
+
+    def test_start_is_a_noop_in_child_processes(self):
+        """A spawned process that re-imports the entry point never starts a pool of its own"""
+        app = Flask(__name__)
+        app.config['KEY_POOL_SIZE'] = 2
+        with patch('app.services.crypto.key_pool.multiprocessing.parent_process', return_value=object()):
+            PaillierKeyPool.start(app)
+        self.assertIsNone(PaillierKeyPool._thread)
+
+    def test_gunicorn_workers_start_the_pool(self):
+        """The post_worker_init hook of gunicorn.conf.py fills the pool of each gunicorn worker"""
+        spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(parent_dir, 'gunicorn.conf.py'))
+        gunicorn_conf = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(gunicorn_conf)
+        app = Flask(__name__)
+        app.config.update(KEY_POOL_SIZE=1, KEY_POOL_KEY_BITS=512)
+
+        gunicorn_conf.post_worker_init(SimpleNamespace(wsgi=app))
+        self.assertTrue(PaillierKeyPool._thread.is_alive())
+        deadline = time.monotonic() + 60
+        pooled = PaillierKeyPool.take()
+        while pooled is None and time.monotonic() < deadline:
+            time.sleep(0.2)
+            pooled = PaillierKeyPool.take()
+        self.assertIsNotNone(pooled)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Test suite for PaillierKeyCache and cast-time ciphertext validation
+"""
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from phe import paillier
+from app_test_case import AppTestCase
+from app import db
+from app.models.crypto_config import CryptoConfig
+from app.services.crypto import PaillierKeyCache
+
+class TestPaillierKeyCache(AppTestCase):
+    """Test cases for PaillierKeyCache"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generate a small key pair once for all tests"""
+        cls.public_key, cls.private_key = paillier.generate_paillier_keypair(n_length=512)
+
+    def setUp(self):
+        super().setUp()
+
+        self.crypto_config = CryptoConfig(election_id=1, public_key=json.dumps({'n': str(self.public_key.n)}))
+        db.session.add(self.crypto_config)
+        db.session.commit()
+        PaillierKeyCache.clear()
+
+    def tearDown(self):
+        PaillierKeyCache.clear()
+        super().tearDown()
+
+    def test_key_cached_until_config_changes(self):
+        """The key is loaded once and reloaded after its CryptoConfig is written"""
+        with patch.object(PaillierKeyCache, '_parse', wraps=PaillierKeyCache._parse) as load:
+            first = PaillierKeyCache.get(1)
+            self.assertIs(PaillierKeyCache.get(1), first)
+            self.assertEqual(load.call_count, 1)
+
+            other_key, _ = paillier.generate_paillier_keypair(n_length=512)
+            self.crypto_config.public_key = json.dumps({'n': str(other_key.n)})
+            db.session.commit()
+            self.assertEqual(PaillierKeyCache.get(1).public_key.n, other_key.n)
+            self.assertEqual(load.call_count, 2)
+
+        self.assertIsNone(PaillierKeyCache.get(2))
+
+    def test_key_shared_by_crypto_id(self):
+        """Lookups by election, crypto_id and loaded row share one parsed key"""
+        with patch.object(PaillierKeyCache, '_parse', wraps=PaillierKeyCache._parse) as parse:
+            by_election = PaillierKeyCache.get(1)
+            self.assertIs(PaillierKeyCache.get_by_crypto_id(self.crypto_config.crypto_id), by_election)
+            self.assertIs(PaillierKeyCache.for_config(self.crypto_config), by_election)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(by_election.nsquare, self.public_key.nsquare)
+
+        self.crypto_config.public_key = 'not json'
+        with self.assertRaises(ValueError):
+            PaillierKeyCache.for_config(self.crypto_config)
+
+    def test_ciphertext_validation(self):
+        """Only integers in [1, n^2) coprime to n are accepted"""
+        key = PaillierKeyCache.get(1)
+        n = self.public_key.n
+        ciphertext = self.public_key.encrypt(1).ciphertext()
+
+        self.assertEqual(key.parse_ciphertext(f' {ciphertext} '), ciphertext)
+        for bad in ('not-a-number', None, '0', str(n * n), str(n), str(-ciphertext)):
+            with self.assertRaises(ValueError):
+                key.parse_ciphertext(bad)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test suite for ResultsExporter
+"""
+import unittest
+import sys
+import os
+import csv
+from datetime import date
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.organization import Organization
+from app.models.election import Election
+from app.models.position import Position
+from app.models.candidate import Candidate
+from app.models.election_result import ElectionResult
+from app.models.vote import Vote
+from app.services.access import EligibleVoterCounts
+from app.services.results import ResultsExporter
+
+class TestResultsExporter(AppTestCase):
+    """Test cases for the cached CSV/PDF results exports"""
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['RESULTS_EXPORT_DIR'] = os.path.join(self.test_dir, 'exports')
+        EligibleVoterCounts.clear()
+
+        org = Organization(org_name='Student Council')
+        db.session.add(org)
+        db.session.flush()
+        position = Position(org_id=org.org_id, position_name='President')
+        db.session.add(position)
+        db.session.flush()
+        election = Election(org_id=org.org_id, election_name='General Election', election_status='Finished',
+                            date_start=date(2024, 3, 1), date_end=date(2024, 3, 2))
+        db.session.add(election)
+        db.session.flush()
+        self.election_id = election.election_id
+        for offset, name, votes in ((0, 'Alice', 3), (3, 'Bob', 1)):
+            candidate = Candidate(election_id=self.election_id, position_id=position.position_id, fullname=name,
+                                  party='Niño (Independent)')
+            db.session.add(candidate)
+            db.session.flush()
+            db.session.add(ElectionResult(election_id=self.election_id, candidate_id=candidate.candidate_id,
+                                          vote_count=votes))
+            db.session.add_all(Vote(election_id=self.election_id, student_id=f'2024-0000{offset + i}',
+                                    candidate_id=candidate.candidate_id, position_id=position.position_id,
+                                    encrypted_vote='0', vote_status='cast') for i in range(votes))
+        db.session.commit()
+
+    def tearDown(self):
+        EligibleVoterCounts.clear()
+        super().tearDown()
+
+    def test_csv_export_is_cached_by_snapshot(self):
+        """A second export of unchanged results reuses the file; changed results get a new one"""
+        first = ResultsExporter.export([self.election_id], 'csv')
+        self.assertFalse(first['cached'])
+        with open(ResultsExporter.path_for(first['filename']), newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([(r['candidate'], r['votes'], r['winner']) for r in rows],
+                         [('Alice', '3', 'yes'), ('Bob', '1', 'no')])
+
+        self.assertTrue(ResultsExporter.export([self.election_id], 'csv')['cached'])
+
+        result = ElectionResult.query.filter_by(election_id=self.election_id, vote_count=1).first()
+        result.vote_count = 2
+        db.session.commit()
+        changed = ResultsExporter.export([self.election_id], 'csv')
+        self.assertFalse(changed['cached'])
+        self.assertNotEqual(changed['filename'], first['filename'])
+
+    def test_pdf_export(self):
+        """The PDF export is a complete document"""
+        export = ResultsExporter.export([self.election_id], 'pdf')
+        with open(ResultsExporter.path_for(export['filename']), 'rb') as f:
+            data = f.read()
+        self.assertTrue(data.startswith(b'%PDF-'))
+        self.assertTrue(data.rstrip().endswith(b'%%EOF'))
+        self.assertEqual(export['bytes'], len(data))
+
+    def test_rejects_unfinished_elections_and_foreign_paths(self):
+        """Only final results are exported and only export files are served"""
+        election = db.session.get(Election, self.election_id)
+        election.election_status = 'Ongoing'
+        db.session.commit()
+        with self.assertRaises(ValueError):
+            ResultsExporter.export([self.election_id], 'csv')
+        self.assertEqual(ResultsExporter.path_for('../exports.db'), '')
+        self.assertEqual(ResultsExporter.path_for('results-1-abc.txt'), '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Test suite for ElectionResultsReadModel
+"""
+import unittest
+import sys
+import os
+from datetime import date
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from sqlalchemy import event
+from app_test_case import AppTestCase
+from app import db
+from app.models.organization import Organization
+from app.models.election import Election
+from app.models.position import Position
+from app.models.candidate import Candidate
+from app.models.election_result import ElectionResult
+from app.services.results import ElectionResultsReadModel
+
+class TestElectionResultsReadModel(AppTestCase):
+    """Test cases for the set-based results read model"""
+
+    def setUp(self):
+        super().setUp()
+
+        org = Organization(org_name='Student Council')
+        db.session.add(org)
+        db.session.flush()
+        president = Position(org_id=org.org_id, position_name='President')
+        secretary = Position(org_id=org.org_id, position_name='Secretary')
+        db.session.add_all([president, secretary])
+        db.session.flush()
+
+        self.election_ids = []
+        for n, (status, ended) in enumerate([('Finished', date(2024, 3, 1)), ('Finished', date(2024, 5, 1)),
+                                             ('Archived', date(2024, 7, 1))]):
+            election = Election(org_id=org.org_id, election_name=f'Election {n}', election_status=status,
+                                date_start=ended, date_end=ended, participation_rate=50.0)
+            db.session.add(election)
+            db.session.flush()
+            self.election_ids.append(election.election_id)
+            for position, votes in ((president, [6, 4]), (secretary, [0, 0])):
+                for i, count in enumerate(votes):
+                    candidate = Candidate(election_id=election.election_id, position_id=position.position_id,
+                                          fullname=f'{position.position_name} {i}')
+                    db.session.add(candidate)
+                    db.session.flush()
+                    db.session.add(ElectionResult(election_id=election.election_id,
+                                                  candidate_id=candidate.candidate_id, vote_count=count))
+        # An election without results is not listed
+        db.session.add(Election(org_id=org.org_id, election_name='Untallied', election_status='Ongoing',
+                                date_start=date(2024, 8, 1), date_end=date(2024, 8, 2)))
+        db.session.commit()
+
+    def count_queries(self, fn):
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        return result, len(statements)
+
+    def test_results_shape_and_winners(self):
+        """Per-position percentages and winners as the admin results page expects"""
+        (results, total), queries = self.count_queries(ElectionResultsReadModel.list_results)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(queries, 2)
+        first = results[0]
+        self.assertEqual(first['organization'], 'Student Council')
+        self.assertEqual(first['ended_at'], '2024-03-01')
+        self.assertEqual(first['total_votes'], 10)
+        self.assertEqual(first['winner'], 'President 0')
+        self.assertEqual([c['percentage'] for c in first['candidates']], [60.0, 40.0, 0, 0])
+        self.assertEqual([c['winner'] for c in first['candidates']], [True, False, False, False])
+
+    def test_pagination_and_filters(self):
+        """Pages and filters keep the total of all matching elections"""
+        results, total = ElectionResultsReadModel.list_results(page=2, per_page=2)
+        self.assertEqual(total, 3)
+        self.assertEqual([r['election_id'] for r in results], self.election_ids[2:])
+
+        results, total = ElectionResultsReadModel.list_results(page=5, per_page=2)
+        self.assertEqual((results, total), ([], 3))
+
+        results, total = ElectionResultsReadModel.list_results(status='Finished', date_from=date(2024, 4, 1))
+        self.assertEqual(total, 1)
+        self.assertEqual(results[0]['election_id'], self.election_ids[1])
+
+if __name__ == '__main__':
+    unittest.main()
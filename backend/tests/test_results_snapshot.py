@@ -0,0 +1,105 @@
+"""
+Test suite for ResultsSnapshotService
+"""
+import unittest
+import sys
+import os
+from datetime import date
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.organization import Organization
+from app.models.election import Election
+from app.models.position import Position
+from app.models.candidate import Candidate
+from app.models.election_result import ElectionResult
+from app.models.vote import Vote
+from app.models.results_snapshot import ResultsSnapshot
+from app.services.access import EligibleVoterCounts
+from app.services.results import ResultsSnapshotService
+from app.controllers.election_results_controller import ElectionResultsController
+
+class TestResultsSnapshotService(AppTestCase):
+    """Test cases for the precomputed results views"""
+
+    def setUp(self):
+        super().setUp()
+        EligibleVoterCounts.clear()
+
+        org = Organization(org_name='Student Council')
+        db.session.add(org)
+        db.session.flush()
+        position = Position(org_id=org.org_id, position_name='President')
+        db.session.add(position)
+        db.session.flush()
+        election = Election(org_id=org.org_id, election_name='General Election', election_status='Finished',
+                            date_start=date(2024, 3, 1), date_end=date(2024, 3, 2))
+        db.session.add(election)
+        db.session.flush()
+        self.election_id = election.election_id
+        for offset, name, votes in ((0, 'Alice', 3), (3, 'Bob', 1)):
+            candidate = Candidate(election_id=self.election_id, position_id=position.position_id, fullname=name)
+            db.session.add(candidate)
+            db.session.flush()
+            db.session.add(ElectionResult(election_id=self.election_id, candidate_id=candidate.candidate_id,
+                                          vote_count=votes))
+            db.session.add_all(Vote(election_id=self.election_id, student_id=f'2024-0000{offset + i}',
+                                    candidate_id=candidate.candidate_id, position_id=position.position_id,
+                                    encrypted_vote='0', vote_status='cast') for i in range(votes))
+        db.session.commit()
+
+    def tearDown(self):
+        EligibleVoterCounts.clear()
+        super().tearDown()
+
+    def get(self, view, etag=None):
+        headers = {'If-None-Match': f'"{etag}"'} if etag else {}
+        with self.app.test_request_context(headers=headers):
+            return ResultsSnapshotService.respond(self.election_id, view)
+
+    def test_snapshot_served_with_etag(self):
+        """The first read stores every view; a matching If-None-Match gets 304"""
+        response = self.get('decrypted')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ResultsSnapshot.query.filter_by(election_id=self.election_id).count(), 3)
+        body = response.get_json()
+        self.assertEqual([c['is_winner'] for c in body['results'][0]['candidates']], [True, False])
+        self.assertTrue(body['verification_status']['vote_count_match'])
+
+        etag, _ = response.get_etag()
+        not_modified = self.get('decrypted', etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.get_data(), b'')
+
+        # Served bodies match the live computation
+        with self.app.test_request_context():
+            detail = ElectionResultsController.get_election_results_by_election_id(self.election_id)
+        self.assertEqual(detail.get_json(), ResultsSnapshotService.build_views(self.election_id, ['detail'])['detail'])
+
+    def test_result_change_invalidates_snapshot(self):
+        """Re-tallied results make the snapshot stale and the next read rebuilds it"""
+        etag, _ = self.get('pdf').get_etag()
+        result = ElectionResult.query.filter_by(election_id=self.election_id, vote_count=1).first()
+        result.vote_count = 5
+        db.session.commit()
+
+        response = self.get('pdf', etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.get_etag()[0], etag)
+        self.assertEqual(response.get_json()['data']['winners'][0]['fullname'], 'Bob')
+
+    def test_unfinished_election_is_not_snapshotted(self):
+        """Elections still running are computed on every read"""
+        election = db.session.get(Election, self.election_id)
+        election.election_status = 'Ongoing'
+        db.session.commit()
+        self.assertIsNone(self.get('decrypted'))
+        self.assertEqual(ResultsSnapshot.query.count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Test suite for RunningTallyService
+"""
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from phe import paillier
+from app_test_case import AppTestCase
+from app import db
+from app.models.crypto_config import CryptoConfig
+from app.services.tally import RunningTallyService
+
+class TestRunningTallyService(AppTestCase):
+    """Test cases for RunningTallyService"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generate a small key pair once for all tests"""
+        cls.public_key, cls.private_key = paillier.generate_paillier_keypair(n_length=512)
+
+    def setUp(self):
+        super().setUp()
+
+        self.crypto_config = CryptoConfig(election_id=1, public_key=json.dumps({'n': str(self.public_key.n)}))
+        db.session.add(self.crypto_config)
+        db.session.commit()
+
+    def cast(self, candidate_id, value=1):
+        return candidate_id, str(self.public_key.encrypt(value).ciphertext())
+
+    def decrypt(self, raw_total):
+        return self.private_key.decrypt(paillier.EncryptedNumber(self.public_key, raw_total, 0))
+
+    def test_folded_ballots_decrypt_to_counts(self):
+        """Ballots folded over several casts decrypt to the per-candidate counts"""
+        self.assertTrue(RunningTallyService.fold_ballots(1, [self.cast(10), self.cast(20)]))
+        db.session.commit()
+        self.assertTrue(RunningTallyService.fold_ballots(1, [self.cast(10)]))
+        db.session.commit()
+
+        totals = RunningTallyService.read_totals(1, self.crypto_config.crypto_id, {10: 2, 20: 1})
+        self.assertEqual({cid: self.decrypt(total) for cid, total in totals.items()}, {10: 2, 20: 1})
+
+    def test_stale_tally_is_rejected(self):
+        """A running tally that missed ballots forces a full recount"""
+        RunningTallyService.fold_ballots(1, [self.cast(10)])
+        db.session.commit()
+
+        self.assertIsNone(RunningTallyService.read_totals(1, self.crypto_config.crypto_id, {10: 2}))
+        self.assertIsNone(RunningTallyService.read_totals(1, self.crypto_config.crypto_id, {10: 1, 20: 1}))
+
+    def test_unparseable_ballot_is_not_folded(self):
+        """A malformed ciphertext leaves the tally untouched instead of failing the cast"""
+        self.assertFalse(RunningTallyService.fold_ballots(1, [(10, 'not-a-number')]))
+        self.assertIsNone(RunningTallyService.read_totals(1, self.crypto_config.crypto_id, {10: 1}))
+
+if __name__ == '__main__':
+    unittest.main()
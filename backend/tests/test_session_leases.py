@@ -0,0 +1,86 @@
+"""
+Test suite for SessionLeaseService
+"""
+import unittest
+import sys
+import os
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.election import Election
+from app.models.election_waitlist import ElectionWaitlist
+from app.models.voting_session_lease import VotingSessionLease
+from app.services.access import SessionLeaseService, VoterSlotCounter, WaitlistEventBroker
+
+class TestSessionLeases(AppTestCase):
+    """Test cases for voting session leases and the reaper"""
+
+    def setUp(self):
+        super().setUp()
+
+        election = Election(
+            org_id=1, election_name='Leases', election_status='Ongoing',
+            date_start=date.today(), date_end=date.today(),
+            voters_count=0, max_concurrent_voters=1, queued_access=True
+        )
+        db.session.add(election)
+        db.session.commit()
+        self.election_id = election.election_id
+
+    def test_renew_extends_active_lease_only(self):
+        """Heartbeats push expiry forward until the session is ended"""
+        lease = SessionLeaseService.grant(self.election_id, '2024-00001', holds_slot=True)
+        db.session.commit()
+        first_expiry = lease.expires_at
+
+        renewed = SessionLeaseService.renew(self.election_id, '2024-00001')
+        self.assertIsNotNone(renewed)
+        self.assertGreaterEqual(renewed, first_expiry)
+
+        self.assertTrue(SessionLeaseService.end_session(self.election_id, '2024-00001'))
+        db.session.commit()
+        self.assertIsNone(SessionLeaseService.renew(self.election_id, '2024-00001'))
+        # A second leave must not hand back the slot again
+        self.assertFalse(SessionLeaseService.end_session(self.election_id, '2024-00001'))
+
+    def test_lease_ttl_follows_app_config(self):
+        """Leases last VOTING_SESSION_TTL seconds as configured on the running app"""
+        self.app.config['VOTING_SESSION_TTL'] = 5
+        lease = SessionLeaseService.grant(self.election_id, '2024-00001', holds_slot=True)
+        db.session.commit()
+        self.assertEqual((lease.expires_at - lease.renewed_at).total_seconds(), 5)
+
+    def test_reaper_reclaims_slot_and_promotes_next_voter(self):
+        """An abandoned session frees its slot and the next waiting voter is activated"""
+        VoterSlotCounter.try_acquire(self.election_id)
+        db.session.add(ElectionWaitlist(election_id=self.election_id, voter_id='2024-00001', status='active'))
+        db.session.add(ElectionWaitlist(election_id=self.election_id, voter_id='2024-00002', status='waiting'))
+        lease = SessionLeaseService.grant(self.election_id, '2024-00001', holds_slot=True)
+        lease.expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+
+        events = WaitlistEventBroker.subscribe(self.election_id)
+        try:
+            totals = SessionLeaseService.reap_expired(batch_size=10)
+        finally:
+            WaitlistEventBroker.unsubscribe(self.election_id, events)
+
+        self.assertEqual(totals, {'expired': 1, 'slots_released': 1, 'promoted': 1})
+        self.assertEqual(VoterSlotCounter.snapshot(self.election_id), (0, 1))
+        statuses = dict(db.session.query(ElectionWaitlist.voter_id, ElectionWaitlist.status))
+        self.assertEqual(statuses, {'2024-00001': 'done', '2024-00002': 'active'})
+        self.assertEqual(events.get_nowait(), {'type': 'activated', 'voter_id': '2024-00002'})
+
+        # The promoted voter holds a lease without a slot; the reaped voter's leave is a no-op
+        promoted = VotingSessionLease.query.filter_by(voter_id='2024-00002').one()
+        self.assertEqual((promoted.status, promoted.holds_slot), ('active', False))
+        self.assertFalse(SessionLeaseService.end_session(self.election_id, '2024-00001'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test suite for Shamir share parsing and reconstruction
+"""
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+import shamirs
+from sympy import nextprime
+from app.services.crypto import (ShareFormatError, parse_shares, lagrange_coefficients, reconstruct_secret,
+                                 shares_consistent, find_bad_shares)
+
+class TestShamirReconstruction(unittest.TestCase):
+    """Test cases for the Shamir reconstruction helpers"""
+
+    def setUp(self):
+        """Share a 512-bit 'prime' over a ~1150-bit modulus, 3 of 5"""
+        self.modulus = nextprime(2 ** 1150)
+        self.secret = nextprime(2 ** 511 + 12345)
+        raw = shamirs.shares(self.secret, quantity=5, modulus=self.modulus, threshold=3)
+        self.serialized = [f"{share.index}:{hex(share.value)[2:]}" for share in raw]
+        self.raw = raw
+        self.n = self.secret * nextprime(2 ** 510)
+
+    def test_matches_shamirs_interpolate(self):
+        """Reconstruction equals shamirs.interpolate for any subset"""
+        shares = parse_shares(self.serialized)
+        self.assertEqual(reconstruct_secret(shares[1:4], self.modulus), self.secret)
+        self.assertEqual(reconstruct_secret(shares, self.modulus), shamirs.interpolate(self.raw))
+
+    def test_parse_formats(self):
+        """All submitted formats parse to the same points, repeats are dropped"""
+        x, y = self.raw[0].index, self.raw[0].value
+        shares = parse_shares([self.serialized[0], f"[{x}, {y}]", f"({x}, {y})", [x, y], ""])
+        self.assertEqual(shares, [(x, y)])
+
+        with self.assertRaises(ShareFormatError):
+            parse_shares(["not a share"])
+        with self.assertRaises(ShareFormatError):
+            parse_shares([f"{x}:1", f"{x}:2"])
+
+    def test_coefficients_cached(self):
+        """Coefficients are computed once per index set and modulus"""
+        lagrange_coefficients.cache_clear()
+        shares = parse_shares(self.serialized)
+        reconstruct_secret(shares[:3], self.modulus)
+        reconstruct_secret(shares[:3], self.modulus)
+        self.assertEqual(lagrange_coefficients.cache_info().hits, 1)
+
+    def test_consistency_and_bad_share(self):
+        """A tampered share breaks consistency and is identified by the subset check"""
+        shares = parse_shares(self.serialized)
+        self.assertTrue(shares_consistent(shares, 3, self.modulus))
+
+        tampered = list(shares)
+        tampered[2] = (tampered[2][0], tampered[2][1] + 1)
+        self.assertFalse(shares_consistent(tampered, 3, self.modulus))
+
+        secret, bad = find_bad_shares(tampered, 3, self.modulus,
+                                      lambda p: 1 < p < self.n and self.n % p == 0, max_workers=2)
+        self.assertEqual(secret, self.secret)
+        self.assertEqual(bad, [tampered[2][0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Test suite for VoterSlotCounter
+"""
+import unittest
+import sys
+import os
+import threading
+from datetime import date
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.election import Election
+from app.services.access import VoterSlotCounter
+
+class TestVoterSlotCounter(AppTestCase):
+    """Test cases for VoterSlotCounter"""
+
+    def setUp(self):
+        super().setUp()
+
+        election = Election(
+            org_id=1, election_name='Slots', election_status='Ongoing',
+            date_start=date.today(), date_end=date.today(),
+            voters_count=0, max_concurrent_voters=5
+        )
+        db.session.add(election)
+        db.session.commit()
+        self.election_id = election.election_id
+
+    def test_acquire_stops_at_capacity(self):
+        """Slots are granted up to max_concurrent_voters and no further"""
+        granted = [VoterSlotCounter.try_acquire(self.election_id) for _ in range(7)]
+        db.session.commit()
+
+        self.assertEqual(granted, [1, 2, 3, 4, 5, None, None])
+        self.assertEqual(VoterSlotCounter.snapshot(self.election_id), (5, 5))
+
+    def test_release_never_goes_negative(self):
+        """Releasing an empty election leaves the counter at zero"""
+        VoterSlotCounter.try_acquire(self.election_id)
+        self.assertEqual(VoterSlotCounter.release(self.election_id), 0)
+        self.assertIsNone(VoterSlotCounter.release(self.election_id))
+        db.session.commit()
+        self.assertEqual(VoterSlotCounter.snapshot(self.election_id), (0, 5))
+
+    def test_concurrent_acquire_does_not_overshoot(self):
+        """A burst of concurrent requests admits exactly max_concurrent_voters"""
+        results = []
+        lock = threading.Lock()
+
+        def admit():
+            with self.app.app_context():
+                new_count = VoterSlotCounter.try_acquire(self.election_id)
+                db.session.commit()
+                with lock:
+                    results.append(new_count)
+
+        threads = [threading.Thread(target=admit) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(r for r in results if r is not None), [1, 2, 3, 4, 5])
+        self.assertEqual(VoterSlotCounter.snapshot(self.election_id), (5, 5))
+
+if __name__ == '__main__':
+    unittest.main()
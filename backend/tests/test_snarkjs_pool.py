@@ -0,0 +1,116 @@
+"""
+Test suite for SnarkjsWorkerPool
+"""
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import threading
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app.services.zkp.snarkjs_pool import SnarkjsWorkerPool, SnarkjsWorkerError, SnarkjsPoolBusy
+
+# Stand-in for snarkjs_worker.js speaking the same line protocol
+FAKE_WORKER = r'''
+import json, os, sys, time
+keys = {}
+for line in sys.stdin:
+    msg = json.loads(line)
+    if msg.get('vkey'):
+        keys[msg['key_id']] = msg['vkey']
+    if msg['key_id'] not in keys:
+        response = {'ok': False, 'error': 'unknown_key'}
+    elif msg['op'] == 'verify_batch':
+        response = {'ok': True, 'results': [item['proof'].get('valid', False) for item in msg['items']]}
+    else:
+        proof = msg['proof']
+        if proof.get('crash'):
+            sys.exit(1)
+        time.sleep(proof.get('sleep', 0))
+        response = {'ok': True, 'valid': proof.get('valid', False), 'pid': os.getpid(),
+                    'sent_key': 'vkey' in msg}
+    response['id'] = msg['id']
+    print(json.dumps(response), flush=True)
+'''
+
+class TestSnarkjsWorkerPool(unittest.TestCase):
+    """Test cases for SnarkjsWorkerPool using a fake worker process"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.mkdtemp()
+        cls.worker_path = os.path.join(cls.test_dir, 'fake_worker.py')
+        with open(cls.worker_path, 'w') as f:
+            f.write(FAKE_WORKER)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def make_pool(self, **kwargs):
+        pool = SnarkjsWorkerPool(command=[sys.executable, self.worker_path], **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_verify_reuses_worker_and_key(self):
+        """Workers are reused and a key is sent to a worker only once"""
+        pool = self.make_pool(size=1, timeout=5)
+        vkey = {'protocol': 'groth16'}
+
+        self.assertTrue(pool.verify(vkey, ['1'], {'valid': True}))
+        self.assertFalse(pool.verify(vkey, ['1'], {'valid': False}))
+        self.assertEqual(len(pool._workers), 1)
+        self.assertIn(SnarkjsWorkerPool.key_id_for(vkey), pool._workers[0].loaded_keys)
+
+    def test_verify_batch_returns_results_in_order(self):
+        """A batch is answered in one round trip with per-proof results"""
+        pool = self.make_pool(size=1, timeout=5)
+        items = [{'proof': {'valid': v}, 'publicSignals': ['1']} for v in (True, False, True)]
+
+        self.assertEqual(pool.verify_batch({'protocol': 'groth16'}, items), [True, False, True])
+        self.assertEqual(pool.verify_batch({'protocol': 'groth16'}, []), [])
+
+    def test_crashed_worker_is_replaced(self):
+        """A worker that exits mid-request raises and is restarted on the next call"""
+        pool = self.make_pool(size=1, timeout=5)
+        vkey = {'protocol': 'groth16'}
+
+        with self.assertRaises(SnarkjsWorkerError):
+            pool.verify(vkey, ['1'], {'crash': True})
+        self.assertEqual(pool._workers, [])
+        self.assertTrue(pool.verify(vkey, ['1'], {'valid': True}))
+
+    def test_timeout_kills_worker(self):
+        """A request exceeding the timeout raises and the worker is discarded"""
+        pool = self.make_pool(size=1, timeout=0.5)
+
+        with self.assertRaises(SnarkjsWorkerError):
+            pool.verify({'protocol': 'groth16'}, ['1'], {'sleep': 5})
+        self.assertEqual(pool._workers, [])
+
+    def test_saturated_pool_rejects_callers(self):
+        """Callers beyond size + max_queued are rejected immediately"""
+        pool = self.make_pool(size=1, timeout=5, max_queued=0)
+        vkey = {'protocol': 'groth16'}
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            pool.verify(vkey, ['1'], {'sleep': 1, 'valid': True})
+
+        thread = threading.Thread(target=slow)
+        thread.start()
+        started.wait()
+        # Give the slow call time to claim the only worker
+        threading.Event().wait(0.3)
+        with self.assertRaises(SnarkjsPoolBusy):
+            pool.verify(vkey, ['1'], {'valid': True})
+        thread.join()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Test suite for VerificationKeyCache
+"""
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.crypto_config import CryptoConfig
+from app.services.zkp.verification_key_cache import VerificationKeyCache
+
+class TestVerificationKeyCache(AppTestCase):
+    """Test cases for VerificationKeyCache"""
+
+    def setUp(self):
+        super().setUp()
+        VerificationKeyCache.clear()
+
+        self.default_key = CryptoConfig(key_type='default_verification_key', public_key=json.dumps({'nPublic': 0}))
+        self.election_key = CryptoConfig(election_id=7, key_type='verification_key', public_key=json.dumps({'nPublic': 1}))
+        db.session.add_all([self.default_key, self.election_key])
+        db.session.commit()
+
+    def tearDown(self):
+        VerificationKeyCache.clear()
+        super().tearDown()
+
+    def test_election_key_and_default_fallback(self):
+        """Elections get their own key, others fall back to the default"""
+        self.assertEqual(VerificationKeyCache.get(7).key, {'nPublic': 1})
+        self.assertEqual(VerificationKeyCache.get('8').key, {'nPublic': 0})
+        self.assertEqual(VerificationKeyCache.get().key, {'nPublic': 0})
+        self.assertNotEqual(VerificationKeyCache.get(7).key_id, VerificationKeyCache.get(8).key_id)
+
+    def test_hit_does_not_query(self):
+        """A cached key is returned without touching the database"""
+        first = VerificationKeyCache.get(7)
+        # Change the row behind the ORM's back; the cache must not notice
+        db.session.execute(CryptoConfig.__table__.update().values(public_key=json.dumps({'nPublic': 9})))
+        self.assertIs(VerificationKeyCache.get(7), first)
+
+    def test_orm_update_invalidates(self):
+        """Updating a CryptoConfig row drops the cached key"""
+        VerificationKeyCache.get(7)
+        self.election_key.public_key = json.dumps({'nPublic': 2})
+        db.session.commit()
+        self.assertEqual(VerificationKeyCache.get(7).key, {'nPublic': 2})
+
+    def test_default_key_change_clears_fallbacks(self):
+        """Changing the default key invalidates elections that fell back to it"""
+        VerificationKeyCache.get(8)
+        self.default_key.public_key = json.dumps({'nPublic': 3})
+        db.session.commit()
+        self.assertEqual(VerificationKeyCache.get(8).key, {'nPublic': 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Test suite for WaitlistEventBroker
+"""
+import unittest
+import sys
+import os
+import itertools
+from datetime import date
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.election import Election
+from app.models.election_waitlist import ElectionWaitlist
+from app.services.access import WaitlistEventBroker
+
+class TestWaitlistEventBroker(unittest.TestCase):
+    """Test cases for WaitlistEventBroker"""
+
+    def test_events_reach_only_their_election(self):
+        """Subscribers receive events published for their election only"""
+        first = WaitlistEventBroker.subscribe(101)
+        other = WaitlistEventBroker.subscribe(102)
+        self.addCleanup(WaitlistEventBroker.unsubscribe, 101, first)
+        self.addCleanup(WaitlistEventBroker.unsubscribe, 102, other)
+
+        WaitlistEventBroker.voter_activated(101, '2024-00001')
+
+        self.assertEqual(first.get_nowait(), {'type': 'activated', 'voter_id': '2024-00001'})
+        self.assertTrue(other.empty())
+
+    def test_slow_subscriber_keeps_latest_events(self):
+        """A full subscriber queue drops its oldest event instead of blocking publishers"""
+        subscriber = WaitlistEventBroker.subscribe(103)
+        self.addCleanup(WaitlistEventBroker.unsubscribe, 103, subscriber)
+
+        for _ in range(WaitlistEventBroker._max_pending):
+            WaitlistEventBroker.queue_changed(103)
+        WaitlistEventBroker.voter_activated(103, '2024-00002')
+
+        events = [subscriber.get_nowait() for _ in range(subscriber.qsize())]
+        self.assertEqual(len(events), WaitlistEventBroker._max_pending)
+        self.assertEqual(events[-1]['type'], 'activated')
+
+    def test_unsubscribe_removes_election(self):
+        """The last unsubscribe forgets the election"""
+        subscriber = WaitlistEventBroker.subscribe(104)
+        self.assertEqual(WaitlistEventBroker.subscriber_count(104), 1)
+        WaitlistEventBroker.unsubscribe(104, subscriber)
+        self.assertEqual(WaitlistEventBroker.subscriber_count(104), 0)
+        self.assertNotIn(104, WaitlistEventBroker._subscribers)
+
+class TestWaitlistEventStream(AppTestCase):
+    """Test cases for the waitlist SSE stream"""
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['WAITLIST_SSE_KEEPALIVE'] = 0.05
+
+        election = Election(
+            org_id=1, election_name='Stream', election_status='Ongoing',
+            date_start=date.today(), date_end=date.today(),
+            voters_count=1, max_concurrent_voters=1, queued_access=True
+        )
+        db.session.add(election)
+        db.session.commit()
+        self.election_id = election.election_id
+        self.entry = ElectionWaitlist(election_id=self.election_id, voter_id='2024-00001', status='waiting')
+        db.session.add(self.entry)
+        db.session.commit()
+
+    def test_keepalive_picks_up_changes_from_other_processes(self):
+        """A promotion committed without an event in this process still reaches the stream"""
+        response = self.app.test_client().get(
+            f'/api/elections/{self.election_id}/waitlist/events?voter_id=2024-00001', buffered=False)
+        chunks = (chunk.decode() for chunk in response.response)
+        self.assertTrue(next(chunks).startswith('event: position'))
+
+        # Another server process promotes the voter; its event never reaches this one
+        ElectionWaitlist.query.filter_by(id=self.entry.id).update({'status': 'active'})
+        db.session.commit()
+
+        # Keep-alives until the next re-read; bounded so a missed change fails instead of hanging
+        received = list(itertools.islice(chunks, 100))
+        self.assertTrue(received[-1].startswith('event: activated'))
+        response.close()
+        self.assertEqual(WaitlistEventBroker.subscriber_count(self.election_id), 0)
+
+if __name__ == '__main__':
+    unittest.main()
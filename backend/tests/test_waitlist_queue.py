@@ -0,0 +1,52 @@
+"""
+Test suite for ElectionWaitlist queue positions
+"""
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import app modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from app_test_case import AppTestCase
+from app import db
+from app.models.election_waitlist import ElectionWaitlist
+
+class TestWaitlistQueue(AppTestCase):
+    """Test cases for COUNT-based waitlist positions"""
+
+    def setUp(self):
+        super().setUp()
+
+        start = datetime(2024, 6, 1, 9, 0, 0)
+        self.entries = []
+        # Two voters share a timestamp to exercise the id tie-break
+        for i, offset in enumerate([0, 1, 1, 2, 3]):
+            entry = ElectionWaitlist(election_id=1, voter_id=f'2024-0000{i}', status='waiting',
+                                     joined_at=start + timedelta(seconds=offset))
+            db.session.add(entry)
+            self.entries.append(entry)
+        db.session.add(ElectionWaitlist(election_id=2, voter_id='2024-00009', status='waiting', joined_at=start))
+        db.session.commit()
+
+    def test_positions_follow_queue_order(self):
+        """Positions match the (joined_at, id) order of the queue"""
+        self.assertEqual([ElectionWaitlist.queue_position(e) for e in self.entries], [1, 2, 3, 4, 5])
+        self.assertEqual(ElectionWaitlist.count_waiting(1), 5)
+        self.assertEqual(ElectionWaitlist.next_waiting(1), self.entries[0])
+
+    def test_positions_shift_when_voters_leave(self):
+        """Voters that stop waiting no longer count towards positions"""
+        self.entries[0].status = 'active'
+        self.entries[2].status = 'done'
+        db.session.commit()
+
+        self.assertEqual(ElectionWaitlist.queue_position(self.entries[1]), 1)
+        self.assertEqual(ElectionWaitlist.queue_position(self.entries[4]), 3)
+        self.assertEqual(ElectionWaitlist.count_waiting(1), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,8 @@ try:
     from app.models.vote import Vote
     from app.models.election import Election
     from app.models.crypto_config import CryptoConfig
+    from app.services.crypto import decode_ciphertext
+    from app.services.tally.vote_reader import VoteReader
     
     # Try to import paillier if available
     try:
@@ -48,16 +50,16 @@ try:
             print(f"Election: {election.election_name}")
             print(f"Status: {election.election_status}")
             
-            # Get all votes for this election
-            votes = Vote.query.filter_by(election_id=election_id).all()
-            print(f"Total votes found: {len(votes)}")
+            # Count votes per candidate in the database
+            vote_distribution = VoteReader.count_by_candidate(election_id)
+            total_votes = sum(vote_distribution.values())
+            print(f"Total votes found: {total_votes}")
             
-            if not votes:
+            if not total_votes:
                 print("❌ No votes found for this election")
                 return False
             
             # Analyze vote distribution
-            vote_distribution = Counter(v.candidate_id for v in votes)
             print(f"Vote distribution by candidate:")
             for candidate_id, count in vote_distribution.items():
                 candidate = Candidate.query.get(candidate_id)
@@ -128,15 +130,17 @@ try:
                     
                     # Group encrypted votes by candidate and verify homomorphic addition
                     for candidate_id, expected_count in vote_distribution.items():
-                        candidate_votes = [v for v in votes if v.candidate_id == candidate_id]
-                        print(f"\nCandidate {candidate_id}: Processing {len(candidate_votes)} encrypted votes")
+                        print(f"\nCandidate {candidate_id}: Processing {expected_count} encrypted votes")
                         
                         # Simulate homomorphic addition
                         enc_sum = None
                         valid_votes = 0
-                        for i, vote in enumerate(candidate_votes):
+                        ballots = VoteReader.iter_encoded_ciphertexts(election_id, candidate_id)
+                        for i, (_, ciphertext_bytes, encrypted_vote) in enumerate(ballots):
                             try:
-                                enc_vote = paillier.EncryptedNumber(pubkey, int(vote.encrypted_vote), 0)
+                                # Decoded per vote so a malformed ciphertext is reported and skipped
+                                ciphertext = decode_ciphertext(ciphertext_bytes, encrypted_vote)
+                                enc_vote = paillier.EncryptedNumber(pubkey, ciphertext, 0)
                                 if enc_sum is None:
                                     enc_sum = enc_vote
                                 else:
@@ -145,7 +149,7 @@ try:
                             except Exception as e:
                                 print(f"    ⚠️  Error processing vote {i}: {e}")
                         
-                        print(f"    Successfully processed {valid_votes}/{len(candidate_votes)} encrypted votes")
+                        print(f"    Successfully processed {valid_votes}/{expected_count} encrypted votes")
                         
                         # Compare with stored encrypted total
                         result_entry = ElectionResult.query.filter_by(
@@ -0,0 +1,14 @@
+# wsgi.py
+"""
+WSGI entry point for production servers, e.g. from this directory
+    gunicorn wsgi:app
+
+gunicorn.conf.py (read by gunicorn from the working directory) starts the
+background services (Paillier key pool, voting session reaper, optional job
+workers) in every worker process once it has loaded this app. Under another
+WSGI server, call start_background_services(app) in each serving process
+after it has been forked.
+"""
+from app import create_app
+
+app = create_app()
@@ -264,7 +264,9 @@ export default function AdminResultDetailPage({ params }: { params: Promise<{ id
       yPos += 6;
       doc.text(`Participation Rate: ${pdfData.participation_rate}%`, 20, yPos);
       yPos += 6;
-      doc.text(`Generated: ${pdfData.generation_date}`, 20, yPos);
+      doc.text(`Results as of: ${pdfData.generation_date}`, 20, yPos);
+      yPos += 6;
+      doc.text(`Generated: ${new Date().toLocaleDateString('en-US', { year: 'numeric', month: 'long', day: 'numeric' })}`, 20, yPos);
       yPos += 15;
       
       // Winners Summary
@@ -239,7 +239,7 @@ function DecryptedResultsContent() {
     centerText(`Election ID: ${pdfData.election_id}`, yPosition, 12);
     yPosition += 8;
     
-    centerText(`Generated: ${pdfData.generation_date}`, yPosition, 12);
+    centerText(`Results as of: ${pdfData.generation_date}`, yPosition, 12);
     yPosition += 15;
     
     // Statistics - Centered
@@ -328,12 +328,13 @@ function DecryptedResultsContent() {
     
     // Footer - Centered
     const totalPages = pdf.internal.pages.length - 1;
+    const generatedOn = new Date().toLocaleDateString('en-US', { year: 'numeric', month: 'long', day: 'numeric' });
     for (let i = 1; i <= totalPages; i++) {
       pdf.setPage(i);
       pdf.setFontSize(8);
       pdf.setFont('helvetica', 'normal');
       centerText(
-        `Generated on ${pdfData.generation_date} - Page ${i} of ${totalPages}`,
+        `Generated on ${generatedOn} - Page ${i} of ${totalPages}`,
         pageHeight - 10,
         8
       );
@@ -6,6 +6,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import Image from 'next/image';
 import CandidateDetailModal from '@/components/user/CandidateDetailModal';
 import ArrowUpScrollToTop from '@/components/ArrowUpScrollToTop';
+import { useVotingSessionHeartbeat } from '@/utils/votingSessionHeartbeat';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000/api';
 
@@ -109,6 +110,12 @@ function CastVoteContent() {
   const [showCandidate, setShowCandidate] = useState<Candidate | null>(null);
   const [showScrollToTop, setShowScrollToTop] = useState(false);
   const [showExitConfirmation, setShowExitConfirmation] = useState(false);
+  // Voter whose session was started on this page; heartbeats keep it from being reclaimed
+  const [sessionVoterId, setSessionVoterId] = useState<string | null>(null);
+
+  useVotingSessionHeartbeat(electionId, sessionVoterId, () => {
+    setError('Your voting session has expired. Return to the elections page to start again.');
+  });
   
   useEffect(() => {
     const fetchData = async () => {
@@ -129,6 +136,7 @@ function CastVoteContent() {
             if (sessionResponse.ok) {
               const sessionData = await sessionResponse.json();
               console.log('Voting session started:', sessionData);
+              setSessionVoterId(user.student_id);
             } else {
               const errorText = await sessionResponse.text();
               console.warn('Failed to start voting session:', errorText);
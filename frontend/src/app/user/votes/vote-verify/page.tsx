@@ -6,6 +6,7 @@ import Loader4 from '@/components/Loader4';
 import SystemLogo2 from '@/components/SystemLogo2';
 import { motion } from 'framer-motion';
 import { useUser } from '@/contexts/UserContext';
+import { useVotingSessionHeartbeat } from '@/utils/votingSessionHeartbeat';
 import { 
   VoteVerificationErrorType, 
   handleVerificationError, 
@@ -31,7 +32,6 @@ function VoteVerifyContent() {
   const router = useRouter();
   const searchParams = useSearchParams();
   const { user } = useUser();  // State for tracking the current election and votes
-  // eslint-disable-next-line @typescript-eslint/no-unused-vars
   const [electionId, setElectionId] = useState<string | null>(null);
   const [electionName, setElectionName] = useState<string>('');
   // Store votes in state for potential UI usage (e.g., showing what was voted for)
@@ -47,6 +47,8 @@ function VoteVerifyContent() {
   });  const [overallStatus, setOverallStatus] = useState<'verifying' | 'success' | 'failed'>('verifying');
   const [submissionInProgress, setSubmissionInProgress] = useState(false);
   const initializationStarted = useRef(false);
+  // Keep the voting session alive while the ballot is verified; it is left once the vote is submitted
+  useVotingSessionHeartbeat(overallStatus === 'verifying' ? electionId : null, user?.student_id);
     // Define verifyVotes using useCallback to avoid re-creation on every render
   const verifyVotes = useCallback(async (eId: string, votesToVerify: Vote[], key: string) => {
     // Prevent duplicate submissions
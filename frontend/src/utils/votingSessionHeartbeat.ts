@@ -0,0 +1,70 @@
+/**
+ * Keeps a voter's voting session alive while the ballot pages are open
+ */
+import { useEffect, useRef } from 'react';
+import { API_URL } from '@/config';
+
+// Seconds between heartbeats until the server reports its session TTL
+const DEFAULT_INTERVAL_SECONDS = 30;
+const MIN_INTERVAL_SECONDS = 10;
+
+/**
+ * Renew the voting session lease of `voterId` in `electionId` on a timer.
+ * The server reclaims the slot of a session that stops sending heartbeats,
+ * so the interval is a quarter of the TTL it reports. Pass a voter only once
+ * their session has been started. `onExpired` is called once if the server
+ * says the session is already gone.
+ */
+export function useVotingSessionHeartbeat(
+  electionId: string | null,
+  voterId: string | null | undefined,
+  onExpired?: () => void
+) {
+  const onExpiredRef = useRef(onExpired);
+  onExpiredRef.current = onExpired;
+
+  useEffect(() => {
+    if (!electionId || !voterId) return;
+
+    let timer: ReturnType<typeof setTimeout> | null = null;
+    let stopped = false;
+
+    const beat = async () => {
+      let intervalSeconds = DEFAULT_INTERVAL_SECONDS;
+      try {
+        const response = await fetch(`${API_URL}/elections/${electionId}/voting_session/heartbeat`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ voter_id: voterId })
+        });
+        if (response.status === 404) {
+          const data = await response.json().catch(() => ({}));
+          if (data.expired) {
+            stopped = true;
+            onExpiredRef.current?.();
+            return;
+          }
+        } else if (response.ok) {
+          const data = await response.json();
+          if (data.ttl_seconds) {
+            intervalSeconds = Math.max(MIN_INTERVAL_SECONDS, data.ttl_seconds / 4);
+          }
+        }
+      } catch (error) {
+        // A missed beat is retried on the next tick; the TTL allows for several
+        console.warn('Voting session heartbeat failed:', error);
+      }
+      if (!stopped) {
+        timer = setTimeout(beat, intervalSeconds * 1000);
+      }
+    };
+
+    // The session was just started or renewed by the page; the first beat can wait
+    timer = setTimeout(beat, DEFAULT_INTERVAL_SECONDS * 1000);
+
+    return () => {
+      stopped = true;
+      if (timer) clearTimeout(timer);
+    };
+  }, [electionId, voterId]);
+}